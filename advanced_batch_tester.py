@@ -4,15 +4,167 @@ Advanced Batch Tester for PLUMATOTM Engine
 Strategically generates profiles to maximize animal diversity in Supabase database
 """
 
-import random
+import calendar
+import heapq
 import json
+import multiprocessing
+import sys
 import time
 import csv
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Set, Optional
 from plumatotm_core import BirthChartAnalyzer
+import numpy as np
 import os
 
+# orjson is much faster for large result lists, fall back to stdlib json if missing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Days per month for a non-leap year (January first)
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Different seasons and times that might favor different animal types
+_SEASONS = (
+    {"months": (3, 4, 5), "name": "Spring"},
+    {"months": (6, 7, 8), "name": "Summer"},
+    {"months": (9, 10, 11), "name": "Autumn"},
+    {"months": (12, 1, 2), "name": "Winter"}
+)
+
+_TIMES = (
+    {"hour_range": (0, 6), "name": "Night"},
+    {"hour_range": (6, 12), "name": "Morning"},
+    {"hour_range": (12, 18), "name": "Afternoon"},
+    {"hour_range": (18, 24), "name": "Evening"}
+)
+
+# Strategic date/time combinations, built once at import time
+_STRATEGIC_COMBINATIONS = tuple(
+    {
+        "season": season,
+        "time_period": time_period,
+        "description": f"{season['name']} {time_period['name']}"
+    }
+    for season in _SEASONS
+    for time_period in _TIMES
+)
+
+# Diverse locations
+_LOCATIONS = (
+    # Arctic/Subarctic (might favor cold-weather animals)
+    (78.2186, 15.6406, "Svalbard"),        # Arctic
+    (64.1466, -21.9426, "Reykjavik"),      # Iceland
+    (61.2181, -149.9003, "Anchorage"),     # Alaska
+    
+    # Tropical (might favor tropical animals)
+    (1.3521, 103.8198, "Singapore"),       # Singapore
+    (-8.6500, 115.2167, "Bali"),           # Bali
+    (14.5995, 120.9842, "Manila"),         # Philippines
+    
+    # Desert (might favor desert animals)
+    (24.7136, 46.6753, "Riyadh"),          # Saudi Arabia
+    (25.2048, 55.2708, "Dubai"),           # UAE
+    (30.0444, 31.2357, "Cairo"),           # Egypt
+    
+    # Oceanic (might favor marine animals)
+    (-33.8688, 151.2093, "Sydney"),        # Sydney
+    (-37.8136, 144.9631, "Melbourne"),     # Melbourne
+    (21.3099, -157.8581, "Honolulu"),      # Hawaii
+    
+    # Mountain (might favor mountain animals)
+    (46.5197, 6.6323, "Lausanne"),         # Swiss Alps
+    (40.0150, -105.2705, "Boulder"),       # Rocky Mountains
+    (-16.2902, -63.5887, "La Paz"),        # Andes
+    
+    # Forest (might favor forest animals)
+    (45.5017, -73.5673, "Montreal"),       # Boreal forest
+    (55.7558, 37.6176, "Moscow"),          # Taiga
+    (-22.9068, -43.1729, "Rio de Janeiro"), # Atlantic forest
+)
+
+# Analyzer and statistics generator used by pool workers (inherited on fork, else set by _init_worker)
+_worker_analyzer = None
+_worker_statistics = None
+
+def _load_statistics_generator():
+    """Return an AnimalStatisticsGenerator to register results in Supabase, or None."""
+    try:
+        from animal_statistics import AnimalStatisticsGenerator
+        return AnimalStatisticsGenerator()
+    except ImportError:
+        return None
+
+def _init_worker(csv_paths: Dict[str, str]):
+    """Build one BirthChartAnalyzer per worker process and keep it for all its profiles."""
+    global _worker_analyzer, _worker_statistics
+    _worker_analyzer = BirthChartAnalyzer(**csv_paths)
+    _worker_analyzer._ensure_scores_data_loaded()
+    _worker_analyzer._ensure_animal_translations_loaded()
+    _worker_statistics = _load_statistics_generator()
+
+def _analyze_profile_worker(profile: Dict) -> Dict:
+    """Pool entry point: analyze a single profile with the worker's analyzer."""
+    return _analyze_profile(_worker_analyzer, profile, _worker_statistics)
+
+def _dumps_line(record: Dict) -> bytes:
+    """Serialize a record as one NDJSON line."""
+    if HAS_ORJSON:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b"\n"
+
+def _pop_least_attempted(heap: List[Tuple[int, str]], animal_attempts: Dict[str, int]) -> Optional[str]:
+    """Pop the least attempted animal from a (attempts, animal) heap, skipping outdated entries."""
+    while heap:
+        attempts, animal = heapq.heappop(heap)
+        if attempts == animal_attempts[animal]:
+            return animal
+    return None
+
+def _build_profile_result(profile: Dict, top1_animal: Optional[str] = None,
+                          top1_score: Optional[float] = None, error: Optional[str] = None) -> Dict:
+    """Build the per-profile result record."""
+    return {
+        'profile_id': profile['profile_id'],
+        'date': profile['date'],
+        'time': profile['time'],
+        'lat': profile['lat'],
+        'lon': profile['lon'],
+        'city': profile['city'],
+        'strategy': profile.get('strategy', ''),
+        'target_animal': profile.get('target_animal', ''),
+        'top1_animal': top1_animal,
+        'top1_score': top1_score,
+        'analysis_successful': error is None,
+        'error': error
+    }
+
+def _analyze_profile(analyzer: BirthChartAnalyzer, profile: Dict, statistics=None) -> Dict:
+    """Analyze a single profile in memory and return its top 1 animal.
+    
+    No file under outputs/ is read or written, so concurrent workers cannot race.
+    When a statistics generator is given, the profile is registered in Supabase.
+    """
+    try:
+        top1_animal, top1_score = analyzer.compute_top1(
+            date=profile['date'],
+            time=profile['time'],
+            lat=profile['lat'],
+            lon=profile['lon']
+        )
+        
+        if statistics is not None:
+            plumid = statistics.generate_plumid(profile['date'], profile['time'], profile['lat'], profile['lon'])
+            statistics.process_user(plumid, top1_animal)
+        
+        return _build_profile_result(profile, top1_animal=top1_animal, top1_score=top1_score)
+        
+    except Exception as e:
+        return _build_profile_result(profile, error=str(e))
+
 class AdvancedBatchTester:
     """Advanced batch tester with strategic animal targeting."""
     
@@ -22,21 +174,28 @@ class AdvancedBatchTester:
                  multipliers_csv_path: str = "plumatotm_planets_multiplier.csv",
                  translations_csv_path: str = "plumatotm_raw_scores_trad.csv"):
         """Initialize the advanced batch tester."""
-        self.analyzer = BirthChartAnalyzer(
-            scores_csv_path=scores_csv_path,
-            weights_csv_path=weights_csv_path,
-            multipliers_csv_path=multipliers_csv_path,
-            translations_csv_path=translations_csv_path
-        )
+        # Kept so pool workers can build their own analyzer
+        self.csv_paths = {
+            'scores_csv_path': scores_csv_path,
+            'weights_csv_path': weights_csv_path,
+            'multipliers_csv_path': multipliers_csv_path,
+            'translations_csv_path': translations_csv_path
+        }
+        self.analyzer = BirthChartAnalyzer(**self.csv_paths)
+        self.statistics = _load_statistics_generator()
+        
+        # Vectorized RNG for batch profile parameters
+        self.rng = np.random.default_rng()
         
         # Load all available animals
         self.analyzer._ensure_scores_data_loaded()
         self.analyzer._ensure_animal_translations_loaded()
         self.all_animals = self.analyzer.animals
         
-        # Track which animals we've found
+        # Track which animals we've found (and, incrementally, which are still missing)
         self.found_animals = set()
-        self.animal_profiles = {}  # animal -> list of profiles that produced it
+        self._unfound = set(self.all_animals)
+        self.animal_profiles = {}  # animal -> list of profile ids that produced it
         
         print(f"🎯 Advanced Batch Tester initialized with {len(self.all_animals)} animals")
     
@@ -86,8 +245,16 @@ class AdvancedBatchTester:
         profiles = []
         animal_attempts = {animal: 0 for animal in target_animals}
         
-        # Strategic date/time combinations that might favor certain animals
-        strategic_combinations = self._generate_strategic_combinations()
+        # Min-heaps of (attempts, animal): unfound animals first, then all targets.
+        # Entries whose attempt count is outdated are skipped when popped.
+        unfound_set = self._unfound.intersection(target_animals)
+        unfound_heap = [(0, animal) for animal in target_animals if animal in unfound_set]
+        attempts_heap = [(0, animal) for animal in target_animals]
+        heapq.heapify(unfound_heap)
+        heapq.heapify(attempts_heap)
+        
+        # Random parameters (strategic combination, date, time, location) for the whole batch
+        randoms = self._prepare_batch_randoms(count)
         
         attempts = 0
         max_total_attempts = count * 3  # Allow some failures
@@ -95,28 +262,24 @@ class AdvancedBatchTester:
         while len(profiles) < count and attempts < max_total_attempts:
             attempts += 1
             
-            # Choose a target animal (prioritize rare ones)
-            available_targets = [a for a in target_animals if animal_attempts[a] < max_attempts_per_animal]
+            # Choose the least attempted target, prioritizing animals we haven't found yet
+            target_animal = _pop_least_attempted(unfound_heap, animal_attempts)
+            if target_animal is None:
+                target_animal = _pop_least_attempted(attempts_heap, animal_attempts)
             
-            if not available_targets:
+            if target_animal is None:
                 print("⚠️  All target animals have reached max attempts")
                 break
             
-            # Weight selection towards animals we haven't found yet
-            if self.found_animals:
-                unfound_animals = [a for a in available_targets if a not in self.found_animals]
-                if unfound_animals:
-                    target_animal = random.choice(unfound_animals)
-                else:
-                    # Choose from least attempted animals
-                    target_animal = min(available_targets, key=lambda x: animal_attempts[x])
-            else:
-                target_animal = random.choice(available_targets)
-            
             animal_attempts[target_animal] += 1
+            if animal_attempts[target_animal] < max_attempts_per_animal:
+                entry = (animal_attempts[target_animal], target_animal)
+                heapq.heappush(attempts_heap, entry)
+                if target_animal in unfound_set:
+                    heapq.heappush(unfound_heap, entry)
             
             # Generate profile with strategic parameters
-            profile = self._generate_strategic_profile(target_animal, strategic_combinations)
+            profile = self._generate_strategic_profile(target_animal, randoms, len(profiles))
             profiles.append(profile)
             
             # Progress reporting
@@ -127,102 +290,52 @@ class AdvancedBatchTester:
         print(f"✅ Generated {len(profiles)} targeted profiles")
         return profiles
     
-    def _generate_strategic_combinations(self) -> List[Dict]:
-        """Generate strategic date/time combinations that might favor different animals."""
-        combinations = []
-        
-        # Different seasons and times that might favor different animal types
-        seasons = [
-            {"months": [3, 4, 5], "name": "Spring"},
-            {"months": [6, 7, 8], "name": "Summer"}, 
-            {"months": [9, 10, 11], "name": "Autumn"},
-            {"months": [12, 1, 2], "name": "Winter"}
-        ]
-        
-        times = [
-            {"hour_range": (0, 6), "name": "Night"},
-            {"hour_range": (6, 12), "name": "Morning"},
-            {"hour_range": (12, 18), "name": "Afternoon"},
-            {"hour_range": (18, 24), "name": "Evening"}
-        ]
-        
-        for season in seasons:
-            for time_period in times:
-                combinations.append({
-                    "season": season,
-                    "time_period": time_period,
-                    "description": f"{season['name']} {time_period['name']}"
-                })
-        
-        return combinations
+    def _prepare_batch_randoms(self, count: int) -> Dict[str, List]:
+        """Draw the random parameters of `count` strategic profiles in one vectorized pass.
+        
+        Values are returned as plain Python lists (via tolist()) so profiles stay
+        JSON-serializable and per-profile indexing stays cheap.
+        """
+        rng = self.rng
+        return {
+            'combination': rng.integers(0, len(_STRATEGIC_COMBINATIONS), size=count).tolist(),
+            'year': rng.integers(1960, 2006, size=count).tolist(),
+            'month': rng.integers(0, 3, size=count).tolist(),  # index in the season's months
+            'day': rng.random(size=count).tolist(),  # scaled to the month length later
+            'hour': rng.random(size=count).tolist(),  # scaled to the time period later
+            'minute': rng.integers(0, 60, size=count).tolist(),
+            'location': rng.integers(0, len(_LOCATIONS), size=count).tolist(),
+            'lat_jitter': rng.uniform(-0.3, 0.3, size=count).tolist(),
+            'lon_jitter': rng.uniform(-0.3, 0.3, size=count).tolist()
+        }
     
-    def _generate_strategic_profile(self, target_animal: str, combinations: List[Dict]) -> Dict:
-        """Generate a profile with strategic parameters."""
+    def _generate_strategic_profile(self, target_animal: str, randoms: Dict[str, List], index: int) -> Dict:
+        """Generate a profile with strategic parameters from pre-drawn batch randoms."""
         # Choose a strategic combination
-        combination = random.choice(combinations)
+        combination = _STRATEGIC_COMBINATIONS[randoms['combination'][index]]
         
         # Generate date in the chosen season
-        year = random.randint(1960, 2005)
-        month = random.choice(combination["season"]["months"])
-        
-        # Handle December for winter
-        if month == 12:
-            day = random.randint(1, 31)
-        elif month in [1, 3, 5, 7, 8, 10]:
-            day = random.randint(1, 31)
-        elif month == 2:
-            day = random.randint(1, 28)  # Simplified leap year handling
-        else:
-            day = random.randint(1, 30)
+        year = randoms['year'][index]
+        months = combination["season"]["months"]
+        month = months[randoms['month'][index] % len(months)]
         
-        birth_date = datetime(year, month, day)
+        # Any valid day of the month, including February 29 on leap years
+        max_day = _DAYS_IN_MONTH[month - 1] + (1 if month == 2 and calendar.isleap(year) else 0)
+        day = 1 + int(randoms['day'][index] * max_day)
         
         # Generate time in the chosen period
         start_hour, end_hour = combination["time_period"]["hour_range"]
-        hour = random.randint(start_hour, end_hour - 1)
-        minute = random.randint(0, 59)
-        
-        # Diverse locations
-        locations = [
-            # Arctic/Subarctic (might favor cold-weather animals)
-            (78.2186, 15.6406, "Svalbard"),        # Arctic
-            (64.1466, -21.9426, "Reykjavik"),      # Iceland
-            (61.2181, -149.9003, "Anchorage"),     # Alaska
-            
-            # Tropical (might favor tropical animals)
-            (1.3521, 103.8198, "Singapore"),       # Singapore
-            (-8.6500, 115.2167, "Bali"),           # Bali
-            (14.5995, 120.9842, "Manila"),         # Philippines
-            
-            # Desert (might favor desert animals)
-            (24.7136, 46.6753, "Riyadh"),          # Saudi Arabia
-            (25.2048, 55.2708, "Dubai"),           # UAE
-            (30.0444, 31.2357, "Cairo"),           # Egypt
-            
-            # Oceanic (might favor marine animals)
-            (-33.8688, 151.2093, "Sydney"),        # Sydney
-            (-37.8136, 144.9631, "Melbourne"),     # Melbourne
-            (21.3099, -157.8581, "Honolulu"),      # Hawaii
-            
-            # Mountain (might favor mountain animals)
-            (46.5197, 6.6323, "Lausanne"),         # Swiss Alps
-            (40.0150, -105.2705, "Boulder"),       # Rocky Mountains
-            (-16.2902, -63.5887, "La Paz"),        # Andes
-            
-            # Forest (might favor forest animals)
-            (45.5017, -73.5673, "Montreal"),       # Boreal forest
-            (55.7558, 37.6176, "Moscow"),          # Taiga
-            (-22.9068, -43.1729, "Rio de Janeiro"), # Atlantic forest
-        ]
+        hour = start_hour + int(randoms['hour'][index] * (end_hour - start_hour))
+        minute = randoms['minute'][index]
         
-        lat, lon, city = random.choice(locations)
+        lat, lon, city = _LOCATIONS[randoms['location'][index]]
         
         # Add some random variation
-        lat += random.uniform(-0.3, 0.3)
-        lon += random.uniform(-0.3, 0.3)
+        lat += randoms['lat_jitter'][index]
+        lon += randoms['lon_jitter'][index]
         
         return {
-            'date': birth_date.strftime('%Y-%m-%d'),
+            'date': f"{year:04d}-{month:02d}-{day:02d}",
             'time': f"{hour:02d}:{minute:02d}",
             'lat': round(lat, 6),
             'lon': round(lon, 6),
@@ -232,114 +345,96 @@ class AdvancedBatchTester:
             'profile_id': len(self.found_animals) + 1
         }
     
-    def analyze_and_track(self, profiles: List[Dict], batch_size: int = 25) -> List[Dict]:
-        """Analyze profiles and track which animals we find."""
+    def analyze_and_track(self, profiles: List[Dict], batch_size: int = 25, workers: Optional[int] = None,
+                          filename: str = "advanced_batch_results.ndjson") -> str:
+        """Analyze profiles in parallel and track which animals we find.
+        
+        Results are streamed to outputs/<filename> as NDJSON (one JSON object per
+        line) instead of being kept in memory.
+        
+        Args:
+            profiles: Profiles to analyze
+            batch_size: Progress reporting interval, also used as the pool chunksize
+            workers: Number of worker processes (None = one per CPU)
+            filename: NDJSON output file name in outputs/
+            
+        Returns:
+            Path of the NDJSON results file
+        """
         print(f"🔬 Analyzing {len(profiles)} profiles with animal tracking...")
         
-        results = []
+        os.makedirs("outputs", exist_ok=True)
+        output_path = f"outputs/{filename}"
+        
+        analyzed_count = 0
         successful = 0
         new_animals = 0
+        # Per-profile status lines, written to stdout once per batch
+        log_buffer: List[str] = []
         
-        for i, profile in enumerate(profiles, 1):
-            print(f"📊 Profile {i}/{len(profiles)}: {profile['city']} ({profile['strategy']})", end=" ... ")
-            
-            result = self._analyze_profile(profile)
-            results.append(result)
+        with open(output_path, 'wb') as output_file, \
+                ProcessPoolExecutor(max_workers=workers, **self._pool_options()) as executor:
+            analyzed = executor.map(_analyze_profile_worker, profiles, chunksize=batch_size)
             
-            if result['analysis_successful'] and result['top1_animal']:
-                successful += 1
-                animal = result['top1_animal']
+            for i, (profile, result) in enumerate(zip(profiles, analyzed), 1):
+                analyzed_count = i
+                output_file.write(_dumps_line(result))
+                status_prefix = f"📊 Profile {i}/{len(profiles)}: {profile['city']} ({profile['strategy']}) ... "
                 
-                # Track new animals
-                if animal not in self.found_animals:
-                    new_animals += 1
-                    self.found_animals.add(animal)
-                    self.animal_profiles[animal] = []
-                
-                self.animal_profiles[animal].append(result)
-                
-                if animal == profile.get('target_animal'):
-                    print(f"🎯 TARGET HIT: {animal}")
+                if result['analysis_successful'] and result['top1_animal']:
+                    successful += 1
+                    animal = result['top1_animal']
+                    
+                    # Track new animals
+                    if animal not in self.found_animals:
+                        new_animals += 1
+                        self.found_animals.add(animal)
+                        self._unfound.discard(animal)
+                    
+                    self.animal_profiles.setdefault(animal, []).append(result['profile_id'])
+                    
+                    if animal == profile.get('target_animal'):
+                        log_buffer.append(f"{status_prefix}🎯 TARGET HIT: {animal}\n")
+                    else:
+                        log_buffer.append(f"{status_prefix}✅ {animal}\n")
                 else:
-                    print(f"✅ {animal}")
-            else:
-                print(f"❌ Failed")
-            
-            # Progress reporting
-            if i % batch_size == 0:
-                print(f"\n📈 Progress: {i}/{len(profiles)} | ✅ {successful} | 🆕 {new_animals} new animals | 🎯 {len(self.found_animals)}/{len(self.all_animals)} total")
+                    log_buffer.append(f"{status_prefix}❌ Failed\n")
+                
+                # Progress reporting
+                if i % batch_size == 0:
+                    log_buffer.append(f"\n📈 Progress: {i}/{len(profiles)} | ✅ {successful} | 🆕 {new_animals} new animals | 🎯 {len(self.found_animals)}/{len(self.all_animals)} total\n")
+                    sys.stdout.write(''.join(log_buffer))
+                    sys.stdout.flush()
+                    log_buffer.clear()
+                    output_file.flush()
+        
+        if log_buffer:
+            sys.stdout.write(''.join(log_buffer))
         
         print(f"\n🎉 Analysis completed!")
-        print(f"📊 Total: {len(results)} | ✅ Successful: {successful} | 🆕 New animals: {new_animals}")
+        print(f"📊 Total: {analyzed_count} | ✅ Successful: {successful} | 🆕 New animals: {new_animals}")
         print(f"🎯 Animal diversity: {len(self.found_animals)}/{len(self.all_animals)} ({len(self.found_animals)/len(self.all_animals)*100:.1f}%)")
+        print(f"💾 Results streamed to: {output_path}")
         
-        return results
+        return output_path
+    
+    def _pool_options(self) -> Dict:
+        """Return the ProcessPoolExecutor options used to give each worker an analyzer.
+        
+        On Linux the pool forks, so workers inherit the analyzer already loaded in this
+        process copy-on-write and never re-parse the CSVs. Elsewhere (spawn), each worker
+        builds its own analyzer through _init_worker.
+        """
+        global _worker_analyzer, _worker_statistics
+        if sys.platform.startswith('linux'):
+            _worker_analyzer = self.analyzer
+            _worker_statistics = self.statistics
+            return {'mp_context': multiprocessing.get_context('fork')}
+        return {'initializer': _init_worker, 'initargs': (self.csv_paths,)}
     
     def _analyze_profile(self, profile: Dict) -> Dict:
-        """Analyze a single profile."""
-        try:
-            self.analyzer.run_analysis(
-                date=profile['date'],
-                time=profile['time'],
-                lat=profile['lat'],
-                lon=profile['lon']
-            )
-            
-            # Read results
-            result_path = "outputs/result.json"
-            if os.path.exists(result_path):
-                with open(result_path, 'r', encoding='utf-8') as f:
-                    result_data = json.load(f)
-                
-                animal_totals = result_data.get('animal_totals', [])
-                if animal_totals:
-                    top1_animal = animal_totals[0]['ANIMAL']
-                    
-                    return {
-                        'profile_id': profile['profile_id'],
-                        'date': profile['date'],
-                        'time': profile['time'],
-                        'lat': profile['lat'],
-                        'lon': profile['lon'],
-                        'city': profile['city'],
-                        'strategy': profile.get('strategy', ''),
-                        'target_animal': profile.get('target_animal', ''),
-                        'top1_animal': top1_animal,
-                        'top1_score': animal_totals[0]['TOTAL_SCORE'],
-                        'analysis_successful': True,
-                        'error': None
-                    }
-            
-            return {
-                'profile_id': profile['profile_id'],
-                'date': profile['date'],
-                'time': profile['time'],
-                'lat': profile['lat'],
-                'lon': profile['lon'],
-                'city': profile['city'],
-                'strategy': profile.get('strategy', ''),
-                'target_animal': profile.get('target_animal', ''),
-                'top1_animal': None,
-                'top1_score': None,
-                'analysis_successful': False,
-                'error': 'No results found'
-            }
-            
-        except Exception as e:
-            return {
-                'profile_id': profile['profile_id'],
-                'date': profile['date'],
-                'time': profile['time'],
-                'lat': profile['lat'],
-                'lon': profile['lon'],
-                'city': profile['city'],
-                'strategy': profile.get('strategy', ''),
-                'target_animal': profile.get('target_animal', ''),
-                'top1_animal': None,
-                'top1_score': None,
-                'analysis_successful': False,
-                'error': str(e)
-            }
+        """Analyze a single profile in the current process."""
+        return _analyze_profile(self.analyzer, profile, self.statistics)
     
     def print_animal_coverage(self):
         """Print detailed animal coverage statistics."""
@@ -356,20 +451,33 @@ class AdvancedBatchTester:
                 count = len(self.animal_profiles.get(animal, []))
                 print(f"   {animal:<25} {count:3d} profiles")
         
-        missing_animals = set(self.all_animals) - self.found_animals
+        missing_animals = self._unfound
         if missing_animals:
             print(f"\n❌ MISSING ANIMALS:")
             for animal in sorted(missing_animals):
                 print(f"   {animal}")
     
-    def save_results(self, results: List[Dict], filename: str = "advanced_batch_results.json"):
-        """Save results to file."""
+    def save_results(self, ndjson_path: str, filename: str = "advanced_batch_results.json"):
+        """Copy the NDJSON results written by analyze_and_track into a JSON array file.
+        
+        Each NDJSON line is already a JSON document, so lines are joined as array
+        items without being parsed again.
+        """
         try:
             os.makedirs("outputs", exist_ok=True)
             output_path = f"outputs/{filename}"
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            with open(ndjson_path, 'rb') as src, open(output_path, 'wb') as dst:
+                dst.write(b"[")
+                first = True
+                for line in src:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    dst.write(b"\n" if first else b",\n")
+                    dst.write(line)
+                    first = False
+                dst.write(b"\n]\n")
             
             print(f"💾 Results saved to: {output_path}")
             return True
@@ -389,6 +497,7 @@ def main():
     existing_animals = tester.get_current_database_animals()
     if existing_animals:
         tester.found_animals = existing_animals
+        tester._unfound -= existing_animals
         print(f"📊 Starting with {len(existing_animals)} animals already in database")
     
     # Configuration
@@ -402,11 +511,11 @@ def main():
     # Generate targeted profiles
     profiles = tester.generate_targeted_profiles(count=target_count)
     
-    # Analyze with tracking
-    results = tester.analyze_and_track(profiles, batch_size=batch_size)
+    # Analyze with tracking (results are streamed to NDJSON)
+    results_path = tester.analyze_and_track(profiles, batch_size=batch_size)
     
-    # Save results
-    tester.save_results(results, "advanced_batch_results.json")
+    # Save results as a JSON array as well
+    tester.save_results(results_path, "advanced_batch_results.json")
     
     # Print coverage report
     tester.print_animal_coverage()
@@ -3,56 +3,67 @@
 Analyse des différences entre configurations attendues et détectées
 """
 
+import sys
+from functools import lru_cache
+
 from aspects_patterns_generator import AspectsPatternsGenerator
 from flatlib import const
 
-def analyze_yod_differences():
-    """Analyse les différences entre les Yods"""
-    generator = AspectsPatternsGenerator()
-    
-    date = "1992-06-06"
-    time = "03:10"
-    lat = 47.6241674
-    lon = 4.3373194
-    
+def _make_cached_aspect(generator, objs):
+    """Retourne un calcul d'aspect memoise, indexe par les ids flatlib des objets"""
+    @lru_cache(maxsize=None)
+    def cached_aspect(p1_id, p2_id, aspect_tuple):
+        return generator._get_aspect_with_node_override(objs[p1_id], objs[p2_id], list(aspect_tuple))
+    return cached_aspect
+
+def _build_objs(generator, date, time, lat, lon):
+    """Calcule le thème une seule fois et retourne les objets utilisés par les analyses"""
     chart = generator.generate_chart_from_plumatotm_data(date, time, lat, lon)
     
     # Obtenir les planètes
-    sun = generator._get_chart_object(chart, const.SUN)
-    moon = generator._get_chart_object(chart, const.MOON)
-    mercury = generator._get_chart_object(chart, const.MERCURY)
-    neptune = generator._get_chart_object(chart, const.NEPTUNE)
-    
+    objs = {
+        obj_id: generator._get_chart_object(chart, obj_id)
+        for obj_id in (const.SUN, const.MOON, const.MERCURY, const.MARS,
+                       const.SATURN, const.NEPTUNE, const.ASC)
+    }
+    return objs
+
+def analyze_yod_differences(cached_aspect):
+    """Analyse les différences entre les Yods"""
     print("="*80)
     print("ANALYSE YOD: Neptune-Moon-Sun (attendu) vs Moon-Mercury-Neptune (detecte)")
     print("="*80)
     
     # Yod attendu: Neptune-Moon-Sun
     print("\n1. Yod ATTENDU: Neptune-Moon-Sun")
-    asp_sun_moon_1 = generator._get_aspect_with_node_override(sun, moon, [const.SEXTILE])
-    asp_sun_neptune_1 = generator._get_aspect_with_node_override(sun, neptune, [const.QUINCUNX])
-    asp_moon_neptune_1 = generator._get_aspect_with_node_override(moon, neptune, [const.QUINCUNX])
-    
-    print(f"  Sun-Moon Sextile: orbe {asp_sun_moon_1.orb:.2f}deg")
-    print(f"  Sun-Neptune Quincunx: orbe {asp_sun_neptune_1.orb:.2f}deg")
-    print(f"  Moon-Neptune Quincunx: orbe {asp_moon_neptune_1.orb:.2f}deg")
-    
-    orbe_moyen_1 = (asp_sun_moon_1.orb + asp_sun_neptune_1.orb + asp_moon_neptune_1.orb) / 3
-    print(f"  ORBE MOYEN: {orbe_moyen_1:.2f}deg")
+    asp_sun_moon_1 = cached_aspect(const.SUN, const.MOON, (const.SEXTILE,))
+    asp_sun_neptune_1 = cached_aspect(const.SUN, const.NEPTUNE, (const.QUINCUNX,))
+    asp_moon_neptune_1 = cached_aspect(const.MOON, const.NEPTUNE, (const.QUINCUNX,))
+    
+    orbs = (asp_sun_moon_1.orb, asp_sun_neptune_1.orb, asp_moon_neptune_1.orb)
+    orbe_moyen_1 = sum(orbs) / len(orbs)
+    sys.stdout.write(
+        "  Sun-Moon Sextile: orbe %.2fdeg\n"
+        "  Sun-Neptune Quincunx: orbe %.2fdeg\n"
+        "  Moon-Neptune Quincunx: orbe %.2fdeg\n"
+        "  ORBE MOYEN: %.2fdeg\n" % (orbs + (orbe_moyen_1,))
+    )
     print(f"  Planetes: Sun (personnelle), Moon (personnelle), Neptune (transpersonnelle)")
     
     # Yod détecté: Moon-Mercury-Neptune
     print("\n2. Yod DETECTE: Moon-Mercury-Neptune")
-    asp_moon_mercury = generator._get_aspect_with_node_override(moon, mercury, [const.SEXTILE])
-    asp_moon_neptune_2 = generator._get_aspect_with_node_override(moon, neptune, [const.QUINCUNX])
-    asp_mercury_neptune = generator._get_aspect_with_node_override(mercury, neptune, [const.QUINCUNX])
-    
-    print(f"  Moon-Mercury Sextile: orbe {asp_moon_mercury.orb:.2f}deg")
-    print(f"  Moon-Neptune Quincunx: orbe {asp_moon_neptune_2.orb:.2f}deg")
-    print(f"  Mercury-Neptune Quincunx: orbe {asp_mercury_neptune.orb:.2f}deg")
-    
-    orbe_moyen_2 = (asp_moon_mercury.orb + asp_moon_neptune_2.orb + asp_mercury_neptune.orb) / 3
-    print(f"  ORBE MOYEN: {orbe_moyen_2:.2f}deg")
+    asp_moon_mercury = cached_aspect(const.MOON, const.MERCURY, (const.SEXTILE,))
+    asp_moon_neptune_2 = cached_aspect(const.MOON, const.NEPTUNE, (const.QUINCUNX,))
+    asp_mercury_neptune = cached_aspect(const.MERCURY, const.NEPTUNE, (const.QUINCUNX,))
+    
+    orbs = (asp_moon_mercury.orb, asp_moon_neptune_2.orb, asp_mercury_neptune.orb)
+    orbe_moyen_2 = sum(orbs) / len(orbs)
+    sys.stdout.write(
+        "  Moon-Mercury Sextile: orbe %.2fdeg\n"
+        "  Moon-Neptune Quincunx: orbe %.2fdeg\n"
+        "  Mercury-Neptune Quincunx: orbe %.2fdeg\n"
+        "  ORBE MOYEN: %.2fdeg\n" % (orbs + (orbe_moyen_2,))
+    )
     print(f"  Planetes: Moon (personnelle), Mercury (personnelle), Neptune (transpersonnelle)")
     
     print(f"\n3. COMPARAISON:")
@@ -65,62 +76,50 @@ def analyze_yod_differences():
     print(f"  Moon-Mercury-Neptune: Implique MERCURE (mental, communication)")
     print(f"  => Le Soleil est traditionnellement plus important que Mercure en astrologie")
 
-def analyze_cradle_differences():
+def analyze_cradle_differences(cached_aspect):
     """Analyse les différences entre les Cradles"""
-    generator = AspectsPatternsGenerator()
-    
-    date = "1992-06-06"
-    time = "03:10"
-    lat = 47.6241674
-    lon = 4.3373194
-    
-    chart = generator.generate_chart_from_plumatotm_data(date, time, lat, lon)
-    
-    # Obtenir les planètes
-    sun = generator._get_chart_object(chart, const.SUN)
-    moon = generator._get_chart_object(chart, const.MOON)
-    mars = generator._get_chart_object(chart, const.MARS)
-    saturn = generator._get_chart_object(chart, const.SATURN)
-    asc = generator._get_chart_object(chart, const.ASC)
-    
     print("\n\n" + "="*80)
     print("ANALYSE CRADLE: Moon-Saturn-Ascendant-Sun (attendu) vs Moon-Saturn-Sun-Mars (detecte)")
     print("="*80)
     
     # Cradle attendu: Moon-Saturn-Ascendant-Sun
     print("\n1. Cradle ATTENDU: Moon-Saturn-Ascendant-Sun")
-    opp = generator._get_aspect_with_node_override(moon, saturn, [const.OPPOSITION])
-    asp1 = generator._get_aspect_with_node_override(asc, moon, [const.TRINE])
-    asp2 = generator._get_aspect_with_node_override(asc, saturn, [const.SEXTILE])
-    asp3 = generator._get_aspect_with_node_override(sun, moon, [const.SEXTILE])
-    asp4 = generator._get_aspect_with_node_override(sun, saturn, [const.TRINE])
-    
-    print(f"  Moon-Saturn Opposition: orbe {opp.orb:.2f}deg")
-    print(f"  Ascendant-Moon Trine: orbe {asp1.orb:.2f}deg")
-    print(f"  Ascendant-Saturn Sextile: orbe {asp2.orb:.2f}deg")
-    print(f"  Sun-Moon Sextile: orbe {asp3.orb:.2f}deg")
-    print(f"  Sun-Saturn Trine: orbe {asp4.orb:.2f}deg")
-    
-    orbe_moyen_1 = (opp.orb + asp1.orb + asp2.orb + asp3.orb + asp4.orb) / 5
-    print(f"  ORBE MOYEN: {orbe_moyen_1:.2f}deg")
+    opp = cached_aspect(const.MOON, const.SATURN, (const.OPPOSITION,))
+    asp1 = cached_aspect(const.ASC, const.MOON, (const.TRINE,))
+    asp2 = cached_aspect(const.ASC, const.SATURN, (const.SEXTILE,))
+    asp3 = cached_aspect(const.SUN, const.MOON, (const.SEXTILE,))
+    asp4 = cached_aspect(const.SUN, const.SATURN, (const.TRINE,))
+    
+    orbs = (opp.orb, asp1.orb, asp2.orb, asp3.orb, asp4.orb)
+    orbe_moyen_1 = sum(orbs) / len(orbs)
+    sys.stdout.write(
+        "  Moon-Saturn Opposition: orbe %.2fdeg\n"
+        "  Ascendant-Moon Trine: orbe %.2fdeg\n"
+        "  Ascendant-Saturn Sextile: orbe %.2fdeg\n"
+        "  Sun-Moon Sextile: orbe %.2fdeg\n"
+        "  Sun-Saturn Trine: orbe %.2fdeg\n"
+        "  ORBE MOYEN: %.2fdeg\n" % (orbs + (orbe_moyen_1,))
+    )
     print(f"  Planetes: Moon (personnelle), Saturn (sociale), Ascendant (ANGLE), Sun (personnelle)")
     
     # Cradle détecté: Moon-Saturn-Sun-Mars
     print("\n2. Cradle DETECTE: Moon-Saturn-Sun-Mars")
-    opp2 = generator._get_aspect_with_node_override(moon, saturn, [const.OPPOSITION])
-    asp5 = generator._get_aspect_with_node_override(sun, moon, [const.SEXTILE])
-    asp6 = generator._get_aspect_with_node_override(sun, saturn, [const.TRINE])
-    asp7 = generator._get_aspect_with_node_override(mars, moon, [const.TRINE])
-    asp8 = generator._get_aspect_with_node_override(mars, saturn, [const.SEXTILE])
-    
-    print(f"  Moon-Saturn Opposition: orbe {opp2.orb:.2f}deg")
-    print(f"  Sun-Moon Sextile: orbe {asp5.orb:.2f}deg")
-    print(f"  Sun-Saturn Trine: orbe {asp6.orb:.2f}deg")
-    print(f"  Mars-Moon Trine: orbe {asp7.orb:.2f}deg")
-    print(f"  Mars-Saturn Sextile: orbe {asp8.orb:.2f}deg")
-    
-    orbe_moyen_2 = (opp2.orb + asp5.orb + asp6.orb + asp7.orb + asp8.orb) / 5
-    print(f"  ORBE MOYEN: {orbe_moyen_2:.2f}deg")
+    opp2 = cached_aspect(const.MOON, const.SATURN, (const.OPPOSITION,))
+    asp5 = cached_aspect(const.SUN, const.MOON, (const.SEXTILE,))
+    asp6 = cached_aspect(const.SUN, const.SATURN, (const.TRINE,))
+    asp7 = cached_aspect(const.MARS, const.MOON, (const.TRINE,))
+    asp8 = cached_aspect(const.MARS, const.SATURN, (const.SEXTILE,))
+    
+    orbs = (opp2.orb, asp5.orb, asp6.orb, asp7.orb, asp8.orb)
+    orbe_moyen_2 = sum(orbs) / len(orbs)
+    sys.stdout.write(
+        "  Moon-Saturn Opposition: orbe %.2fdeg\n"
+        "  Sun-Moon Sextile: orbe %.2fdeg\n"
+        "  Sun-Saturn Trine: orbe %.2fdeg\n"
+        "  Mars-Moon Trine: orbe %.2fdeg\n"
+        "  Mars-Saturn Sextile: orbe %.2fdeg\n"
+        "  ORBE MOYEN: %.2fdeg\n" % (orbs + (orbe_moyen_2,))
+    )
     print(f"  Planetes: Moon (personnelle), Saturn (sociale), Sun (personnelle), Mars (personnelle)")
     
     print(f"\n3. COMPARAISON:")
@@ -134,8 +133,19 @@ def analyze_cradle_differences():
     print(f"     car c'est un ANGLE MAJEUR du theme")
 
 def main():
-    analyze_yod_differences()
-    analyze_cradle_differences()
+    generator = AspectsPatternsGenerator()
+    
+    date = "1992-06-06"
+    time = "03:10"
+    lat = 47.6241674
+    lon = 4.3373194
+    
+    # Un seul thème et un seul cache d'aspects partagés par les deux analyses
+    objs = _build_objs(generator, date, time, lat, lon)
+    cached_aspect = _make_cached_aspect(generator, objs)
+    
+    analyze_yod_differences(cached_aspect)
+    analyze_cradle_differences(cached_aspect)
     
     print("\n\n" + "="*80)
     print("CONCLUSION")
@@ -7,37 +7,171 @@ Génère l'output animal_proportion.json avec les pourcentages d'occurrence.
 import json
 import os
 import csv
-from typing import Dict, List, Optional
+import functools
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from plumid_generator import PlumIDGenerator
 from supabase_manager import supabase_manager
 
+logger = logging.getLogger(__name__)
+
+# orjson est beaucoup plus rapide que json, repli sur la lib standard si absent
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Durée de vie (secondes) du cache des statistiques globales Supabase
+STATS_CACHE_TTL = 60
+
+_stats_cache: Dict[str, object] = {'value': None, 'expires_at': 0.0}
+_stats_lock = threading.Lock()
+
+
+def _parse_animals(raw_scores_file: str, animal_column: str) -> List[str]:
+    """Extrait la liste triée des animaux (colonne animal_column) du CSV."""
+    # Lecture d'une seule colonne sans construire un dict par ligne
+    with open(raw_scores_file, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if animal_column not in header:
+            return []
+        col = header.index(animal_column)
+        animals = {row[col] for row in reader
+                   if len(row) > col and row[col].strip()}
+    return sorted(animals)
+
+
+def _read_animals_cache(cache_file: str, csv_mtime: float) -> Optional[List[str]]:
+    """Relit la liste d'animaux depuis le cache si celui-ci est à jour par rapport au CSV."""
+    try:
+        if os.path.getmtime(cache_file) < csv_mtime:
+            return None
+        with open(cache_file, 'rb') as f:
+            data = f.read()
+        animals = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+        return animals if isinstance(animals, list) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_animals_cache(cache_file: str, animals: List[str]) -> None:
+    """Écrit le cache de façon atomique; un échec d'écriture n'est pas bloquant."""
+    if not animals:
+        return
+    tmp_file = cache_file + '.tmp'
+    try:
+        if HAS_ORJSON:
+            data = orjson.dumps(animals)
+        else:
+            data = json.dumps(animals, ensure_ascii=False).encode('utf-8')
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning("⚠️  Cache animaux non écrit: %s", e)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_animals(raw_scores_file: str, csv_mtime: float, animal_column: str) -> Tuple[str, ...]:
+    """
+    Liste des animaux partagée par tout le processus.
+    
+    La clé inclut le mtime du CSV: une modification du fichier invalide l'entrée.
+    """
+    cache_file = f"{raw_scores_file}.{animal_column}.animals.json"
+    animals = _read_animals_cache(cache_file, csv_mtime)
+    if animals is None:
+        animals = _parse_animals(raw_scores_file, animal_column)
+        _write_animals_cache(cache_file, animals)
+    return tuple(animals)
+
+
+def get_cached_animal_statistics() -> Dict[str, float]:
+    """
+    Statistiques globales Supabase mises en cache pendant STATS_CACHE_TTL secondes.
+    
+    Les requêtes concurrentes partagent un seul aller-retour vers Supabase.
+    """
+    now = time.monotonic()
+    if _stats_cache['value'] is not None and now < _stats_cache['expires_at']:
+        return _stats_cache['value']
+    
+    with _stats_lock:
+        # Un autre thread a pu rafraîchir le cache pendant l'attente du verrou
+        now = time.monotonic()
+        if _stats_cache['value'] is not None and now < _stats_cache['expires_at']:
+            return _stats_cache['value']
+        
+        stats = supabase_manager.get_animal_statistics()
+        _stats_cache['value'] = stats
+        _stats_cache['expires_at'] = now + STATS_CACHE_TTL
+        return stats
+
+
+def clear_animal_statistics_cache() -> None:
+    """Vide le cache des statistiques globales."""
+    with _stats_lock:
+        _stats_cache['value'] = None
+        _stats_cache['expires_at'] = 0.0
+
+
 class AnimalStatisticsGenerator:
     """Générateur de statistiques d'animaux."""
     
-    def __init__(self, raw_scores_file: str = "plumatotm_raw_scores_trad.csv"):
+    def __init__(self, raw_scores_file: str = "plumatotm_raw_scores_trad.csv", animal_column: str = "AnimalEN"):
         self.raw_scores_file = raw_scores_file
-        self.all_animals = self._load_all_animals()
+        self.animal_column = animal_column
+        # Chargés à la demande: run_full_analysis n'a pas besoin de la liste d'animaux
+        self._all_animals: Optional[Tuple[str, ...]] = None
+        self._all_animals_set: FrozenSet[str] = frozenset()
+        self._zero_template_cache: Optional[Dict[str, float]] = None
+        self._sim_stats_template_cache: Optional[MappingProxyType] = None
+    
+    @property
+    def all_animals(self) -> Tuple[str, ...]:
+        """Tuple trié de tous les animaux, chargé au premier accès (partagé, non modifiable)."""
+        if self._all_animals is None:
+            self._all_animals = self._load_all_animals()
+            self._all_animals_set = frozenset(self._all_animals)
+        return self._all_animals
+    
+    @property
+    def _zero_template(self) -> Dict[str, float]:
+        """Gabarit {animal: 0.0} réutilisé à chaque génération de statistiques."""
+        if self._zero_template_cache is None:
+            self._zero_template_cache = dict.fromkeys(self.all_animals, 0.0)
+        return self._zero_template_cache
     
-    def _load_all_animals(self) -> List[str]:
+    @property
+    def _sim_stats_template(self) -> MappingProxyType:
+        """Statistiques simulées (Supabase indisponible), calculées une seule fois."""
+        if self._sim_stats_template_cache is None:
+            animals = self.all_animals
+            share = round(100 / len(animals), 2) if animals else 0.0
+            self._sim_stats_template_cache = MappingProxyType(
+                dict.fromkeys(animals[:10], share)  # Limiter pour l'exemple
+            )
+        return self._sim_stats_template_cache
+    
+    def _load_all_animals(self) -> Tuple[str, ...]:
         """Charge la liste de tous les animaux disponibles."""
         try:
             if os.path.exists(self.raw_scores_file):
-                animals = set()
-                with open(self.raw_scores_file, 'r', encoding='latin-1') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        # Use AnimalEN column and skip empty rows
-                        if 'AnimalEN' in row and row['AnimalEN'] and row['AnimalEN'].strip():
-                            animals.add(row['AnimalEN'])
-                return sorted(list(animals))
+                mtime = os.path.getmtime(self.raw_scores_file)
+                return _load_animals(os.path.abspath(self.raw_scores_file), mtime, self.animal_column)
             
             # No fallback - we need the CSV file to be present
-            print(f"❌ ERROR: CSV file not found: {self.raw_scores_file}")
-            print("   Please ensure the CSV file exists and contains animal data.")
-            return []
+            logger.error("❌ ERROR: CSV file not found: %s", self.raw_scores_file)
+            logger.error("   Please ensure the CSV file exists and contains animal data.")
+            return ()
         except Exception as e:
-            print(f"⚠️  Erreur chargement animaux: {e}")
-            return []
+            logger.warning("⚠️  Erreur chargement animaux: %s", e)
+            return ()
     
     def generate_plumid(self, date: str, time: str, lat: float, lon: float) -> str:
         """Génère le PlumID pour l'utilisateur actuel."""
@@ -58,7 +192,7 @@ class AnimalStatisticsGenerator:
         import time as time_module
         
         process_start = time_module.time()
-        print(f"👤 Processing user: {plumid}")
+        logger.info("👤 Processing user: %s", plumid)
         result = {
             'plumid': plumid,
             'current_animal': current_top1_animal,
@@ -68,26 +202,40 @@ class AnimalStatisticsGenerator:
         }
         
         if not supabase_manager.is_available():
-            print("⚠️  Supabase non disponible, simulation du traitement")
+            logger.warning("⚠️  Supabase non disponible, simulation du traitement")
             result['is_new_user'] = True
             return result
         
+        # Chemin RPC: lecture + enregistrement en un seul aller-retour
+        if supabase_manager.use_rpc:
+            step_start = time_module.time()
+            rpc_data = supabase_manager.register_user(plumid, current_top1_animal, user_name)
+            if rpc_data is not None:
+                logger.debug("⏱️  User RPC: %.2fs", time_module.time() - step_start)
+                previous_animal = rpc_data['previous_animal']
+                result['is_new_user'] = previous_animal is None
+                result['previous_animal'] = previous_animal
+                result['animal_changed'] = previous_animal is not None and previous_animal != current_top1_animal
+                logger.debug("⏱️  User processing complete: %.2fs", time_module.time() - process_start)
+                return result
+            logger.warning("⚠️  RPC indisponible, repli sur le traitement classique")
+        
         # Vérifier si l'utilisateur existe
         step_start = time_module.time()
         existing_animal = supabase_manager.get_user_animal(plumid)
-        print(f"⏱️  User lookup: {time_module.time() - step_start:.2f}s")
+        logger.debug("⏱️  User lookup: %.2fs", time_module.time() - step_start)
         
         if existing_animal is None:
             # Nouvel utilisateur
             step_start = time_module.time()
             success = supabase_manager.add_user(plumid, current_top1_animal, user_name)
-            print(f"⏱️  User creation: {time_module.time() - step_start:.2f}s")
+            logger.debug("⏱️  User creation: %.2fs", time_module.time() - step_start)
             if success:
                 result['is_new_user'] = True
                 name_display = f" ({user_name})" if user_name else ""
-                print(f"✅ Nouvel utilisateur ajouté: {plumid}{name_display}")
+                logger.info("✅ Nouvel utilisateur ajouté: %s%s", plumid, name_display)
             else:
-                print(f"❌ Échec ajout utilisateur: {plumid}")
+                logger.error("❌ Échec ajout utilisateur: %s", plumid)
         else:
             # Utilisateur existant
             result['previous_animal'] = existing_animal
@@ -95,27 +243,27 @@ class AnimalStatisticsGenerator:
                 # L'animal a changé
                 step_start = time_module.time()
                 success = supabase_manager.update_user_animal(plumid, current_top1_animal, user_name)
-                print(f"⏱️  User update: {time_module.time() - step_start:.2f}s")
+                logger.debug("⏱️  User update: %.2fs", time_module.time() - step_start)
                 if success:
                     result['animal_changed'] = True
                     name_display = f" ({user_name})" if user_name else ""
-                    print(f"🔄 Animal mis à jour: {existing_animal} -> {current_top1_animal}{name_display}")
+                    logger.info("🔄 Animal mis à jour: %s -> %s%s", existing_animal, current_top1_animal, name_display)
                 else:
-                    print(f"❌ Échec mise à jour: {plumid}")
+                    logger.error("❌ Échec mise à jour: %s", plumid)
             else:
                 # Animal inchangé mais on peut mettre à jour le nom si fourni
                 if user_name:
                     step_start = time_module.time()
                     success = supabase_manager.update_user_animal(plumid, current_top1_animal, user_name)
-                    print(f"⏱️  Name update: {time_module.time() - step_start:.2f}s")
+                    logger.debug("⏱️  Name update: %.2fs", time_module.time() - step_start)
                     if success:
-                        print(f"ℹ️  Nom mis à jour: {plumid} ({user_name})")
+                        logger.info("ℹ️  Nom mis à jour: %s (%s)", plumid, user_name)
                     else:
-                        print(f"❌ Échec mise à jour nom: {plumid}")
+                        logger.error("❌ Échec mise à jour nom: %s", plumid)
                 else:
-                    print(f"ℹ️  Animal inchangé: {current_top1_animal}")
+                    logger.info("ℹ️  Animal inchangé: %s", current_top1_animal)
         
-        print(f"⏱️  User processing complete: {time_module.time() - process_start:.2f}s")
+        logger.debug("⏱️  User processing complete: %.2fs", time_module.time() - process_start)
         return result
     
     def generate_simple_animal_data(self, plumid: str, current_top1_animal: str) -> Dict:
@@ -129,7 +277,7 @@ class AnimalStatisticsGenerator:
         Returns:
             Dictionnaire avec les données simplifiées
         """
-        print("📊 Génération de données d'animaux simplifiées (sans pourcentages)...")
+        logger.info("📊 Génération de données d'animaux simplifiées (sans pourcentages)...")
         
         result = {
             'user_plumid': plumid,
@@ -138,7 +286,7 @@ class AnimalStatisticsGenerator:
             'all_animals_percentages': {}   # Désactivé
         }
         
-        print("✅ Données d'animaux simplifiées générées")
+        logger.info("✅ Données d'animaux simplifiées générées")
         return result
     
     def generate_animal_proportion(self, plumid: str, current_top1_animal: str) -> Dict:
@@ -160,25 +308,26 @@ class AnimalStatisticsGenerator:
         }
         
         if not supabase_manager.is_available():
-            print("⚠️  Supabase non disponible, génération de statistiques simulées")
+            logger.warning("⚠️  Supabase non disponible, génération de statistiques simulées")
             # Statistiques simulées pour le développement
             result['user_animal_percentage'] = 15.5  # Exemple
-            result['all_animals_percentages'] = {
-                animal: round(100 / len(self.all_animals), 2) 
-                for animal in self.all_animals[:10]  # Limiter pour l'exemple
-            }
+            result['all_animals_percentages'] = dict(self._sim_stats_template)
             return result
         
         # Calculer le pourcentage de l'utilisateur actuel
         user_percentage = supabase_manager.get_user_percentage(plumid, current_top1_animal)
         result['user_animal_percentage'] = user_percentage
         
-        # Récupérer les statistiques globales
-        global_stats = supabase_manager.get_animal_statistics()
+        # Récupérer les statistiques globales (partagées entre requêtes, TTL court)
+        global_stats = get_cached_animal_statistics()
         
-        # Compléter avec tous les animaux (même ceux avec 0%)
-        for animal in self.all_animals:
-            result['all_animals_percentages'][animal] = global_stats.get(animal, 0.0)
+        # Compléter avec tous les animaux (même ceux avec 0%), en ignorant les animaux inconnus
+        zero_template = self._zero_template  # charge aussi all_animals et _all_animals_set
+        known_animals = self._all_animals_set
+        result['all_animals_percentages'] = {
+            **zero_template,
+            **{animal: pct for animal, pct in global_stats.items() if animal in known_animals}
+        }
         
         return result
     
@@ -194,21 +343,35 @@ class AnimalStatisticsGenerator:
             True si succès, False sinon
         """
         try:
-            # Créer le dossier outputs s'il n'existe pas
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Sauvegarder le fichier
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(statistics, f, indent=2, ensure_ascii=False)
+            # Sauvegarder le fichier: un seul buffer écrit directement sur le descripteur
+            if HAS_ORJSON:
+                data = orjson.dumps(statistics, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(statistics, indent=2, ensure_ascii=False).encode('utf-8')
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            try:
+                fd = os.open(output_path, flags, 0o644)
+            except FileNotFoundError:
+                # Dossier de sortie absent: le créer seulement dans ce cas
+                # (les dossiers par requête existent déjà, pas de makedirs à chaque appel)
+                os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+                fd = os.open(output_path, flags, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             
-            print(f"✅ Statistiques sauvegardées: {output_path}")
+            logger.info("✅ Statistiques sauvegardées: %s", output_path)
             return True
             
         except Exception as e:
-            print(f"❌ Erreur sauvegarde statistiques: {e}")
+            logger.error("❌ Erreur sauvegarde statistiques: %s", e)
             return False
     
-    def run_full_analysis(self, date: str, time: str, lat: float, lon: float, top1_animal: str, user_name: str = None) -> Dict:
+    def run_full_analysis(self, date: str, time: str, lat: float, lon: float, top1_animal: str, user_name: str = None,
+                          output_dir: str = "outputs") -> Dict:
         """
         Exécute l'analyse complète des statistiques.
         
@@ -219,15 +382,16 @@ class AnimalStatisticsGenerator:
             lon: Longitude
             top1_animal: Animal top1 de l'utilisateur
             user_name: Nom de l'utilisateur (optionnel)
+            output_dir: Dossier où écrire animal_proportion.json
             
         Returns:
             Dictionnaire avec toutes les statistiques
         """
-        print("📊 Génération des statistiques d'animaux...")
+        logger.info("📊 Génération des statistiques d'animaux...")
         
         # Générer le PlumID
         plumid = self.generate_plumid(date, time, lat, lon)
-        print(f"🆔 PlumID généré: {plumid}")
+        logger.info("🆔 PlumID généré: %s", plumid)
         
         # Traiter l'utilisateur
         user_result = self.process_user(plumid, top1_animal, user_name)
@@ -239,7 +403,7 @@ class AnimalStatisticsGenerator:
         statistics['user_processing'] = user_result
         
         # Sauvegarder
-        self.save_animal_proportion(statistics)
+        self.save_animal_proportion(statistics, os.path.join(output_dir, "animal_proportion.json"))
         
         return statistics
 
@@ -5,13 +5,226 @@ Ce module calcule les aspects et patterns en réutilisant les calculs de thème
 """
 
 import os
+import sys
 import json
 import itertools
+import functools
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
 from flatlib.datetime import Datetime
 from flatlib.geopos import GeoPos
 from flatlib.chart import Chart
 from flatlib import const
-from flatlib.aspects import getAspect
+from flatlib.aspects import getAspect, MAX_MINOR_ASP_ORB
+
+# Aspects de la matrice d'orbes (dans flatlib, la valeur d'un aspect est son angle)
+_ASPECT_ANGLES = (
+    const.CONJUNCTION, const.SEXTILE, const.SQUARE, const.TRINE, const.QUINCUNX,
+    const.OPPOSITION, const.SEMISEXTILE, const.SEMISQUARE, const.QUINTILE,
+    const.SESQUIQUINTILE, const.BIQUINTILE
+)
+_ASPECT_INDEX = {aspect: k for k, aspect in enumerate(_ASPECT_ANGLES)}
+_ASPECT_ANGLE_VALUES = np.array(_ASPECT_ANGLES, dtype=np.float64)
+
+# Hiérarchie astrologique utilisée pour départager Yods et Cradles
+_PLANETARY_IMPORTANCE = {
+    # Angles (priorité maximale)
+    "Ascendant": 10,
+    "MC": 10,
+    # Luminaires (très haute priorité)
+    "Sun": 8,
+    "Moon": 8,
+    # Planètes personnelles (priorité moyenne)
+    "Mercury": 5,
+    "Venus": 5,
+    "Mars": 5,
+    # Planètes sociales (priorité basse)
+    "Jupiter": 3,
+    "Saturn": 3,
+    # Planètes transpersonnelles (Neptune prioritaire pour Yods)
+    "Neptune": 2.2,  # Légèrement prioritaire (spiritualité)
+    "Pluto": 2.1,    # Transformation
+    "Uranus": 2.0,   # Changement soudain
+    # Nœuds
+    "North Node": 1,
+    "South Node": 1
+}
+
+# Aspect d'une configuration entre les objets d'index p1 et p2 (0..12), mis en forme
+# seulement pour les patterns retenus (_render_aspects)
+AspectRecord = namedtuple("AspectRecord", "p1 p2 typ orb")
+
+
+def _average_orb(records):
+    """Orbe moyen d'une configuration, chaque orbe arrondi au dixième comme dans le texte affiché"""
+    return sum(round(record.orb, 1) for record in records) / len(records)
+
+class FakeAspect:
+    """Aspect factice pour les aspects calculés manuellement (pas de mouvement flatlib)"""
+    __slots__ = ("type", "orb")
+    
+    def __init__(self, aspect_type, orb_val):
+        self.type = aspect_type
+        self.orb = orb_val
+    def exists(self):
+        return True
+
+
+# Index des signes (Aries=0 ... Pisces=11): l'élément est l'index modulo 4
+# (0 Feu, 1 Terre, 2 Air, 3 Eau)
+_SIGN_INDEX = {sign: i for i, sign in enumerate(const.LIST_SIGNS)}
+
+
+# Les 6 paires (positions dans le quadruplet) d'une combinaison de 4 planètes, dans
+# l'ordre 12, 13, 14, 23, 24, 34; les paires 0/5, 1/4 et 2/3 sont disjointes
+_QUAD_PAIRS = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+_QUAD_DISJOINT_FIRST = [0, 1, 2]
+_QUAD_DISJOINT_SECOND = [5, 4, 3]
+
+
+@functools.lru_cache(maxsize=None)
+def _combination_indices(n, size):
+    """Toutes les combinaisons de size index parmi n (tableau NumPy k×size, ordre de itertools)"""
+    return np.array(list(itertools.combinations(range(n), size)), dtype=np.intp).reshape(-1, size)
+
+
+# Cache global persistant pour TimezoneFinder (chargement des polygones coûteux)
+_tf_instance = None
+
+
+def _get_timezone_finder():
+    """Retourne l'instance TimezoneFinder partagée, créée au premier appel"""
+    global _tf_instance
+    if _tf_instance is None:
+        from timezonefinder import TimezoneFinder
+        _tf_instance = TimezoneFinder()
+    return _tf_instance
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_zone_info(timezone_name):
+    """ZoneInfo mis en cache par nom de fuseau (lieux de naissance répétés)"""
+    return ZoneInfo(timezone_name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _timezone_at(lat, lon):
+    """Fuseau horaire d'un lieu, mis en cache par coordonnées exactes (lots de thèmes
+    partageant les mêmes villes)"""
+    return _get_timezone_finder().timezone_at(lat=lat, lng=lon)
+
+
+@dataclass(frozen=True)
+class ChartRequest:
+    """Demande de thème pour batch_generate (date "YYYY-MM-DD", heure "HH:MM")"""
+    date: str
+    time: str
+    lat: float
+    lon: float
+    max_orb: float = 8
+
+
+# Générateur utilisé par les processus du pool (hérité au fork, sinon créé au premier appel)
+_worker_generator = None
+
+
+def _generate_worker(request):
+    """Calcule aspects et patterns d'une ChartRequest dans un processus du pool"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = AspectsPatternsGenerator()
+    return _worker_generator.generate_aspects_patterns(
+        request.date, request.time, request.lat, request.lon, request.max_orb)
+
+
+def _angular_distance(lon1, lon2):
+    """Distance angulaire 0-180° entre deux longitudes (version scalaire de _compute_orb_matrix)"""
+    diff = abs(lon1 - lon2)
+    return 360 - diff if diff > 180 else diff
+
+
+def _compute_orb_matrix(lons, angles):
+    """Orbe de chaque aspect (angles) pour toutes les paires de longitudes: tableau n×n×k.
+    Entièrement vectorisé (n=13, k=11), les longitudes absentes (NaN) donnent NaN."""
+    diff = np.abs(lons[:, None] - lons[None, :])
+    diff = np.minimum(diff, 360 - diff)  # distance angulaire 0-180°
+    return np.abs(diff[:, :, None] - angles)
+
+
+def _connected_components(adjacency):
+    """Composantes connexes d'un graphe non orienté donné par sa matrice d'adjacence booléenne.
+    Retourne (nombre de composantes, label de chaque sommet); les composantes sont numérotées
+    dans l'ordre de leur plus petit sommet."""
+    n = len(adjacency)
+    # Voisins de chaque sommet sous forme de masque de bits (bit j = sommet j), en une opération
+    neighbours = adjacency.dot(1 << np.arange(n, dtype=np.int64)).tolist()
+    labels = [-1] * n
+    n_components = 0
+    for start in range(n):
+        if labels[start] >= 0:
+            continue
+        # Étendre la composante avec les voisins de tous ses sommets jusqu'à stabilité
+        component = 0
+        frontier = 1 << start
+        while frontier:
+            component |= frontier
+            reached = 0
+            while frontier:
+                low = frontier & -frontier
+                vertex = low.bit_length() - 1
+                labels[vertex] = n_components
+                reached |= neighbours[vertex]
+                frontier ^= low
+            frontier = reached & ~component
+        n_components += 1
+    return n_components, labels
+
+
+def _bits(mask):
+    """Index des bits à 1 d'un masque, par ordre croissant"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _maximal_cliques(adjacency, vertices):
+    """Cliques maximales (Bron–Kerbosch avec pivot) du sous-graphe des sommets du masque
+    vertices; adjacency est la matrice d'adjacence booléenne (diagonale ignorée).
+    Chaque clique est renvoyée sous forme de masque de bits."""
+    n = len(adjacency)
+    neighbours = adjacency.dot(1 << np.arange(n, dtype=np.int64)).tolist()
+    neighbours = [mask & ~(1 << v) for v, mask in enumerate(neighbours)]
+    cliques = []
+    
+    def expand(clique, candidates, excluded):
+        if not candidates and not excluded:
+            cliques.append(clique)
+            return
+        # Pivot: le sommet qui a le plus de voisins parmi les candidats
+        pivot = max(_bits(candidates | excluded), key=lambda u: bin(neighbours[u] & candidates).count("1"))
+        for v in _bits(candidates & ~neighbours[pivot]):
+            expand(clique | 1 << v, candidates & neighbours[v], excluded & neighbours[v])
+            candidates &= ~(1 << v)
+            excluded |= 1 << v
+    
+    expand(0, vertices, 0)
+    return cliques
+
+
+def _find_triangles(orbs_ab, orbs_ac, orbs_bc, max_orb):
+    """Trouve en une seule passe NumPy tous les triplets d'index (a, b, c) tels que les
+    paires a-b, a-c et b-c soient dans l'orbe (matrices n×n, inf si pas d'aspect).
+    Les triplets sont renvoyés dans l'ordre lexicographique, comme itertools.permutations."""
+    within = ((orbs_ab <= max_orb)[:, :, None] &
+              (orbs_ac <= max_orb)[:, None, :] &
+              (orbs_bc <= max_orb)[None, :, :])
+    return [tuple(triangle) for triangle in np.argwhere(within).tolist()]
 
 class AspectsPatternsGenerator:
     def __init__(self):
@@ -31,6 +244,19 @@ class AspectsPatternsGenerator:
             const.ASC: "Ascendant",
             const.MC: "MC"
         }
+        # Objets analysés (même liste que PLUMATOTM); leur position 0..12 sert d'index
+        # à tous les tableaux par objet
+        self._OBJECTS = (
+            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
+            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
+            const.NORTH_NODE, const.ASC, const.MC
+        )
+        # Nom affiché de chaque objet, par index (traduction faite une seule fois au rendu)
+        self._NAME_BY_IDX = tuple(self.planet_names.get(obj_id, obj_id) for obj_id in self._OBJECTS)
+        # Importance astrologique par index d'objet (alignée sur _NAME_BY_IDX)
+        self._IMPORTANCE_BY_IDX = tuple(_PLANETARY_IMPORTANCE.get(name, 0) for name in self._NAME_BY_IDX)
+        # Correspondance inverse nom -> ID flatlib (recherches en O(1))
+        self._name_to_id = {name: obj_id for obj_id, name in self.planet_names.items()}
         self.aspect_names = {
             const.CONJUNCTION: "Conjunction",
             const.SEXTILE: "Sextile",
@@ -65,6 +291,9 @@ class AspectsPatternsGenerator:
             const.BIQUINTILE: 4,
             const.QUINCUNX: 4
         }
+        # Mêmes orbes dans l'ordre de _ASPECT_ANGLES (comparaisons vectorisées)
+        self._aspect_orb_values = np.array([self.get_aspect_orb(aspect) for aspect in _ASPECT_ANGLES],
+                                           dtype=np.float64)
     
     def get_aspect_orb(self, aspect_type):
         """Retourne l'orbe approprié pour un type d'aspect donné"""
@@ -79,13 +308,8 @@ class AspectsPatternsGenerator:
             
         try:
             # Conversion UTC simplifiée (copiée de plumatotm_core)
-            from datetime import datetime
-            from zoneinfo import ZoneInfo
-            from timezonefinder import TimezoneFinder
-            
-            # Utiliser TimezoneFinder pour obtenir le timezone
-            tf = TimezoneFinder()
-            timezone_name = tf.timezone_at(lat=lat, lng=lon)
+            # Utiliser TimezoneFinder (instance partagée) pour obtenir le timezone
+            timezone_name = _timezone_at(lat, lon)
             
             if not timezone_name:
                 raise ValueError(f"Could not determine timezone for coordinates ({lat}, {lon})")
@@ -94,8 +318,8 @@ class AspectsPatternsGenerator:
             y, m, d = map(int, date.split("-"))
             hh, mm = map(int, time.split(":"))
             local_naive = datetime(y, m, d, hh, mm)
-            local_dt = local_naive.replace(tzinfo=ZoneInfo(timezone_name))
-            utc_dt = local_dt.astimezone(ZoneInfo("UTC"))
+            local_dt = local_naive.replace(tzinfo=_get_zone_info(timezone_name))
+            utc_dt = local_dt.astimezone(_get_zone_info("UTC"))
             utc_date = utc_dt.strftime("%Y/%m/%d")
             utc_time = utc_dt.strftime("%H:%M")
             
@@ -132,560 +356,482 @@ class AspectsPatternsGenerator:
         except Exception:
             return None
 
+    def _build_position_arrays(self, chart):
+        """Extrait une seule fois par thème les positions des objets dans des tableaux NumPy
+        alignés sur les index 0..12, pour que les détecteurs ne relisent plus les objets flatlib"""
+        objects = self._OBJECTS
+        objs = [self._get_chart_object(chart, obj_id) for obj_id in objects]
+        
+        positions = {
+            "ids": objects,
+            "objects": objs,
+            # Index des objets présents dans le thème (les absents sont ignorés)
+            "indices": [i for i, obj in enumerate(objs) if obj],
+            "valid": np.array([bool(obj) for obj in objs]),
+            "lons": np.array([obj.lon if obj else np.nan for obj in objs], dtype=np.float64),
+            "signlons": np.array([obj.signlon if obj else np.nan for obj in objs], dtype=np.float64),
+            "signs": [obj.sign if obj else None for obj in objs],
+            "elements": np.array([_SIGN_INDEX[obj.sign] % 4 if obj else -1 for obj in objs], dtype=np.int8),
+            "names": self._NAME_BY_IDX,
+            "positions": [f"{obj.signlon:.1f}° {obj.sign}" if obj else None for obj in objs],
+            # Propriétés utilisées par flatlib pour valider un aspect (orbe de l'objet,
+            # vitesse pour désigner l'objet actif, Nœuds limités aux conjonctions)
+            "object_orbs": np.array([obj.orb() if obj else np.nan for obj in objs], dtype=np.float64),
+            "speeds": np.array([(abs(obj.lonspeed) if obj.isPlanet() else -1.0) if obj else np.nan
+                                for obj in objs], dtype=np.float64),
+            "conjunction_only": np.array([bool(obj) and obj.id in (const.PARS_FORTUNA, const.NORTH_NODE, const.SOUTH_NODE)
+                                          for obj in objs])
+        }
+        positions.update(self._build_aspect_matrix(positions))
+        # Aspects majeurs flatlib déjà calculés, par paire (i, j) avec i < j (_major_aspect)
+        positions["aspect_cache"] = {}
+        return positions
+
+    def _aspect_orbs(self, positions, aspect_type, matrix="orb_matrix"):
+        """Orbes d'un aspect pour chaque paire (i, j) sous forme de listes Python (inf si absent)"""
+        return positions[matrix][:, :, _ASPECT_INDEX[aspect_type]].tolist()
+
+    def _major_aspect(self, positions, i, j):
+        """getAspect(MAJOR_ASPECTS) entre les objets i et j, calculé une seule fois par paire et
+        par thème (flatlib choisit lui-même l'objet actif, le résultat ne dépend pas de l'ordre)"""
+        key = (i, j) if i < j else (j, i)
+        aspect = positions["aspect_cache"].get(key)
+        if aspect is None:
+            objs = positions["objects"]
+            aspect = getAspect(objs[key[0]], objs[key[1]], const.MAJOR_ASPECTS)
+            positions["aspect_cache"][key] = aspect
+        return aspect
+
+    def _build_aspect_matrix(self, positions):
+        """Calcule en une passe NumPy les orbes de tous les aspects entre toutes les paires d'objets
+        
+        Retourne deux matrices n×n×len(_ASPECT_ANGLES) contenant l'orbe, ou np.inf si l'aspect
+        n'existe pas :
+        - "orb_matrix": aspects trouvés par _get_aspect_with_node_override
+        - "flatlib_orb_matrix": aspects trouvés par getAspect seul
+        L'ordre (i, j) compte, comme pour flatlib (objet actif/passif).
+        """
+        lons = positions["lons"]
+        angles = _ASPECT_ANGLE_VALUES
+        orbs = _compute_orb_matrix(lons, angles)
+        
+        # Règles de flatlib: aspects majeurs dans l'orbe de l'un des objets, mineurs dans 3°,
+        # et un Nœud actif ne forme que des conjonctions
+        object_orbs = positions["object_orbs"]
+        limits = np.maximum(object_orbs[:, None], object_orbs[None, :])
+        is_major = np.isin(angles, const.MAJOR_ASPECTS)
+        flatlib_found = np.where(is_major, orbs <= limits[:, :, None], orbs <= MAX_MINOR_ASP_ORB)
+        speeds = positions["speeds"]
+        conjunction_only = positions["conjunction_only"]
+        active_conjunction_only = np.where(speeds[:, None] > speeds[None, :],
+                                           conjunction_only[:, None], conjunction_only[None, :])
+        flatlib_found &= ~(active_conjunction_only[:, :, None] & (angles != const.CONJUNCTION))
+        
+        # L'override ajoute le calcul manuel avec les orbes différenciés
+        found = flatlib_found | (orbs <= self._aspect_orb_values)
+        
+        # Pas d'aspect d'un objet avec lui-même
+        diagonal = np.arange(len(lons))
+        found[diagonal, diagonal] = False
+        flatlib_found[diagonal, diagonal] = False
+        
+        return {
+            # Orbes brutes de tous les aspects, sans limite d'orbe
+            "orbs": orbs,
+            # Distance angulaire (0-180°) entre chaque paire: orbe de la conjonction
+            "distances": orbs[:, :, _ASPECT_INDEX[const.CONJUNCTION]],
+            "orb_matrix": np.where(found, orbs, np.inf),
+            "flatlib_orb_matrix": np.where(flatlib_found, orbs, np.inf)
+        }
+
     def _get_aspect_with_node_override(self, obj1, obj2, aspect_list):
         """Obtient un aspect en contournant les bugs flatlib pour les Nœuds et Quinconces"""
         # D'abord essayer la méthode normale
         aspect = getAspect(obj1, obj2, aspect_list)
         
         # Si pas d'aspect, calculer manuellement (bug flatlib avec Nodes et Quinconces)
-        if not aspect or not aspect.exists():
+        # (getAspect renvoie toujours un Aspect, de type NO_ASPECT s'il n'en trouve pas)
+        if aspect.type == const.NO_ASPECT:
             # Calculer manuellement la différence d'angle
-            diff = abs(obj1.lon - obj2.lon)
-            if diff > 180:
-                diff = 360 - diff
+            diff = _angular_distance(obj1.lon, obj2.lon)
             
-            # Définir les angles cibles pour chaque aspect
-            aspect_angles = {
-                const.CONJUNCTION: 0,
-                const.SEXTILE: 60,
-                const.SQUARE: 90,
-                const.TRINE: 120,
-                const.QUINCUNX: 150,
-                const.OPPOSITION: 180,
-                const.SEMISEXTILE: 30,
-                const.SEMISQUARE: 45,
-                const.QUINTILE: 72,
-                const.SESQUIQUINTILE: 108,
-                const.BIQUINTILE: 144
-            }
+            # Tous les angles cibles comparés en une fois aux orbes différenciés
+            orbs = np.abs(diff - _ASPECT_ANGLE_VALUES)
+            hits = np.flatnonzero(orbs <= self._aspect_orb_values)
             
-            # Vérifier chaque aspect demandé
-            for aspect_type in aspect_list:
-                if aspect_type in aspect_angles:
-                    target_angle = aspect_angles[aspect_type]
-                    orb = abs(diff - target_angle)
-                    max_orb = self.get_aspect_orb(aspect_type)  # Utilise les orbes différenciés
-                    
-                    if orb <= max_orb:
+            # Premier aspect demandé dans l'orbe (dans l'ordre de aspect_list)
+            if hits.size:
+                hit_orbs = {_ASPECT_ANGLES[k]: orbs[k] for k in hits.tolist()}
+                for aspect_type in aspect_list:
+                    if aspect_type in hit_orbs:
                         # Créer un objet aspect factice
-                        class FakeAspect:
-                            def __init__(self, aspect_type, orb_val):
-                                self.type = aspect_type
-                                self.orb = orb_val
-                            def exists(self):
-                                return True
-                        
-                        return FakeAspect(aspect_type, orb)
+                        return FakeAspect(aspect_type, float(hit_orbs[aspect_type]))
         
         return aspect
 
-    def calculate_aspects(self, chart, max_orb=8):
+    def calculate_aspects(self, chart, max_orb=8, positions=None):
         """Calcule tous les aspects du thème"""
         aspects = []
         
-        # Liste des objets à analyser (même que PLUMATOTM)
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
+        # Positions des objets (même liste que PLUMATOTM), extraites une seule fois
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        indices = positions["indices"]
+        orb_matrix = positions["orb_matrix"]
+        names = positions["names"]
+        places = positions["positions"]
+        # Recherches hors des boucles
+        aspect_names = self.aspect_names
+        get_aspect_orb = self.get_aspect_orb
         
         # Calculer les aspects entre tous les objets
-        for i, obj1_id in enumerate(objects):
-            obj1 = self._get_chart_object(chart, obj1_id)
-            if not obj1:
-                continue
-            
-            for j, obj2_id in enumerate(objects):
+        for i in indices:
+            for j in indices:
                 if i >= j:  # Éviter les doublons et les aspects avec soi-même
                     continue
                 
-                obj2 = self._get_chart_object(chart, obj2_id)
-                if not obj2:
-                    continue
-                
                 # Obtenir l'aspect avec fallback manuel pour North Node et Ascendant
-                aspect = getAspect(obj1, obj2, const.MAJOR_ASPECTS)
+                aspect = self._major_aspect(positions, i, j)
                 
-                # Si flatlib ne détecte pas l'aspect, essayer manuellement (pour North Node, ASC, MC)
-                if not aspect or not aspect.exists():
-                    # Essayer avec notre override qui calcule manuellement
-                    aspect = self._get_aspect_with_node_override(obj1, obj2, [
-                        const.CONJUNCTION, const.SEXTILE, const.SQUARE, 
-                        const.TRINE, const.OPPOSITION
-                    ])
+                if aspect.type == const.NO_ASPECT:
+                    # Si flatlib ne détecte pas l'aspect (North Node, ASC, MC), le calcul manuel
+                    # de l'override est déjà dans la matrice d'orbes: premier aspect majeur trouvé
+                    orbs = orb_matrix[i, j].tolist()
+                    aspect_type = next((a for a in const.MAJOR_ASPECTS if orbs[_ASPECT_INDEX[a]] < np.inf), None)
+                    if aspect_type is None:
+                        continue
+                    aspect = FakeAspect(aspect_type, orbs[_ASPECT_INDEX[aspect_type]])
+                aspect_type, orb = aspect.type, aspect.orb
                 
-                if aspect and aspect.exists():
-                    # Utiliser l'orbe approprié pour ce type d'aspect
-                    aspect_orb = self.get_aspect_orb(aspect.type)
-                    
-                    # Si max_orb est spécifié, l'utiliser comme limite supérieure
-                    if max_orb is not None:
-                        aspect_orb = min(aspect_orb, max_orb)
-                    
-                    if aspect.orb <= aspect_orb:
-                        # Gérer le mouvement (peut ne pas exister pour les aspects manuels)
-                        try:
-                            movement = aspect.movement()
-                        except:
-                            movement = "N/A"
-                        
-                        aspect_info = {
-                            "planet1": self.planet_names.get(obj1_id, obj1_id),
-                            "planet2": self.planet_names.get(obj2_id, obj2_id),
-                            "aspect": self.aspect_names.get(aspect.type, "Unknown"),
-                            "orb": round(aspect.orb, 1),
-                            "movement": movement,
-                            "planet1_position": f"{obj1.signlon:.1f}° {obj1.sign}",
-                            "planet2_position": f"{obj2.signlon:.1f}° {obj2.sign}"
-                        }
-                        aspects.append(aspect_info)
+                # Utiliser l'orbe approprié pour ce type d'aspect
+                aspect_orb = get_aspect_orb(aspect_type)
+                
+                # Si max_orb est spécifié, l'utiliser comme limite supérieure
+                if max_orb is not None:
+                    aspect_orb = min(aspect_orb, max_orb)
+                
+                if orb <= aspect_orb:
+                    aspect_info = {
+                        "planet1": names[i],
+                        "planet2": names[j],
+                        "aspect": aspect_names.get(aspect_type, "Unknown"),
+                        "orb": round(orb, 1),
+                        # Pas de mouvement pour les aspects calculés manuellement
+                        "movement": "N/A" if isinstance(aspect, FakeAspect) else aspect.movement(),
+                        "planet1_position": places[i],
+                        "planet2_position": places[j]
+                    }
+                    aspects.append(aspect_info)
         
         # Trier par orb croissant
         aspects.sort(key=lambda x: x["orb"])
         
         return aspects
 
-    def _detect_t_square(self, chart, max_orb=8):
+    def _detect_t_square(self, chart, max_orb=8, positions=None):
         """Détecte les T-Squares (2 oppositions + 2 carrés) - AVEC OVERRIDE pour bugs flatlib"""
         t_squares = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        names = positions["names"]
+        places = positions["positions"]
         
-        for p1_id, p2_id, p3_id in itertools.permutations(objects, 3):
-            obj1 = self._get_chart_object(chart, p1_id)
-            obj2 = self._get_chart_object(chart, p2_id)
-            obj3 = self._get_chart_object(chart, p3_id)
-
-            if not (obj1 and obj2 and obj3):
-                continue
-
-            # Vérifier les aspects AVEC OVERRIDE pour contourner bugs flatlib (angles)
-            asp12 = self._get_aspect_with_node_override(obj1, obj2, [const.OPPOSITION])
-            asp13 = self._get_aspect_with_node_override(obj1, obj3, [const.SQUARE])
-            asp23 = self._get_aspect_with_node_override(obj2, obj3, [const.SQUARE])
-
-            if (asp12 and asp12.exists() and asp12.orb <= max_orb and
-                asp13 and asp13.exists() and asp13.orb <= max_orb and
-                asp23 and asp23.exists() and asp23.orb <= max_orb):
-                
-                t_squares.append({
-                    "type": "T-Square",
-                    "planets": [
-                        {"name": self.planet_names.get(p1_id, p1_id), "position": f"{obj1.signlon:.1f}° {obj1.sign}"},
-                        {"name": self.planet_names.get(p2_id, p2_id), "position": f"{obj2.signlon:.1f}° {obj2.sign}"},
-                        {"name": self.planet_names.get(p3_id, p3_id), "position": f"{obj3.signlon:.1f}° {obj3.sign}"}
-                    ],
-                    "aspects": [
-                        f"{self.planet_names.get(p1_id, p1_id)} {self.aspect_names.get(asp12.type, 'Unknown')} {self.planet_names.get(p2_id, p2_id)} (orb: {asp12.orb:.1f}°)",
-                        f"{self.planet_names.get(p1_id, p1_id)} {self.aspect_names.get(asp13.type, 'Unknown')} {self.planet_names.get(p3_id, p3_id)} (orb: {asp13.orb:.1f}°)",
-                        f"{self.planet_names.get(p2_id, p2_id)} {self.aspect_names.get(asp23.type, 'Unknown')} {self.planet_names.get(p3_id, p3_id)} (orb: {asp23.orb:.1f}°)"
-                    ]
-                })
+        # Orbes lues dans la matrice du thème (mêmes règles que l'override flatlib)
+        orb_matrix = positions["orb_matrix"]
+        opposition = orb_matrix[:, :, _ASPECT_INDEX[const.OPPOSITION]]
+        square = orb_matrix[:, :, _ASPECT_INDEX[const.SQUARE]]
+        
+        # Tous les ordres (p1 opposition p2, apex p3) valides en une passe; pour chaque trio
+        # on garde le premier (l'opposition est testée dans les deux sens, car l'objet
+        # actif/passif de flatlib peut rendre la matrice asymétrique)
+        found = []
+        seen = set()
+        for triangle in _find_triangles(opposition, square, square, max_orb):
+            key = frozenset(triangle)
+            if key not in seen:
+                seen.add(key)
+                found.append(triangle)
+        
+        opposition = opposition.tolist()
+        square = square.tolist()
+        
+        for p1, p2, p3 in found:
+            t_squares.append({
+                "type": "T-Square",
+                "planets": [
+                    {"name": names[p1], "position": places[p1]},
+                    {"name": names[p2], "position": places[p2]},
+                    {"name": names[p3], "position": places[p3]}
+                ],
+                "aspects": [
+                    AspectRecord(p1, p2, const.OPPOSITION, opposition[p1][p2]),
+                    AspectRecord(p1, p3, const.SQUARE, square[p1][p3]),
+                    AspectRecord(p2, p3, const.SQUARE, square[p2][p3])
+                ]
+            })
         return t_squares
 
-    def _get_element(self, sign):
-        """Détermine l'élément d'un signe zodiacal"""
-        fire = ['Aries', 'Leo', 'Sagittarius']
-        earth = ['Taurus', 'Virgo', 'Capricorn']
-        air = ['Gemini', 'Libra', 'Aquarius']
-        water = ['Cancer', 'Scorpio', 'Pisces']
-        
-        if sign in fire:
-            return "Fire"
-        elif sign in earth:
-            return "Earth"
-        elif sign in air:
-            return "Air"
-        elif sign in water:
-            return "Water"
-        else:
-            return "Unknown"
-
-    def _detect_grand_trine(self, chart, max_orb=8):
+    def _detect_grand_trine(self, chart, max_orb=8, positions=None):
         """Détecte les Grand Trines (3 planètes en trine mutuel dans le même élément)"""
         grand_trines = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        names = positions["names"]
+        places = positions["positions"]
+        elements = positions["elements"].tolist()
         
-        for p1_id, p2_id, p3_id in itertools.combinations(objects, 3):
-            obj1 = self._get_chart_object(chart, p1_id)
-            obj2 = self._get_chart_object(chart, p2_id)
-            obj3 = self._get_chart_object(chart, p3_id)
-
-            if not (obj1 and obj2 and obj3):
+        # Orbes lues dans la matrice du thème (override flatlib restriction for North Node)
+        trine = positions["orb_matrix"][:, :, _ASPECT_INDEX[const.TRINE]]
+        triangles = _find_triangles(trine, trine, trine, max_orb)
+        trine = trine.tolist()
+        
+        for p1, p2, p3 in triangles:
+            # Chaque trio une seule fois, dans l'ordre de itertools.combinations
+            if not p1 < p2 < p3:
                 continue
-
-            # Vérifier les aspects (override flatlib restriction for North Node)
-            asp12 = self._get_aspect_with_node_override(obj1, obj2, [const.TRINE])
-            asp13 = self._get_aspect_with_node_override(obj1, obj3, [const.TRINE])
-            asp23 = self._get_aspect_with_node_override(obj2, obj3, [const.TRINE])
-
-            if (asp12 and asp12.exists() and asp12.orb <= max_orb and
-                asp13 and asp13.exists() and asp13.orb <= max_orb and
-                asp23 and asp23.exists() and asp23.orb <= max_orb):
-                
-                # Vérifier que les 3 planètes sont dans le même élément
-                element1 = self._get_element(obj1.sign)
-                element2 = self._get_element(obj2.sign)
-                element3 = self._get_element(obj3.sign)
-                
-                # Un vrai Grand Trigone doit avoir les 3 planètes dans le même élément
-                if element1 == element2 == element3 and element1 != "Unknown":
-                    grand_trines.append({
-                        "type": "Grand Trine",
-                        "planets": [
-                            {"name": self.planet_names.get(p1_id, p1_id), "position": f"{obj1.signlon:.1f}° {obj1.sign}"},
-                            {"name": self.planet_names.get(p2_id, p2_id), "position": f"{obj2.signlon:.1f}° {obj2.sign}"},
-                            {"name": self.planet_names.get(p3_id, p3_id), "position": f"{obj3.signlon:.1f}° {obj3.sign}"}
-                        ],
-                        "aspects": [
-                            f"{self.planet_names.get(p1_id, p1_id)} {self.aspect_names.get(asp12.type, 'Unknown')} {self.planet_names.get(p2_id, p2_id)} (orb: {asp12.orb:.1f}°)",
-                            f"{self.planet_names.get(p1_id, p1_id)} {self.aspect_names.get(asp13.type, 'Unknown')} {self.planet_names.get(p3_id, p3_id)} (orb: {asp13.orb:.1f}°)",
-                            f"{self.planet_names.get(p2_id, p2_id)} {self.aspect_names.get(asp23.type, 'Unknown')} {self.planet_names.get(p3_id, p3_id)} (orb: {asp23.orb:.1f}°)"
-                        ]
-                    })
+            orb12 = trine[p1][p2]
+            orb13 = trine[p1][p3]
+            orb23 = trine[p2][p3]
+            
+            # Un vrai Grand Trigone doit avoir les 3 planètes dans le même élément
+            if elements[p1] == elements[p2] == elements[p3]:
+                grand_trines.append({
+                    "type": "Grand Trine",
+                    "planets": [
+                        {"name": names[p1], "position": places[p1]},
+                        {"name": names[p2], "position": places[p2]},
+                        {"name": names[p3], "position": places[p3]}
+                    ],
+                    "aspects": [
+                        AspectRecord(p1, p2, const.TRINE, orb12),
+                        AspectRecord(p1, p3, const.TRINE, orb13),
+                        AspectRecord(p2, p3, const.TRINE, orb23)
+                    ]
+                })
         return grand_trines
 
-    def _detect_kite(self, chart, max_orb=8):
-        """Détecte les configurations Kite (Grand Trigone + Opposition + 2 Sextiles)"""
+    def _detect_kite(self, chart, max_orb=8, positions=None, grand_trines=None):
+        """Détecte les configurations Kite (Grand Trigone + Opposition + 2 Sextiles)
+        
+        grand_trines: Grand Trigones déjà détectés pour ce thème (recalculés si absent)
+        """
         kites = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        objects = positions["ids"]
+        names = positions["names"]
+        places = positions["positions"]
+        opposition = self._aspect_orbs(positions, const.OPPOSITION)
+        sextile = self._aspect_orbs(positions, const.SEXTILE)
+        
+        # Planètes en opposition avec chaque planète (seules candidates pour la 4ème pointe)
+        opposed_to = {g: {p for p in positions["indices"] if opposition[p][g] <= max_orb}
+                      for g in positions["indices"]}
         
         # D'abord, trouver tous les Grand Trigones valides
-        grand_trines = self._detect_grand_trine(chart, max_orb)
+        if grand_trines is None:
+            grand_trines = self._detect_grand_trine(chart, max_orb, positions=positions)
         
         for gt in grand_trines:
             # Extraire les 3 planètes du Grand Trigone
             gt_planets = [p["name"] for p in gt["planets"]]
             
             # Convertir les noms en IDs flatlib
-            gt_ids = []
-            for planet_name in gt_planets:
-                # Trouver l'ID flatlib correspondant
-                for flatlib_id, name in self.planet_names.items():
-                    if name == planet_name:
-                        gt_ids.append(flatlib_id)
-                        break
+            gt_ids = [self._name_to_id[name] for name in gt_planets if name in self._name_to_id]
             
             if len(gt_ids) != 3:
                 continue
                 
-            # Obtenir les objets du Grand Trigone
-            gt_obj1 = self._get_chart_object(chart, gt_ids[0])
-            gt_obj2 = self._get_chart_object(chart, gt_ids[1])
-            gt_obj3 = self._get_chart_object(chart, gt_ids[2])
+            # Obtenir les index du Grand Trigone
+            gt_idx = [objects.index(gt_id) for gt_id in gt_ids]
             
-            if not (gt_obj1 and gt_obj2 and gt_obj3):
-                continue
+            # Chercher une 4ème planète qui forme un Kite: seules les planètes en opposition
+            # avec l'une des planètes du GT peuvent convenir
+            candidates = opposed_to[gt_idx[0]] | opposed_to[gt_idx[1]] | opposed_to[gt_idx[2]]
+            candidates -= set(gt_idx)  # Éviter de reprendre une planète du Grand Trigone
             
-            # Chercher une 4ème planète qui forme un Kite
-            for p4_id in objects:
-                if p4_id in gt_ids:
-                    continue  # Éviter de reprendre une planète du Grand Trigone
-                    
-                p4_obj = self._get_chart_object(chart, p4_id)
-                if not p4_obj:
-                    continue
-                
+            for p4 in sorted(candidates):
                 # Vérifier si cette planète forme une opposition avec l'une des planètes du GT
-                opposition_found = False
                 opposition_planet = None
                 
-                for gt_obj in [gt_obj1, gt_obj2, gt_obj3]:
-                    opp_aspect = self._get_aspect_with_node_override(p4_obj, gt_obj, [const.OPPOSITION])
-                    if opp_aspect and opp_aspect.exists() and opp_aspect.orb <= max_orb:
-                        opposition_found = True
-                        opposition_planet = gt_obj
+                for g in gt_idx:
+                    if opposition[p4][g] <= max_orb:
+                        opposition_planet = g
                         break
                 
-                if not opposition_found:
+                if opposition_planet is None:
                     continue
                 
                 # Vérifier que la 4ème planète forme des sextiles avec les 2 autres planètes du GT
-                sextile_count = 0
-                sextile_planets = []
-                
-                for gt_obj in [gt_obj1, gt_obj2, gt_obj3]:
-                    if gt_obj == opposition_planet:
-                        continue  # Skip la planète en opposition
-                        
-                    sext_aspect = self._get_aspect_with_node_override(p4_obj, gt_obj, [const.SEXTILE])
-                    if sext_aspect and sext_aspect.exists() and sext_aspect.orb <= max_orb:
-                        sextile_count += 1
-                        sextile_planets.append(gt_obj)
+                sextile_planets = [g for g in gt_idx
+                                   if g != opposition_planet and sextile[p4][g] <= max_orb]
                 
                 # Si on a exactement 2 sextiles, on a un Kite !
-                if sextile_count == 2:
-                    p4_name = self.planet_names.get(p4_id, str(p4_id))
+                if len(sextile_planets) == 2:
+                    p4_name = names[p4]
                     
                     kites.append({
                         "type": "Cerf-volant",
                         "planets": [
-                            {"name": self.planet_names.get(gt_ids[0], str(gt_ids[0])), "position": f"{gt_obj1.signlon:.1f}° {gt_obj1.sign}"},
-                            {"name": self.planet_names.get(gt_ids[1], str(gt_ids[1])), "position": f"{gt_obj2.signlon:.1f}° {gt_obj2.sign}"},
-                            {"name": self.planet_names.get(gt_ids[2], str(gt_ids[2])), "position": f"{gt_obj3.signlon:.1f}° {gt_obj3.sign}"},
-                            {"name": p4_name, "position": f"{p4_obj.signlon:.1f}° {p4_obj.sign}"}
+                            {"name": names[gt_idx[0]], "position": places[gt_idx[0]]},
+                            {"name": names[gt_idx[1]], "position": places[gt_idx[1]]},
+                            {"name": names[gt_idx[2]], "position": places[gt_idx[2]]},
+                            {"name": p4_name, "position": places[p4]}
                         ],
                         "aspects": [
                             f"Grand Trigone: {gt_planets[0]}, {gt_planets[1]}, {gt_planets[2]}",
-                            f"Opposition: {p4_name} Opposition {self.planet_names.get(opposition_planet.id, str(opposition_planet.id))}",
-                            f"Sextiles: {p4_name} Sextile {self.planet_names.get(sextile_planets[0].id, str(sextile_planets[0].id))}, {self.planet_names.get(sextile_planets[1].id, str(sextile_planets[1].id))}"
+                            f"Opposition: {p4_name} Opposition {names[opposition_planet]}",
+                            f"Sextiles: {p4_name} Sextile {names[sextile_planets[0]]}, {names[sextile_planets[1]]}"
                         ]
                     })
         
         return kites
 
-    def _detect_cradle(self, chart, max_orb=8):
+    def _detect_cradle(self, chart, max_orb=8, positions=None):
         """Détecte les configurations Cradle/Berceau (opposition + 2 paires harmonieuses trine/sextile)"""
         cradles = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
-        
-        # Chercher toutes les combinaisons de 4 planètes
-        for combo in itertools.combinations(objects, 4):
-            objs = []
-            for planet_id in combo:
-                obj = self._get_chart_object(chart, planet_id)
-                if not obj:
-                    break
-                objs.append((planet_id, obj))
-            
-            if len(objs) != 4:
-                continue
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        names = positions["names"]
+        importance = self._IMPORTANCE_BY_IDX
+        places = positions["positions"]
+        
+        # Orbes lues dans la matrice du thème
+        opposition = self._aspect_orbs(positions, const.OPPOSITION)
+        trine = self._aspect_orbs(positions, const.TRINE)
+        sextile = self._aspect_orbs(positions, const.SEXTILE)
+        
+        # Un cradle repose sur une opposition: partir de la liste (courte) des paires en
+        # opposition plutôt que de toutes les combinaisons de 4 planètes
+        indices = positions["indices"]
+        opposition_pairs = [(p1, p2) for p1, p2 in itertools.combinations(indices, 2)
+                            if opposition[p1][p2] <= max_orb]
+        
+        found = []
+        for p1, p2 in opposition_pairs:
+            # Seules les planètes en trigone avec un pôle et en sextile avec l'autre peuvent
+            # compléter le cradle: on ne forme les paires (p3, p4) que parmi elles
+            candidates = [k for k in indices if k != p1 and k != p2 and
+                          ((trine[k][p1] <= max_orb and sextile[k][p2] <= max_orb) or
+                           (sextile[k][p1] <= max_orb and trine[k][p2] <= max_orb))]
+            for p3, p4 in itertools.combinations(candidates, 2):
+                # Config 1: p3 trine p1, sextile p2; p4 sextile p1, trine p2
+                # Config 2: p3 sextile p1, trine p2; p4 trine p1, sextile p2
+                if (trine[p3][p1] <= max_orb and sextile[p3][p2] <= max_orb and
+                    sextile[p4][p1] <= max_orb and trine[p4][p2] <= max_orb):
+                    config = 1
+                elif (sextile[p3][p1] <= max_orb and trine[p3][p2] <= max_orb and
+                      trine[p4][p1] <= max_orb and sextile[p4][p2] <= max_orb):
+                    config = 2
+                else:
+                    continue
+                found.append((tuple(sorted((p1, p2, p3, p4))), p1, p2, p3, p4, config))
+        
+        # Même ordre qu'un parcours des combinaisons de 4 planètes puis des paires en opposition
+        found.sort()
+        
+        for _, p1, p2, p3, p4, config in found:
+            if config == 1:
+                aspects = [
+                    AspectRecord(p3, p1, const.TRINE, trine[p3][p1]),
+                    AspectRecord(p3, p2, const.SEXTILE, sextile[p3][p2]),
+                    AspectRecord(p4, p1, const.SEXTILE, sextile[p4][p1]),
+                    AspectRecord(p4, p2, const.TRINE, trine[p4][p2])
+                ]
+            else:
+                aspects = [
+                    AspectRecord(p3, p1, const.SEXTILE, sextile[p3][p1]),
+                    AspectRecord(p3, p2, const.TRINE, trine[p3][p2]),
+                    AspectRecord(p4, p1, const.TRINE, trine[p4][p1]),
+                    AspectRecord(p4, p2, const.SEXTILE, sextile[p4][p2])
+                ]
+            aspects.insert(0, AspectRecord(p1, p2, const.OPPOSITION, opposition[p1][p2]))
             
-            # Essayer toutes les configurations possibles pour trouver un cradle
-            # Un cradle a 1 opposition + 4 aspects harmonieux (2 trines + 2 sextiles)
-            for i in range(4):
-                for j in range(i+1, 4):
-                    # Tester si objs[i] et objs[j] sont en opposition
-                    p1_id, obj1 = objs[i]
-                    p2_id, obj2 = objs[j]
-                    
-                    opp_asp = self._get_aspect_with_node_override(obj1, obj2, [const.OPPOSITION])
-                    if not opp_asp or not opp_asp.exists() or opp_asp.orb > max_orb:
-                        continue
-                    
-                    # Obtenir les 2 autres planètes
-                    others = [objs[k] for k in range(4) if k != i and k != j]
-                    if len(others) != 2:
-                        continue
-                    
-                    p3_id, obj3 = others[0]
-                    p4_id, obj4 = others[1]
-                    
-                    # Vérifier les 2 configurations possibles de cradle
-                    # Config 1: obj3 trine obj1, sextile obj2; obj4 sextile obj1, trine obj2
-                    asp31 = self._get_aspect_with_node_override(obj3, obj1, [const.TRINE])
-                    asp32 = self._get_aspect_with_node_override(obj3, obj2, [const.SEXTILE])
-                    asp41 = self._get_aspect_with_node_override(obj4, obj1, [const.SEXTILE])
-                    asp42 = self._get_aspect_with_node_override(obj4, obj2, [const.TRINE])
-                    
-                    if (asp31 and asp31.exists() and asp31.orb <= max_orb and
-                        asp32 and asp32.exists() and asp32.orb <= max_orb and
-                        asp41 and asp41.exists() and asp41.orb <= max_orb and
-                        asp42 and asp42.exists() and asp42.orb <= max_orb):
-                        
-                        cradles.append({
-                            "type": "Berceau",
-                            "planets": [
-                                {"name": self.planet_names.get(p1_id, str(p1_id)), "position": f"{obj1.signlon:.1f}° {obj1.sign}"},
-                                {"name": self.planet_names.get(p2_id, str(p2_id)), "position": f"{obj2.signlon:.1f}° {obj2.sign}"},
-                                {"name": self.planet_names.get(p3_id, str(p3_id)), "position": f"{obj3.signlon:.1f}° {obj3.sign}"},
-                                {"name": self.planet_names.get(p4_id, str(p4_id)), "position": f"{obj4.signlon:.1f}° {obj4.sign}"}
-                            ],
-                            "aspects": [
-                                f"Opposition: {self.planet_names.get(p1_id, str(p1_id))} - {self.planet_names.get(p2_id, str(p2_id))} (orb: {opp_asp.orb:.1f}°)",
-                                f"Trine: {self.planet_names.get(p3_id, str(p3_id))} - {self.planet_names.get(p1_id, str(p1_id))} (orb: {asp31.orb:.1f}°)",
-                                f"Sextile: {self.planet_names.get(p3_id, str(p3_id))} - {self.planet_names.get(p2_id, str(p2_id))} (orb: {asp32.orb:.1f}°)",
-                                f"Sextile: {self.planet_names.get(p4_id, str(p4_id))} - {self.planet_names.get(p1_id, str(p1_id))} (orb: {asp41.orb:.1f}°)",
-                                f"Trine: {self.planet_names.get(p4_id, str(p4_id))} - {self.planet_names.get(p2_id, str(p2_id))} (orb: {asp42.orb:.1f}°)"
-                            ]
-                        })
-                        continue
-                    
-                    # Config 2: obj3 sextile obj1, trine obj2; obj4 trine obj1, sextile obj2
-                    asp31_b = self._get_aspect_with_node_override(obj3, obj1, [const.SEXTILE])
-                    asp32_b = self._get_aspect_with_node_override(obj3, obj2, [const.TRINE])
-                    asp41_b = self._get_aspect_with_node_override(obj4, obj1, [const.TRINE])
-                    asp42_b = self._get_aspect_with_node_override(obj4, obj2, [const.SEXTILE])
-                    
-                    if (asp31_b and asp31_b.exists() and asp31_b.orb <= max_orb and
-                        asp32_b and asp32_b.exists() and asp32_b.orb <= max_orb and
-                        asp41_b and asp41_b.exists() and asp41_b.orb <= max_orb and
-                        asp42_b and asp42_b.exists() and asp42_b.orb <= max_orb):
-                        
-                        cradles.append({
-                            "type": "Berceau",
-                            "planets": [
-                                {"name": self.planet_names.get(p1_id, str(p1_id)), "position": f"{obj1.signlon:.1f}° {obj1.sign}"},
-                                {"name": self.planet_names.get(p2_id, str(p2_id)), "position": f"{obj2.signlon:.1f}° {obj2.sign}"},
-                                {"name": self.planet_names.get(p3_id, str(p3_id)), "position": f"{obj3.signlon:.1f}° {obj3.sign}"},
-                                {"name": self.planet_names.get(p4_id, str(p4_id)), "position": f"{obj4.signlon:.1f}° {obj4.sign}"}
-                            ],
-                            "aspects": [
-                                f"Opposition: {self.planet_names.get(p1_id, str(p1_id))} - {self.planet_names.get(p2_id, str(p2_id))} (orb: {opp_asp.orb:.1f}°)",
-                                f"Sextile: {self.planet_names.get(p3_id, str(p3_id))} - {self.planet_names.get(p1_id, str(p1_id))} (orb: {asp31_b.orb:.1f}°)",
-                                f"Trine: {self.planet_names.get(p3_id, str(p3_id))} - {self.planet_names.get(p2_id, str(p2_id))} (orb: {asp32_b.orb:.1f}°)",
-                                f"Trine: {self.planet_names.get(p4_id, str(p4_id))} - {self.planet_names.get(p1_id, str(p1_id))} (orb: {asp41_b.orb:.1f}°)",
-                                f"Sextile: {self.planet_names.get(p4_id, str(p4_id))} - {self.planet_names.get(p2_id, str(p2_id))} (orb: {asp42_b.orb:.1f}°)"
-                            ]
-                        })
+            cradles.append({
+                "type": "Berceau",
+                "planets": [
+                    {"name": names[p1], "position": places[p1]},
+                    {"name": names[p2], "position": places[p2]},
+                    {"name": names[p3], "position": places[p3]},
+                    {"name": names[p4], "position": places[p4]}
+                ],
+                "aspects": aspects,
+                # Orbe moyen et importance calculés dès la détection (utilisés par _filter_cradles)
+                "avg_orb": _average_orb(aspects),
+                "importance": (importance[p1] + importance[p2] + importance[p3] + importance[p4]) / 4
+            })
         
         return cradles
 
     def _find_planet_id(self, flatlib_id):
         """Trouve l'ID dans notre mapping à partir de l'ID flatlib"""
-        for our_id, flatlib_const in self.planet_names.items():
-            if flatlib_const == flatlib_id:
-                return our_id
-        return flatlib_id
+        return self._name_to_id.get(flatlib_id, flatlib_id)
 
-    def _detect_grand_square(self, chart, max_orb=8):
+    def _detect_grand_square(self, chart, max_orb=8, positions=None):
         """Détecte les Grand Squares (4 planètes formant un carré)"""
         grand_squares = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
-        
-        for p1_id, p2_id, p3_id, p4_id in itertools.combinations(objects, 4):
-            obj1 = self._get_chart_object(chart, p1_id)
-            obj2 = self._get_chart_object(chart, p2_id)
-            obj3 = self._get_chart_object(chart, p3_id)
-            obj4 = self._get_chart_object(chart, p4_id)
-
-            if not (obj1 and obj2 and obj3 and obj4):
-                continue
-
-            # Un Grand Square nécessite 4 planètes formant un carré géométrique
-            # avec 2 oppositions et 2 carrés, disposées à 90° les unes des autres
-            
-            # Obtenir les positions des planètes
-            pos1 = obj1.lon
-            pos2 = obj2.lon
-            pos3 = obj3.lon
-            pos4 = obj4.lon
-            
-            # Vérifier que les planètes forment un carré géométrique
-            # Pour cela, on doit avoir exactement 2 oppositions et 2 carrés
-            aspects = []
-            
-            # Calculer tous les aspects entre les 4 planètes
-            asp12 = getAspect(obj1, obj2, [const.OPPOSITION, const.SQUARE])
-            asp13 = getAspect(obj1, obj3, [const.OPPOSITION, const.SQUARE])
-            asp14 = getAspect(obj1, obj4, [const.OPPOSITION, const.SQUARE])
-            asp23 = getAspect(obj2, obj3, [const.OPPOSITION, const.SQUARE])
-            asp24 = getAspect(obj2, obj4, [const.OPPOSITION, const.SQUARE])
-            asp34 = getAspect(obj3, obj4, [const.OPPOSITION, const.SQUARE])
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        names = positions["names"]
+        places = positions["positions"]
+        
+        # Orbes de getAspect seul (sans l'override), lues dans la matrice du thème
+        flatlib_orb_matrix = positions["flatlib_orb_matrix"]
+        opposition = flatlib_orb_matrix[:, :, _ASPECT_INDEX[const.OPPOSITION]]
+        square = flatlib_orb_matrix[:, :, _ASPECT_INDEX[const.SQUARE]]
+        
+        # Chaque planète d'un Grand Square appartient à l'une des 2 oppositions: seules les
+        # planètes ayant au moins une opposition dans l'orbe peuvent former un candidat
+        candidates = np.flatnonzero((opposition <= max_orb).any(axis=1))
+        if len(candidates) < 4:
+            return grand_squares
+        
+        # Les 6 paires de chaque combinaison de 4 candidats, classées en une seule passe NumPy.
+        # getAspect(a, b, [OPPOSITION, SQUARE]) retient l'opposition si elle existe, sinon le carré
+        quads = candidates[_combination_indices(len(candidates), 4)]
+        first = quads[:, [a for a, _ in _QUAD_PAIRS]]
+        second = quads[:, [b for _, b in _QUAD_PAIRS]]
+        pair_opposition = opposition[first, second]
+        pair_square = square[first, second]
+        is_opposition = pair_opposition <= max_orb
+        is_square = (pair_square <= max_orb) & np.isinf(pair_opposition)
+        
+        # Un Grand Square nécessite exactement 2 oppositions et 2 carrés, et les 2 oppositions
+        # doivent être perpendiculaires (paires disjointes: 12/34, 13/24 ou 14/23)
+        disjoint_oppositions = (is_opposition[:, _QUAD_DISJOINT_FIRST] &
+                                is_opposition[:, _QUAD_DISJOINT_SECOND]).any(axis=1)
+        matches = ((is_opposition.sum(axis=1) == 2) & (is_square.sum(axis=1) == 2) &
+                   disjoint_oppositions)
+        
+        matched = np.flatnonzero(matches)
+        if not len(matched):
+            return grand_squares
+        
+        # Type (index dans pair_types, -1 si aucun) et orbe de chaque paire des quads retenus
+        pair_types = (const.OPPOSITION, const.SQUARE)
+        pair_kinds = np.where(is_opposition[matched], 0, np.where(is_square[matched], 1, -1)).tolist()
+        pair_orbs = np.where(is_opposition[matched], pair_opposition[matched],
+                             pair_square[matched]).tolist()
+        
+        for quad, kinds, orbs in zip(quads[matched].tolist(), pair_kinds, pair_orbs):
+            # Aspects retenus, dans l'ordre des paires 12, 13, 14, 23, 24, 34
+            aspects = [AspectRecord(quad[a], quad[b], pair_types[kind], orb)
+                       for (a, b), kind, orb in zip(_QUAD_PAIRS, kinds, orbs) if kind >= 0]
             
-            # Compter les oppositions et carrés valides
-            oppositions = 0
-            squares = 0
-            
-            if asp12 and asp12.exists() and asp12.orb <= max_orb:
-                if asp12.type == const.OPPOSITION:
-                    oppositions += 1
-                elif asp12.type == const.SQUARE:
-                    squares += 1
-                aspects.append((obj1, obj2, asp12))
-                    
-            if asp13 and asp13.exists() and asp13.orb <= max_orb:
-                if asp13.type == const.OPPOSITION:
-                    oppositions += 1
-                elif asp13.type == const.SQUARE:
-                    squares += 1
-                aspects.append((obj1, obj3, asp13))
-                    
-            if asp14 and asp14.exists() and asp14.orb <= max_orb:
-                if asp14.type == const.OPPOSITION:
-                    oppositions += 1
-                elif asp14.type == const.SQUARE:
-                    squares += 1
-                aspects.append((obj1, obj4, asp14))
-                    
-            if asp23 and asp23.exists() and asp23.orb <= max_orb:
-                if asp23.type == const.OPPOSITION:
-                    oppositions += 1
-                elif asp23.type == const.SQUARE:
-                    squares += 1
-                aspects.append((obj2, obj3, asp23))
-                    
-            if asp24 and asp24.exists() and asp24.orb <= max_orb:
-                if asp24.type == const.OPPOSITION:
-                    oppositions += 1
-                elif asp24.type == const.SQUARE:
-                    squares += 1
-                aspects.append((obj2, obj4, asp24))
-                    
-            if asp34 and asp34.exists() and asp34.orb <= max_orb:
-                if asp34.type == const.OPPOSITION:
-                    oppositions += 1
-                elif asp34.type == const.SQUARE:
-                    squares += 1
-                aspects.append((obj3, obj4, asp34))
-
-            # Un Grand Square nécessite exactement 2 oppositions et 2 carrés
-            # ET une disposition géométrique spécifique (4 planètes à 90° les unes des autres)
-            # Pour vérifier cela, on s'assure que les oppositions ne partagent pas les mêmes planètes
-            # et que les carrés connectent les bonnes paires
-            if oppositions == 2 and squares == 2:
-                # Vérifier la géométrie : dans un vrai Grand Square, 
-                # les 2 oppositions doivent être perpendiculaires (non connectées)
-                # et les 2 carrés doivent relier les bonnes paires
-                
-                # Extraire les paires en opposition et en carré
-                opposition_pairs = []
-                square_pairs = []
-                
-                for obj1, obj2, asp in aspects:
-                    if asp.type == const.OPPOSITION:
-                        opposition_pairs.append((obj1.id, obj2.id))
-                    elif asp.type == const.SQUARE:
-                        square_pairs.append((obj1.id, obj2.id))
-                
-                # Dans un vrai Grand Square, les oppositions ne doivent pas partager de planètes
-                # et les carrés doivent connecter les bonnes paires
-                if len(opposition_pairs) == 2 and len(square_pairs) == 2:
-                    # Vérifier que les oppositions sont perpendiculaires (pas de planète commune)
-                    opp1_planets = set(opposition_pairs[0])
-                    opp2_planets = set(opposition_pairs[1])
-                    
-                    if len(opp1_planets.intersection(opp2_planets)) == 0:
-                        # Les oppositions sont perpendiculaires, c'est un vrai Grand Square
-                        grand_squares.append({
-                            "type": "Grand Square",
-                            "planets": [
-                                {"name": self.planet_names.get(p1_id, p1_id), "position": f"{obj1.signlon:.1f}° {obj1.sign}"},
-                                {"name": self.planet_names.get(p2_id, p2_id), "position": f"{obj2.signlon:.1f}° {obj2.sign}"},
-                                {"name": self.planet_names.get(p3_id, p3_id), "position": f"{obj3.signlon:.1f}° {obj3.sign}"},
-                                {"name": self.planet_names.get(p4_id, p4_id), "position": f"{obj4.signlon:.1f}° {obj4.sign}"}
-                            ],
-                            "aspects": [f"{self.planet_names.get(obj1.id, obj1.id)} {self.aspect_names.get(asp.type, 'Unknown')} {self.planet_names.get(obj2.id, obj2.id)} (orb: {asp.orb:.1f}°)" for obj1, obj2, asp in aspects]
-                        })
+            grand_squares.append({
+                "type": "Grand Square",
+                "planets": [{"name": names[p], "position": places[p]} for p in quad],
+                "aspects": aspects
+            })
         
         return grand_squares
 
-    def _detect_stelliums(self, chart, conjunction_orb=8):
+    def _detect_stelliums(self, chart, conjunction_orb=8, positions=None):
         """Détecte les stelliums en groupant les planètes connectées par CONJONCTIONS.
         
         Un stellium est un groupe de 3+ planètes où chaque planète est en conjonction 
@@ -704,150 +850,97 @@ class AspectsPatternsGenerator:
         # Toutes les planètes et points à considérer
         all_planet_ids = personal_planets + social_planets + important_points
         
-        # Obtenir toutes les planètes avec leurs positions
-        planets_data = []
-        for obj_id in all_planet_ids:
-            obj = self._get_chart_object(chart, obj_id)
-            if obj:
-                planets_data.append({
-                    "id": obj_id,
-                    "obj": obj,
-                    "name": self.planet_names.get(obj_id, obj_id),
-                    "position": f"{obj.signlon:.1f}°",
-                    "sign": obj.sign,
-                    "lon": obj.lon,
-                    "is_personal": obj_id in personal_planets,
-                    "is_important_point": obj_id in important_points
-                })
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        ids = positions["ids"]
+        index_of = {obj_id: i for i, obj_id in enumerate(ids)}
         
-        # Étape 1: Trouver toutes les conjonctions entre planètes
-        def angular_distance(lon1, lon2):
-            """Calcule la distance angulaire entre deux longitudes (0-180°)"""
-            diff = abs(lon1 - lon2)
-            if diff > 180:
-                diff = 360 - diff
-            return diff
-        
-        # Créer un dictionnaire des connexions (qui est en conjonction avec qui)
-        connections = {}
-        for i, planet1 in enumerate(planets_data):
-            connections[planet1["name"]] = []
-            for j, planet2 in enumerate(planets_data):
-                if i != j:
-                    distance = angular_distance(planet1["lon"], planet2["lon"])
-                    if distance <= conjunction_orb:
-                        connections[planet1["name"]].append(planet2["name"])
+        # Planètes présentes (index dans les tableaux de positions), dans l'ordre ci-dessus, et
+        # leurs propriétés en tableaux parallèles
+        members = [index_of[obj_id] for obj_id in all_planet_ids if positions["objects"][index_of[obj_id]]]
+        is_personal = [ids[i] in personal_planets for i in members]
+        is_important_point = [ids[i] in important_points for i in members]
+        lons = positions["lons"].tolist()
+        signlons = positions["signlons"].tolist()
+        names = positions["names"]
         
-        # Étape 2: Trouver les composantes connexes (groupes de planètes connectées par conjonctions)
-        def find_connected_component(start_planet, visited, connections):
-            """Trouve toutes les planètes connectées à start_planet via des conjonctions"""
-            component = []
-            stack = [start_planet]
-            
-            while stack:
-                current = stack.pop()
-                if current in visited:
-                    continue
-                    
-                visited.add(current)
-                component.append(current)
-                
-                # Ajouter toutes les planètes en conjonction avec la planète courante
-                for neighbor in connections.get(current, []):
-                    if neighbor not in visited:
-                        stack.append(neighbor)
-            
-            return component
-        
-        # Trouver tous les groupes connexes
-        visited = set()
-        connected_components = []
+        # Étape 1: Trouver toutes les conjonctions entre planètes, seuillage de la
+        # matrice des distances angulaires calculée une fois pour le thème
+        in_conjunction = positions["distances"][members][:, members] <= conjunction_orb
         
-        for planet_data in planets_data:
-            planet_name = planet_data["name"]
-            if planet_name not in visited:
-                component = find_connected_component(planet_name, visited, connections)
-                if len(component) >= 3:  # Un stellium nécessite au moins 3 planètes
-                    connected_components.append(component)
+        # Étape 2: Trouver les composantes connexes (groupes de planètes connectées par conjonctions)
+        n_components, labels = _connected_components(in_conjunction)
         
         # Étape 3: Valider et formater les stelliums
-        for component in connected_components:
-            # Vérifier qu'au moins une planète personnelle OU un point important est dans le stellium
-            has_personal = False
-            has_important_point = False
-            component_planets_data = []
-            
-            for planet_name in component:
-                # Trouver les données de cette planète
-                for planet_data in planets_data:
-                    if planet_data["name"] == planet_name:
-                        component_planets_data.append(planet_data)
-                        if planet_data["is_personal"]:
-                            has_personal = True
-                        if planet_data["is_important_point"]:
-                            has_important_point = True
-                        break
+        for k in range(n_components):
+            in_component = [m for m, label in enumerate(labels) if label == k]
+            count = len(in_component)
+            if count < 3:  # Un stellium nécessite au moins 3 planètes
+                continue
             
             # Un stellium valide doit contenir au moins une planète personnelle OU un point important
-            if (has_personal or has_important_point) and len(component_planets_data) >= 3:
+            personal_count = sum(is_personal[m] for m in in_component)
+            important_points_count = sum(is_important_point[m] for m in in_component)
+            if personal_count or important_points_count:
                 # Trier les planètes par longitude pour un ordre cohérent
-                component_planets_data.sort(key=lambda p: p["lon"])
+                component = sorted((members[m] for m in in_component), key=lons.__getitem__)
                 
                 stellium = {
                     "type": "Stellium",
-                    "sign": component_planets_data[0]["sign"],  # Signe de la première planète
-                    "planets": [{"name": p["name"], "position": p["position"]} for p in component_planets_data],
-                    "count": len(component_planets_data),
-                    "personal_count": sum(1 for p in component_planets_data if p["is_personal"]),
-                    "important_points_count": sum(1 for p in component_planets_data if p["is_important_point"])
+                    "sign": positions["signs"][component[0]],  # Signe de la première planète
+                    "planets": [{"name": names[i], "position": f"{signlons[i]:.1f}°"}
+                                for i in component],
+                    "count": count,
+                    "personal_count": personal_count,
+                    "important_points_count": important_points_count
                 }
                 stelliums.append(stellium)
         
         return stelliums
 
-    def _detect_multiple_aspects(self, chart, max_orb=8):
+    def _detect_multiple_aspects(self, chart, max_orb=8, positions=None):
         """Détecte les patterns d'aspects multiples (plusieurs planètes en aspect avec une même planète)"""
         multiple_aspects = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
+        # Objets du thème lus une seule fois (les absents sont ignorés)
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        names = positions["names"]
+        places = positions["positions"]
+        indices = positions["indices"]
+        aspect_names = self.aspect_names
         
-        for target_id in objects:
-            target_obj = self._get_chart_object(chart, target_id)
-            if not target_obj:
-                continue
-            
+        # Seules les paires ayant un aspect majeur dans max_orb sont soumises à flatlib (avec
+        # une marge pour les écarts d'arrondi entre NumPy et flatlib)
+        major = [_ASPECT_INDEX[aspect_type] for aspect_type in const.MAJOR_ASPECTS]
+        candidates = (positions["orbs"][:, :, major] <= max_orb + 1e-9).any(axis=2).tolist()
+        
+        for target in indices:
             aspecting_planets = []
-            for other_id in objects:
-                if target_id == other_id:
+            for other in indices:
+                if target == other or not candidates[target][other]:
                     continue
                 
-                other_obj = self._get_chart_object(chart, other_id)
-                if not other_obj:
-                    continue
-                
-                aspect = getAspect(target_obj, other_obj, const.MAJOR_ASPECTS)
-                if aspect and aspect.exists() and aspect.orb <= max_orb:
+                aspect = self._major_aspect(positions, target, other)
+                # L'orbe d'un NO_ASPECT de flatlib vaut 0: le test de type reste nécessaire
+                if aspect.type != const.NO_ASPECT and aspect.orb <= max_orb:
                     aspecting_planets.append({
-                        "planet": self.planet_names.get(other_id, other_id),
-                        "aspect": self.aspect_names.get(aspect.type, "Unknown"),
+                        "planet": names[other],
+                        "aspect": aspect_names.get(aspect.type, "Unknown"),
                         "orb": round(aspect.orb, 1),
-                        "position": f"{other_obj.signlon:.1f}° {other_obj.sign}"
+                        "position": places[other]
                     })
             
             if len(aspecting_planets) >= 2:  # Au moins deux planètes aspectent la cible
                 multiple_aspects.append({
                     "type": "Multiple Aspect",
-                    "target_planet": self.planet_names.get(target_id, target_id),
-                    "target_position": f"{target_obj.signlon:.1f}° {target_obj.sign}",
+                    "target_planet": names[target],
+                    "target_position": places[target],
                     "aspecting_planets": aspecting_planets
                 })
         return multiple_aspects
 
-    def _detect_multiple_planet_square(self, chart, max_orb=8, cluster_orb=15):
+    def _detect_multiple_planet_square(self, chart, max_orb=8, cluster_orb=15, positions=None):
         """Détecte les Multiple Planet Square: deux groupes de planètes proches formant un carré entre eux
         
         Un Multiple Planet Square valide nécessite:
@@ -857,64 +950,30 @@ class AspectsPatternsGenerator:
         """
         multiple_planet_squares = []
         
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE, const.ASC, const.MC
-        ]
-        
-        def angular_distance(lon1, lon2):
-            """Calcule la distance angulaire entre deux longitudes (0-180°)"""
-            diff = abs(lon1 - lon2)
-            if diff > 180:
-                diff = 360 - diff
-            return diff
-        
-        # Étape 1: Identifier tous les groupes de planètes proches (2+ planètes)
-        cluster_groups = []
-        
-        for size in range(6, 1, -1):  # De 6 à 2 planètes
-            for combo in itertools.combinations(objects, size):
-                objs = []
-                for planet_id in combo:
-                    obj = self._get_chart_object(chart, planet_id)
-                    if obj:
-                        objs.append((planet_id, obj))
-                
-                if len(objs) < 2:
-                    continue
-                
-                # Vérifier si toutes les planètes sont proches les unes des autres (cluster)
-                all_in_cluster = True
-                for i in range(len(objs)):
-                    for j in range(i+1, len(objs)):
-                        p1_id, obj1 = objs[i]
-                        p2_id, obj2 = objs[j]
-                        
-                        # Vérifier la distance angulaire
-                        distance = angular_distance(obj1.lon, obj2.lon)
-                        if distance > cluster_orb:
-                            all_in_cluster = False
-                            break
-                    
-                    if not all_in_cluster:
-                        break
-                
-                if all_in_cluster:
-                    # Vérifier que ce groupe n'est pas déjà inclus dans un groupe plus grand
-                    is_subset = False
-                    for existing_group in cluster_groups:
-                        existing_ids = set([p[0] for p in existing_group])
-                        current_ids = set([p[0] for p in objs])
-                        if current_ids.issubset(existing_ids):
-                            is_subset = True
-                            break
-                    
-                    if not is_subset:
-                        # Retirer les groupes qui sont des sous-ensembles de celui-ci
-                        cluster_groups = [g for g in cluster_groups 
-                                         if not set([p[0] for p in g]).issubset(set([p[0] for p in objs]))]
-                        cluster_groups.append(objs)
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        square = self._aspect_orbs(positions, const.SQUARE)
+        names = positions["names"]
+        places = positions["positions"]
+        
+        # Étape 1: Identifier tous les groupes de planètes proches (2 à 6 planètes deux à deux à
+        # moins de cluster_orb): ce sont les cliques du graphe des paires proches. Les groupes
+        # retenus sont les cliques maximales de 6 planètes au plus, et les sous-groupes de 6
+        # des cliques plus grandes; aucun n'est inclus dans un autre
+        close = positions["distances"] <= cluster_orb
+        present = sum(1 << i for i in positions["indices"])
+        groups = set()
+        for clique in _maximal_cliques(close, present):
+            members = tuple(_bits(clique))
+            if len(members) > 6:
+                groups.update(itertools.combinations(members, 6))
+            elif len(members) >= 2:
+                groups.add(members)
+        
+        # Du plus grand au plus petit groupe, puis dans l'ordre des objets; chaque groupe est
+        # aussi codé en masque de bits (1 bit par index d'objet)
+        cluster_groups = sorted(groups, key=lambda group: (-len(group), group))
+        group_masks = [sum(1 << p for p in group) for group in cluster_groups]
         
         # Étape 2: Trouver les paires de groupes qui sont en carré
         for i in range(len(cluster_groups)):
@@ -923,135 +982,116 @@ class AspectsPatternsGenerator:
                 group_b = cluster_groups[j]
                 
                 # Compter le nombre de carrés entre les deux groupes
-                square_count = 0
-                square_aspects = []
-                
-                for p1_id, obj1 in group_a:
-                    for p2_id, obj2 in group_b:
-                        asp = self._get_aspect_with_node_override(obj1, obj2, [const.SQUARE])
-                        if asp and asp.exists() and asp.orb <= max_orb:
-                            square_count += 1
-                            square_aspects.append({
-                                "p1": self.planet_names.get(p1_id, str(p1_id)),
-                                "p2": self.planet_names.get(p2_id, str(p2_id)),
-                                "orb": asp.orb
-                            })
+                square_aspects = [AspectRecord(p1, p2, const.SQUARE, square[p1][p2])
+                                  for p1 in group_a for p2 in group_b
+                                  if square[p1][p2] <= max_orb]
+                square_count = len(square_aspects)
                 
                 # Si au moins 2 carrés entre les groupes (configuration significative)
                 if square_count >= 2:
-                    all_planets = group_a + group_b
-                    planet_list = []
-                    for p_id, obj in all_planets:
-                        planet_list.append({
-                            "name": self.planet_names.get(p_id, str(p_id)),
-                            "position": f"{obj.signlon:.1f}° {obj.sign}"
-                        })
-                    
-                    aspects_list = []
-                    for sa in square_aspects:
-                        aspects_list.append(f"{sa['p1']} Square {sa['p2']} (orb: {sa['orb']:.1f}°)")
-                    
-                    multiple_planet_squares.append({
+                    # Planètes des deux groupes en masques (une planète peut appartenir aux deux)
+                    key = (group_masks[i] | group_masks[j], group_masks[i] & group_masks[j])
+                    multiple_planet_squares.append((key, {
                         "type": "Multiple Planet Square",
-                        "planets": planet_list,
+                        "planets": [{"name": names[p], "position": places[p]} for p in group_a + group_b],
                         "square_count": square_count,
-                        "aspects": aspects_list,
+                        "aspects": square_aspects,
                         "group_a_size": len(group_a),
                         "group_b_size": len(group_b)
-                    })
+                    }))
         
         # Trier par nombre de carrés et taille des groupes (les plus complexes d'abord)
-        multiple_planet_squares.sort(key=lambda x: (x.get("square_count", 0), 
-                                                     x.get("group_a_size", 0) + x.get("group_b_size", 0)), 
+        multiple_planet_squares.sort(key=lambda x: (x[1].get("square_count", 0), 
+                                                     x[1].get("group_a_size", 0) + x[1].get("group_b_size", 0)), 
                                      reverse=True)
         
-        # Filtrer les doublons
+        # Filtrer les doublons (mêmes planètes, comptées avec leur multiplicité)
         unique_squares = []
         seen = set()
-        for mps in multiple_planet_squares:
-            planets = tuple(sorted([p["name"] for p in mps["planets"]]))
-            if planets not in seen:
-                seen.add(planets)
+        for key, mps in multiple_planet_squares:
+            if key not in seen:
+                seen.add(key)
                 unique_squares.append(mps)
         
         return unique_squares[:1]  # Garder uniquement le plus complexe
 
-    def _detect_yod(self, chart, max_orb=8):
+    def _detect_yod(self, chart, max_orb=8, positions=None):
         """Détecte les Yods (2 sextiles + 2 quinconces) - AVEC OVERRIDE pour bugs flatlib
         
         Note: Les Yods utilisent uniquement les PLANÈTES, pas les angles (Ascendant/MC)
         """
         yods = []
         
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        names = positions["names"]
+        importance = self._IMPORTANCE_BY_IDX
+        places = positions["positions"]
+        
         # Yods: planètes uniquement (pas d'angles)
-        objects = [
-            const.SUN, const.MOON, const.MERCURY, const.VENUS, const.MARS,
-            const.JUPITER, const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO,
-            const.NORTH_NODE
-        ]
+        planets = [i for i in positions["indices"] if positions["ids"][i] not in (const.ASC, const.MC)]
         
-        for p1_id, p2_id, p3_id in itertools.permutations(objects, 3):
-            obj1 = self._get_chart_object(chart, p1_id)
-            obj2 = self._get_chart_object(chart, p2_id)
-            obj3 = self._get_chart_object(chart, p3_id)
-            
-            if not (obj1 and obj2 and obj3):
+        # Orbes lues dans la matrice du thème (mêmes règles que l'override flatlib)
+        sextile = self._aspect_orbs(positions, const.SEXTILE)
+        quincunx = self._aspect_orbs(positions, const.QUINCUNX)
+        
+        # Listes d'adjacence: pour chaque p1, seules ses planètes en sextile (p2) et en
+        # quinconce (apex p3) sont parcourues, dans l'ordre de itertools.permutations.
+        # Chaque trio n'est émis qu'une fois, dans sa première orientation valide (le sextile
+        # p1-p2 est symétrique, (p2, p1, p3) serait un doublon)
+        seen = set()
+        for p1 in planets:
+            sextiles = [p for p in planets if p != p1 and sextile[p1][p] <= max_orb]
+            if not sextiles:
                 continue
+            apexes = [p for p in planets if p != p1 and quincunx[p1][p] <= max_orb]
             
-            # Vérifier les aspects AVEC OVERRIDE pour contourner bugs flatlib
-            asp12 = self._get_aspect_with_node_override(obj1, obj2, [const.SEXTILE])
-            asp13 = self._get_aspect_with_node_override(obj1, obj3, [const.QUINCUNX])
-            asp23 = self._get_aspect_with_node_override(obj2, obj3, [const.QUINCUNX])
-            
-            if (asp12 and asp12.exists() and asp12.orb <= max_orb and
-                asp13 and asp13.exists() and asp13.orb <= max_orb and
-                asp23 and asp23.exists() and asp23.orb <= max_orb):
+            for p2, p3 in itertools.product(sextiles, apexes):
+                if p3 == p2 or quincunx[p2][p3] > max_orb:
+                    continue
+                key = frozenset((p1, p2, p3))
+                if key in seen:
+                    continue
+                seen.add(key)
+                aspects = [
+                    AspectRecord(p1, p2, const.SEXTILE, sextile[p1][p2]),
+                    AspectRecord(p1, p3, const.QUINCUNX, quincunx[p1][p3]),
+                    AspectRecord(p2, p3, const.QUINCUNX, quincunx[p2][p3])
+                ]
                 
                 yods.append({
                     "type": "Yod",
                     "planets": [
-                        {"name": self.planet_names.get(p1_id, p1_id), "position": f"{obj1.signlon:.1f}° {obj1.sign}"},
-                        {"name": self.planet_names.get(p2_id, p2_id), "position": f"{obj2.signlon:.1f}° {obj2.sign}"},
-                        {"name": self.planet_names.get(p3_id, p3_id), "position": f"{obj3.signlon:.1f}° {obj3.sign}"}
+                        {"name": names[p1], "position": places[p1]},
+                        {"name": names[p2], "position": places[p2]},
+                        {"name": names[p3], "position": places[p3]}
                     ],
-                    "aspects": [
-                        f"{self.planet_names.get(p1_id, p1_id)} {self.aspect_names.get(asp12.type, 'Unknown')} {self.planet_names.get(p2_id, p2_id)} (orb: {asp12.orb:.1f}°)",
-                        f"{self.planet_names.get(p1_id, p1_id)} {self.aspect_names.get(asp13.type, 'Unknown')} {self.planet_names.get(p3_id, p3_id)} (orb: {asp13.orb:.1f}°)",
-                        f"{self.planet_names.get(p2_id, p2_id)} {self.aspect_names.get(asp23.type, 'Unknown')} {self.planet_names.get(p3_id, p3_id)} (orb: {asp23.orb:.1f}°)"
-                    ]
+                    "aspects": aspects,
+                    # Orbe moyen et importance calculés dès la détection (utilisés par _filter_yods)
+                    "avg_orb": _average_orb(aspects),
+                    "importance": (importance[p1] + importance[p2] + importance[p3]) / 3
                 })
         
         return yods
 
     def _calculate_planetary_importance_score(self, planet_names):
         """Calcule un score d'importance basé sur la hiérarchie astrologique"""
-        importance_values = {
-            # Angles (priorité maximale)
-            "Ascendant": 10,
-            "MC": 10,
-            # Luminaires (très haute priorité)
-            "Sun": 8,
-            "Moon": 8,
-            # Planètes personnelles (priorité moyenne)
-            "Mercury": 5,
-            "Venus": 5,
-            "Mars": 5,
-            # Planètes sociales (priorité basse)
-            "Jupiter": 3,
-            "Saturn": 3,
-            # Planètes transpersonnelles (Neptune prioritaire pour Yods)
-            "Neptune": 2.2,  # Légèrement prioritaire (spiritualité)
-            "Pluto": 2.1,    # Transformation
-            "Uranus": 2.0,   # Changement soudain
-            # Nœuds
-            "North Node": 1,
-            "South Node": 1
-        }
-        
-        total_importance = sum(importance_values.get(name, 0) for name in planet_names)
+        total_importance = sum(_PLANETARY_IMPORTANCE.get(name, 0) for name in planet_names)
         avg_importance = total_importance / len(planet_names) if planet_names else 0
         return avg_importance
     
+    def _score_patterns(self, patterns):
+        """Ajoute "composite_score" à chaque Yod/Cradle
+        
+        Score composite : importance élevée - pénalité d'orbe réduite (avg_orb et importance
+        calculés à la détection; l'importance est recalculée depuis les noms si absente)
+        """
+        importance_of = self._calculate_planetary_importance_score
+        for pattern in patterns:
+            if "importance" not in pattern:
+                pattern["importance"] = importance_of([p["name"] for p in pattern["planets"]])
+            pattern["composite_score"] = pattern["importance"] - pattern["avg_orb"] * 0.15
+    
     def _filter_yods(self, yods):
         """Filtre les Yods pour maximiser le nombre de Yods sans chevauchement
         
@@ -1061,91 +1101,55 @@ class AspectsPatternsGenerator:
         if not yods:
             return []
         
-        # Calculer les scores pour tous les Yods
-        for yod in yods:
-            planets = [p["name"] for p in yod["planets"]]
-            
-            # Calculer l'orbe moyen
-            orb_sum = 0
-            orb_count = 0
-            for aspect_str in yod.get("aspects", []):
-                if "orb:" in aspect_str:
-                    orb_val = float(aspect_str.split("orb:")[1].strip().replace("°)", ""))
-                    orb_sum += orb_val
-                    orb_count += 1
-            yod["avg_orb"] = orb_sum / orb_count if orb_count > 0 else 999
-            
-            # Calculer l'importance astrologique
-            yod["importance"] = self._calculate_planetary_importance_score(planets)
-            
-            # Score composite : importance élevée - pénalité d'orbe réduite
-            yod["composite_score"] = yod["importance"] - (yod["avg_orb"] * 0.15)
-        
-        # Étape 1: Éliminer les doublons exacts (mêmes 3 planètes, ordre différent)
-        seen_planet_sets = {}
-        unique_yods = []
-        
-        for yod in yods:
-            planets = frozenset([p["name"] for p in yod["planets"]])
-            if planets not in seen_planet_sets:
-                seen_planet_sets[planets] = yod
-                unique_yods.append(yod)
-        
+        # Les doublons (mêmes 3 planètes, ordre différent) sont déjà écartés par _detect_yod.
         # Filtrer pour garder seulement les Yods avec orbes serrés
-        significant_yods = [y for y in unique_yods if y.get("avg_orb", 999) < 6]
+        significant_yods = [y for y in yods if y.get("avg_orb", 999) < 6]
         
         if not significant_yods:
             return []
         
-        # Étape 2: Trouver la combinaison optimale de Yods sans chevauchement
-        # Algorithme: recherche exhaustive pour maximiser le nombre de Yods
-        
-        def get_planet_set(yod):
-            """Retourne l'ensemble des planètes d'un Yod"""
-            return set([p["name"] for p in yod["planets"]])
+        # Calculer les scores des Yods retenus
+        self._score_patterns(significant_yods)
         
-        def yods_overlap(yod1, yod2):
-            """Vérifie si deux Yods partagent au moins une planète"""
-            return len(get_planet_set(yod1) & get_planet_set(yod2)) > 0
+        # Étape 2: Trouver la combinaison optimale de Yods sans chevauchement
+        # Algorithme: séparation et évaluation sur le graphe des conflits (masques de bits)
         
         def find_best_combination(yods_list):
             """Trouve la meilleure combinaison de Yods non-chevauchants
-            Priorité: 1) Maximiser le nombre de Yods, 2) Maximiser le score total"""
-            from itertools import combinations
+            Priorité: 1) Maximiser le nombre de Yods, 2) Maximiser le score total
             
-            best_combo = []
-            best_score = -999999
+            Les ensembles sans chevauchement sont parcourus dans l'ordre de
+            itertools.combinations: à score égal, la première combinaison est gardée."""
+            # Planètes de chaque Yod sous forme de masque de bits: chevauchement <=> masques sécants
+            planet_bits = {}
+            masks = []
+            for yod in yods_list:
+                mask = 0
+                for p in yod["planets"]:
+                    mask |= 1 << planet_bits.setdefault(p["name"], len(planet_bits))
+                masks.append(mask)
+            n = len(yods_list)
             
-            # Tester toutes les combinaisons possibles de taille décroissante
-            for size in range(len(yods_list), 0, -1):
-                found_valid = False
-                
-                for combo in combinations(yods_list, size):
-                    # Vérifier que les Yods ne se chevauchent pas
-                    valid = True
-                    for i in range(len(combo)):
-                        for j in range(i+1, len(combo)):
-                            if yods_overlap(combo[i], combo[j]):
-                                valid = False
-                                break
-                        if not valid:
-                            break
-                    
-                    if valid:
-                        found_valid = True
-                        # Calculer le score total de cette combinaison
-                        total_score = sum(y["composite_score"] for y in combo)
-                        
-                        if total_score > best_score:
-                            best_score = total_score
-                            best_combo = list(combo)
+            best = {"size": 0, "score": -999999, "combo": []}
+            
+            def extend(combo, used, start):
+                size = len(combo)
+                if size > best["size"]:
+                    best.update(size=size, score=sum(yods_list[i]["composite_score"] for i in combo), combo=combo)
+                elif size == best["size"] and size:
+                    total_score = sum(yods_list[i]["composite_score"] for i in combo)
+                    if total_score > best["score"]:
+                        best.update(score=total_score, combo=combo)
                 
-                # Si on a trouvé des combinaisons valides de cette taille, on s'arrête
-                # (on veut maximiser le NOMBRE de Yods)
-                if found_valid:
-                    break
+                # Yods encore compatibles; couper si même tous ne suffisent pas à égaler la meilleure taille
+                candidates = [i for i in range(start, n) if not masks[i] & used]
+                if size + len(candidates) < best["size"]:
+                    return
+                for i in candidates:
+                    extend(combo + [i], used | masks[i], i + 1)
             
-            return best_combo
+            extend([], 0, 0)
+            return [yods_list[i] for i in best["combo"]]
         
         # Trouver la meilleure combinaison
         selected_yods = find_best_combination(significant_yods)
@@ -1155,26 +1159,6 @@ class AspectsPatternsGenerator:
         
         return selected_yods
 
-    def _filter_t_squares(self, t_squares):
-        """Filtre les T-Squares pour éviter les doublons"""
-        if not t_squares:
-            return []
-        
-        # Créer des ensembles de planètes triés pour détecter les doublons
-        unique_patterns = []
-        seen_patterns = set()
-        
-        for t_square in t_squares:
-            planets = [p["name"] for p in t_square["planets"]]
-            # Créer une clé unique basée sur les planètes triées
-            pattern_key = tuple(sorted(planets))
-            
-            if pattern_key not in seen_patterns:
-                seen_patterns.add(pattern_key)
-                unique_patterns.append(t_square)
-        
-        return unique_patterns
-
     def _filter_stelliums(self, stelliums):
         """Filtre les stelliums pour ne garder que les plus significatifs"""
         if not stelliums:
@@ -1194,65 +1178,49 @@ class AspectsPatternsGenerator:
             return []
         
         # Calculer les scores pour tous les Cradles
-        for cradle in cradles:
-            planets = [p["name"] for p in cradle["planets"]]
-            
-            # Calculer l'orbe moyen
-            orb_sum = 0
-            orb_count = 0
-            for aspect_str in cradle.get("aspects", []):
-                if "orb:" in aspect_str:
-                    orb_val = float(aspect_str.split("orb:")[1].strip().replace("°)", ""))
-                    orb_sum += orb_val
-                    orb_count += 1
-            cradle["avg_orb"] = orb_sum / orb_count if orb_count > 0 else 999
-            
-            # Calculer l'importance astrologique
-            cradle["importance"] = self._calculate_planetary_importance_score(planets)
-            
-            # Score composite : importance élevée - pénalité d'orbe réduite
-            cradle["composite_score"] = cradle["importance"] - (cradle["avg_orb"] * 0.15)
+        self._score_patterns(cradles)
         
         # Étape 1: Éliminer les doublons exacts (mêmes 4 planètes, ordre différent)
         seen_planet_sets = {}
         unique_cradles = []
+        planet_masks = []  # Planètes de chaque Cradle unique en masque de bits (1 bit par planète)
+        planet_bits = {}
         
         for cradle in cradles:
             planets = frozenset([p["name"] for p in cradle["planets"]])
             if planets not in seen_planet_sets:
                 seen_planet_sets[planets] = cradle
                 unique_cradles.append(cradle)
+                mask = 0
+                for name in planets:
+                    mask |= 1 << planet_bits.setdefault(name, len(planet_bits))
+                planet_masks.append(mask)
         
         # Étape 2: Comparer les paires de Cradles pour détecter les conflits
         # Deux cradles sont en conflit s'ils partagent EXACTEMENT 3 planètes
-        excluded_cradles = set()
+        # (chaque paire est testée une fois, le conflit est tranché immédiatement)
+        n = len(unique_cradles)
+        excluded = [False] * n
         
-        for i, cradle1 in enumerate(unique_cradles):
-            if id(cradle1) in excluded_cradles:
+        for i in range(n):
+            if excluded[i]:
                 continue
-                
-            planets1 = set([p["name"] for p in cradle1["planets"]])
             
-            for j, cradle2 in enumerate(unique_cradles):
-                if i >= j or id(cradle2) in excluded_cradles:
+            for j in range(i + 1, n):
+                if excluded[j]:
                     continue
                 
-                planets2 = set([p["name"] for p in cradle2["planets"]])
-                
-                # Compter les planètes partagées
-                shared_planets = planets1 & planets2
-                
                 # Si exactement 3 planètes sont partagées, il y a conflit
-                if len(shared_planets) == 3:
+                if (planet_masks[i] & planet_masks[j]).bit_count() == 3:
                     # Garder celui avec le meilleur composite score
-                    if cradle1["composite_score"] >= cradle2["composite_score"]:
-                        excluded_cradles.add(id(cradle2))
+                    if unique_cradles[i]["composite_score"] >= unique_cradles[j]["composite_score"]:
+                        excluded[j] = True
                     else:
-                        excluded_cradles.add(id(cradle1))
-                        break  # cradle1 est exclu, pas besoin de continuer
+                        excluded[i] = True
+                        break  # cradle i est exclu, pas besoin de continuer
         
         # Sélectionner tous les Cradles non exclus
-        selected_cradles = [cradle for cradle in unique_cradles if id(cradle) not in excluded_cradles]
+        selected_cradles = [cradle for cradle, is_excluded in zip(unique_cradles, excluded) if not is_excluded]
         
         # Trier par score composite
         selected_cradles.sort(key=lambda x: x.get("composite_score", -999), reverse=True)
@@ -1261,22 +1229,45 @@ class AspectsPatternsGenerator:
         significant = [c for c in selected_cradles if c.get("avg_orb", 999) < 7]
         return significant[:2]
 
-    def detect_patterns(self, chart, max_orb=8):
+    def _render_aspects(self, pattern):
+        """Met en forme les AspectRecord d'un pattern retenu (les textes déjà formatés sont conservés)"""
+        cradle = pattern.get("type") == "Berceau"
+        names = self._NAME_BY_IDX
+        aspect_names = self.aspect_names
+        rendered = []
+        for record in pattern.get("aspects", []):
+            if not isinstance(record, AspectRecord):
+                rendered.append(record)
+                continue
+            aspect_name = aspect_names.get(record.typ, 'Unknown')
+            p1, p2 = names[record.p1], names[record.p2]
+            if cradle:
+                rendered.append(f"{aspect_name}: {p1} - {p2} (orb: {record.orb:.1f}°)")
+            else:
+                rendered.append(f"{p1} {aspect_name} {p2} (orb: {record.orb:.1f}°)")
+        pattern["aspects"] = rendered
+        return pattern
+
+    def detect_patterns(self, chart, max_orb=8, positions=None):
         """Détecte les patterns astrologiques principaux - ordre de priorité optimisé"""
         patterns = []
         
+        # Positions et matrice d'orbes calculées une seule fois pour tous les détecteurs
+        if positions is None:
+            positions = self._build_position_arrays(chart)
+        
         # Détecter les patterns avec filtrage
-        t_squares = self._detect_t_square(chart, max_orb)
-        grand_trines = self._detect_grand_trine(chart, max_orb)
-        grand_squares = self._detect_grand_square(chart, max_orb)
-        kites = self._detect_kite(chart, max_orb)
-        cradles = self._detect_cradle(chart, max_orb)
-        stelliums = self._detect_stelliums(chart)
-        multiple_planet_squares = self._detect_multiple_planet_square(chart, max_orb)
-        yods = self._detect_yod(chart, max_orb)
+        t_squares = self._detect_t_square(chart, max_orb, positions=positions)
+        grand_trines = self._detect_grand_trine(chart, max_orb, positions=positions)
+        grand_squares = self._detect_grand_square(chart, max_orb, positions=positions)
+        kites = self._detect_kite(chart, max_orb, positions=positions, grand_trines=grand_trines)
+        cradles = self._detect_cradle(chart, max_orb, positions=positions)
+        stelliums = self._detect_stelliums(chart, positions=positions)
+        multiple_planet_squares = self._detect_multiple_planet_square(chart, max_orb, positions=positions)
+        yods = self._detect_yod(chart, max_orb, positions=positions)
         
         # Appliquer les filtres dans l'ordre de priorité (configurations majeures)
-        patterns.extend(self._filter_t_squares(t_squares))  # T-Squares (tension/conflit)
+        patterns.extend(t_squares)  # T-Squares (tension/conflit)
         patterns.extend(multiple_planet_squares)  # Multiple Planet Squares (complexité)
         patterns.extend(self._filter_yods(yods))  # Yods (mission spéciale)
         patterns.extend(self._filter_cradles(cradles))  # Cradles (soutien harmonieux)
@@ -1285,6 +1276,11 @@ class AspectsPatternsGenerator:
         patterns.extend(grand_squares)  # Grand Squares (tension maximale)
         patterns.extend(self._filter_stelliums(stelliums))  # Stelliums (concentration)
         
+        # Mise en forme des aspects uniquement pour les patterns retenus
+        for pattern in patterns:
+            if "aspects" in pattern:
+                self._render_aspects(pattern)
+        
         # Ne pas limiter - retourner tous les patterns significatifs détectés
         return patterns
 
@@ -1417,14 +1413,43 @@ class AspectsPatternsGenerator:
         """Génère les aspects et patterns pour un thème donné
         Si existing_chart est fourni, le réutilise au lieu de recalculer"""
         chart = self.generate_chart_from_plumatotm_data(date, time, lat, lon, existing_chart)
-        aspects = self.calculate_aspects(chart, max_orb)
-        patterns = self.detect_patterns(chart, max_orb)
+        # Une seule table de positions/orbes partagée par les aspects et les patterns
+        positions = self._build_position_arrays(chart)
+        aspects = self.calculate_aspects(chart, max_orb, positions=positions)
+        patterns = self.detect_patterns(chart, max_orb, positions=positions)
         
         return {
             "aspects": aspects,
             "patterns": patterns
         }
 
+    def batch_generate(self, requests, workers=None, chunksize=16):
+        """Génère aspects et patterns pour une liste de thèmes
+        
+        requests: ChartRequest ou tuples (date, time, lat, lon[, max_orb]).
+        Les thèmes sont calculés en parallèle dans un pool de processus (flatlib garde le
+        GIL); workers=1 calcule tout dans le processus courant. Les résultats sont renvoyés
+        dans l'ordre des demandes; une demande invalide lève ValueError comme
+        generate_aspects_patterns. Les caches de fuseaux horaires sont partagés par tous
+        les thèmes d'un même processus.
+        """
+        requests = [r if isinstance(r, ChartRequest) else ChartRequest(*r) for r in requests]
+        
+        if workers == 1 or len(requests) <= 1:
+            return [self.generate_aspects_patterns(r.date, r.time, r.lat, r.lon, r.max_orb)
+                    for r in requests]
+        
+        # Sous Linux le pool forke: les processus héritent de ce générateur (et de
+        # TimezoneFinder s'il est déjà chargé) au lieu de les reconstruire
+        global _worker_generator
+        pool_options = {}
+        if sys.platform.startswith('linux'):
+            _worker_generator = self
+            pool_options['mp_context'] = multiprocessing.get_context('fork')
+        
+        with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+            return list(executor.map(_generate_worker, requests, chunksize=chunksize))
+
     def save_aspects_patterns(self, data, output_dir="outputs", filename="aspects_patterns.json"):
         """Sauvegarde les aspects et patterns dans un fichier JSON"""
         os.makedirs(output_dir, exist_ok=True)
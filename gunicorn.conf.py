@@ -1,18 +1,43 @@
 # Gunicorn configuration for PLUMATOTM API
+import logging
 import os
+import sys
+
+# Application logging, configured here rather than when main is imported
+# (LOG_LEVEL=DEBUG for verbose request tracing)
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+    stream=sys.stderr
+)
 
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
 backlog = 2048
 
 # Worker processes
-workers = 1  # Single worker to avoid memory issues with heavy calculations
-worker_class = "sync"
+# A single worker process. Analyses write to private directories, but the
+# shared PNG names in outputs/ (birth_chart.png, top1_animal_radar.png, ...,
+# read by generate_book.py and older clients) are only consistent while one
+# analysis runs at a time, and background /analyze jobs are queued in the
+# worker's memory. Within the worker, main.py runs one analysis at a time and
+# the extra threads keep /health and /files responsive during a long analysis.
+# swisseph's ephemeris path is per thread: main.py sets it in each thread
+# that runs an analysis (_ensure_ephemeris_path).
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+worker_class = "gthread" if threads > 1 else "sync"
 worker_connections = 1000
+
+# Load the app once in the master and fork workers from it, so restarted
+# workers (see max_requests) start warm and share read-only pages
+preload_app = True
 timeout = 300  # Increased timeout for astrological calculations (5 minutes)
 keepalive = 2
 
-# Restart workers after this many requests, to prevent memory leaks
+# Restart workers after this many requests, to prevent memory leaks.
+# Finished background jobs survive the restart (outputs/.jobs/), queued
+# ones are lost if the worker is killed after graceful_timeout.
 max_requests = 50  # Restart more frequently to prevent memory leaks
 max_requests_jitter = 10
 
@@ -22,6 +47,22 @@ errorlog = "-"
 loglevel = "info"
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 
+# Server hooks
+def when_ready(server):
+    """Build the analyzer in the master before workers are forked.
+
+    PRELOAD_ANALYZER=0 skips it: plumatotm_core and flatlib are then imported
+    by each worker on its first /analyze or /order (smaller, faster boot).
+    """
+    if os.environ.get('PRELOAD_ANALYZER', '1') == '0':
+        server.log.info("Analyzer preload disabled, workers will initialize lazily")
+        return
+    try:
+        import main
+        main.get_analyzer()
+    except Exception as e:
+        server.log.warning(f"Analyzer warm-up failed, workers will initialize lazily: {e}")
+
 # Process naming
 proc_name = "plumatotm-api"
 
@@ -4,18 +4,70 @@ PLUMATOTM API Web Service
 Expose the astrological animal compatibility engine via HTTP API
 """
 
-from flask import Flask, request, jsonify, send_file
-from flask_cors import CORS
+from flask import Flask, request, send_from_directory
+from werkzeug.security import safe_join
 import os
 import json
 import tempfile
+import shutil
+import contextlib
 from datetime import datetime
-import traceback
+from typing import Annotated, Optional
 import csv
 import re
+import calendar
+import heapq
+import collections
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import sys
+import threading
+import logging
 
-# Import the core engine
-import plumatotm_core
+logger = logging.getLogger(__name__)
+
+def configure_logging():
+    """Configure root logging (LOG_LEVEL=DEBUG for verbose request tracing).
+
+    Called only when main.py runs as a script; under gunicorn, gunicorn.conf.py
+    configures logging, and importers (generate_book.py, tests) keep their own.
+    """
+    logging.basicConfig(
+        level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+        stream=sys.stderr,
+        force=True
+    )
+
+# orjson is much faster than stdlib json for the large /analyze payloads
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# msgspec decodes and validates the /analyze payload in one pass (optional)
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+
+# flask_cors only adds the CORS headers for plumastro.com (optional)
+try:
+    from flask_cors import CORS
+    HAS_FLASK_CORS = True
+except ImportError:
+    HAS_FLASK_CORS = False
+    logger.warning("flask-cors not available, /analyze responses carry no CORS headers")
+
+# flask-compress compresses the large JSON responses (optional)
+try:
+    from flask_compress import Compress
+    HAS_FLASK_COMPRESS = True
+except ImportError:
+    HAS_FLASK_COMPRESS = False
 
 # Import Supabase manager
 try:
@@ -23,50 +75,376 @@ try:
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
-    print("WARNING: Supabase not available. Install with: pip install supabase")
+    logger.warning("Supabase not available. Install with: pip install supabase")
 
 app = Flask(__name__)
 
+# Cache lifetime for send_from_directory responses (/files), and optional
+# X-Sendfile hand-off when a front proxy (nginx/Apache) serves the bytes
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 60
+app.config['USE_X_SENDFILE'] = bool(os.environ.get('USE_X_SENDFILE'))
+
+# Brotli/gzip response compression for bodies over 1 KB (/analyze JSON);
+# PNG files are not in COMPRESS_MIMETYPES and are sent as is
+if HAS_FLASK_COMPRESS:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
+
 # Configure CORS to allow requests from plumastro.com
-CORS(app, resources={r"/analyze": {"origins": "https://plumastro.com"}})
+if HAS_FLASK_CORS:
+    CORS(app, resources={r"/analyze": {"origins": "https://plumastro.com"}})
 
-# Global analyzer instance
+# Global analyzer instance (created lazily on first request, see get_analyzer)
 analyzer = None
 
+# Set once the analyzer is built; /health reads only this flag
+READY = False
+
+# English animal name -> French translation fields, copied from the analyzer once
+# at initialization (cleanup_memory clears the analyzer's own dict after each run)
+_ANIMAL_TR = {}
+_analyzer_lock = threading.Lock()
+
+# Analyses share the analyzer state (last computed chart, caches), so only
+# one /analyze or /order runs at a time per process; other endpoints
+# (/health, /files) stay responsive on the remaining server threads
+_analysis_lock = threading.Lock()
+
+# Per-thread flag for _ensure_ephemeris_path (swisseph's ephemeris path is thread-local)
+_thread_state = threading.local()
+
+# Background /analyze jobs (?async=1 or "Prefer: respond-async"): a single
+# in-process worker thread, since analyses are serialized anyway. Finished
+# results are also written to outputs/.jobs/<job_id>.json so they can still be
+# polled on GET /analyze/<job_id> after a worker restart (max_requests);
+# the ANALYSIS_JOBS_MAX most recent are kept. At most ANALYSIS_JOBS_QUEUE_MAX
+# jobs wait or run at once, further submissions get 503 with Retry-After.
+ANALYSIS_JOBS_MAX = int(os.environ.get('ANALYSIS_JOBS_MAX', '100'))
+ANALYSIS_JOBS_QUEUE_MAX = int(os.environ.get('ANALYSIS_JOBS_QUEUE_MAX', '10'))
+ANALYSIS_RETRY_AFTER = int(os.environ.get('ANALYSIS_RETRY_AFTER', '30'))
+_JOB_ID_RE = re.compile(r'[0-9a-f]{32}').fullmatch
+_analysis_executor = None
+_analysis_jobs = collections.OrderedDict()
+_jobs_lock = threading.Lock()
+
 # Global Supabase manager instance
 supabase_manager = None
 
+# Cache-Control max-age (seconds) for files served from outputs/
+FILES_CACHE_MAX_AGE = app.config['SEND_FILE_MAX_AGE_DEFAULT']
+
+# Absolute path of the analysis outputs directory
+OUTPUTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "outputs")
+
+# outputs/ listing, refreshed only when the directory mtime changes
+_LIST_CACHE = {'mtime': None, 'files': []}
+
+# Parsed output JSON files keyed by path: (mtime_ns, size) -> data (treat as read-only)
+_file_cache = {}
+
+# Combined file written by run_analysis with all the keys below
+# (plumatotm_core.ANALYSIS_RESULT_FILE, not imported to keep the core lazy)
+_RESULT_FILE = "analysis_result.json"
+
+# Output files read back by load_analysis_results when the combined file is missing,
+# keyed like the run_analysis result (the first three must be present in memory
+# for analysis_results_from to skip the files)
+_RESULT_FILES = (
+    ('birth_chart_data', "birth_chart.json"),
+    ('animal_proportion', "animal_proportion.json"),
+    ('top3_percentage_strength', "top3_percentage_strength.json"),
+    ('chatgpt_interpretation', "chatgpt_interpretation.json"),
+)
+
+# Files produced by an /analyze run; the PNGs are returned under the run's own
+# names (see _run_output_files)
+_OUTPUT_FILES = (
+    "birth_chart.json",
+    "birth_chart.png",
+    "animal_totals.json",
+    "top3_percentage_strength.json",
+    "animal_proportion.json",
+    "chatgpt_interpretation.json",
+    "top1_animal_radar.png",
+    "top2_animal_radar.png",
+    "top3_animal_radar.png"
+)
+
+# Per-request PNGs ("<run_id>_<name>.png") kept in outputs/, oldest runs removed first
+OUTPUT_RUNS_MAX = int(os.environ.get('OUTPUT_RUNS_MAX', '100'))
+_RUN_FILE_RE = re.compile(r'^([0-9a-f]{32})_.+\.png$')
+
+def _run_output_files(run_id):
+    """output_files for one analysis: PNGs under their per-request names."""
+    return [f"{run_id}_{name}" if name.endswith('.png') else name for name in _OUTPUT_FILES]
+
+def _orjson_default(obj):
+    """Serialize NumPy scalars (e.g. float64 orbs) that orjson does not handle natively."""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _json_dumps(payload, indent=False):
+    """Serialize payload to UTF-8 JSON bytes, preserving key order."""
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(payload, default=_orjson_default, option=option)
+    return json.dumps(payload, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+def _json(payload, status=200, indent=False):
+    """Build a JSON response (replacement for jsonify)."""
+    return app.response_class(_json_dumps(payload, indent), status=status, mimetype='application/json')
+
+def _request_json():
+    """Parse the request body as JSON."""
+    if HAS_ORJSON:
+        return orjson.loads(request.get_data())
+    return request.get_json()
+
+# Date/time shape checks for /analyze, compiled once (same formats as
+# strptime's '%Y-%m-%d' and '%H:%M'; ranges are checked on the groups)
+_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})').fullmatch
+_TIME_RE = re.compile(r'(\d{1,2}):(\d{1,2})').fullmatch
+
+# User-facing messages for /analyze fields that fail validation
+_FIELD_ERRORS = {
+    'date': "Invalid date format. Use YYYY-MM-DD",
+    'time': "Invalid time format. Use HH:MM (24h)",
+    'lat': "Latitude must be a number between -90 and 90",
+    'lon': "Longitude must be a number between -180 and 180",
+}
+
+if HAS_MSGSPEC:
+    class AnalyzeRequest(msgspec.Struct):
+        """Schema of the /analyze JSON payload (shape, types and ranges checked while decoding)."""
+        date: Annotated[str, msgspec.Meta(pattern=r'^\d{4}-\d{1,2}-\d{1,2}$')]
+        time: Annotated[str, msgspec.Meta(pattern=r'^\d{1,2}:\d{1,2}$')]
+        lat: Annotated[float, msgspec.Meta(ge=-90, le=90)]
+        lon: Annotated[float, msgspec.Meta(ge=-180, le=180)]
+        name: Optional[str] = 'Anonymous'
+        country: Optional[str] = 'Unknown'
+        state: Optional[str] = 'Unknown'
+        city: Optional[str] = 'Unknown'
+        openai_api_key: Optional[str] = None
+
+def _parse_analyze_request():
+    """Decode and validate the /analyze payload.
+
+    Returns a (params, error) tuple: params is a dict of the analysis
+    parameters, error is a message for a 400 response.
+    """
+    if HAS_MSGSPEC:
+        try:
+            # strict=False keeps accepting numeric strings for lat/lon
+            req = msgspec.json.decode(request.get_data(), type=AnalyzeRequest, strict=False)
+        except msgspec.ValidationError as e:
+            message = str(e)
+            for field, field_error in _FIELD_ERRORS.items():
+                if message.endswith(f"`$.{field}`"):
+                    return None, field_error
+                if message == f"Object missing required field `{field}`":
+                    return None, f"Missing required field: {field}"
+            return None, f"Invalid request: {message}"
+        except msgspec.DecodeError:
+            return None, "Request body is not valid JSON"
+        params = msgspec.structs.asdict(req)
+    else:
+        data = _request_json()
+        
+        # Validate required fields
+        for field in ('date', 'time', 'lat', 'lon'):
+            if field not in data:
+                return None, f"Missing required field: {field}"
+        
+        # Validate coordinates
+        try:
+            lat = float(data['lat'])
+        except (TypeError, ValueError):
+            lat = None
+        if lat is None or not (-90 <= lat <= 90):
+            return None, _FIELD_ERRORS['lat']
+        try:
+            lon = float(data['lon'])
+        except (TypeError, ValueError):
+            lon = None
+        if lon is None or not (-180 <= lon <= 180):
+            return None, _FIELD_ERRORS['lon']
+        
+        params = {
+            'date': data['date'],
+            'time': data['time'],
+            'lat': lat,
+            'lon': lon,
+            'name': data.get('name', 'Anonymous'),
+            'country': data.get('country', 'Unknown'),
+            'state': data.get('state', 'Unknown'),
+            'city': data.get('city', 'Unknown'),
+            'openai_api_key': data.get('openai_api_key'),
+        }
+    
+    # Validate date format (shape, month and day-of-month)
+    date_match = _DATE_RE(params['date']) if isinstance(params['date'], str) else None
+    if date_match is None:
+        return None, _FIELD_ERRORS['date']
+    year, month, day = map(int, date_match.groups())
+    if not (year >= 1 and 1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]):
+        return None, _FIELD_ERRORS['date']
+    
+    # Validate time format
+    time_match = _TIME_RE(params['time']) if isinstance(params['time'], str) else None
+    if time_match is None:
+        return None, _FIELD_ERRORS['time']
+    hour, minute = map(int, time_match.groups())
+    if not (hour <= 23 and minute <= 59):
+        return None, _FIELD_ERRORS['time']
+    
+    return params, None
+
+def _list_output_files(outputs_dir):
+    """List outputs_dir, reusing the previous listing while its mtime is unchanged."""
+    mtime = os.stat(outputs_dir).st_mtime_ns
+    if mtime != _LIST_CACHE['mtime']:
+        # Hidden entries are the per-request directories of running analyses
+        with os.scandir(outputs_dir) as entries:
+            _LIST_CACHE['files'] = [entry.name for entry in entries if not entry.name.startswith('.')]
+        _LIST_CACHE['mtime'] = mtime
+    return list(_LIST_CACHE['files'])
+
+def _read_json(path):
+    """Parse a JSON output file."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+def _cached_json(path):
+    """Parse a JSON output file, reusing the previous parse while the file is unchanged."""
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _file_cache.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    data = _read_json(path)
+    _file_cache[path] = (key, data)
+    return data
+
+@contextlib.contextmanager
+def _analysis_output_dir(run_id):
+    """Private output directory for one run_analysis call.
+
+    Concurrent analyses no longer overwrite each other's files. On exit each
+    PNG chart is published in outputs/ (served by /files) as "<run_id>_<name>",
+    which a later analysis cannot overwrite, and under its shared name (last
+    analysis wins, read by generate_book.py and older clients). The rest is removed.
+    """
+    os.makedirs(OUTPUTS_DIR, exist_ok=True)
+    # Inside outputs/ so the PNGs are published with atomic same-filesystem renames
+    output_dir = tempfile.mkdtemp(prefix='.analysis_', dir=OUTPUTS_DIR)
+    try:
+        yield output_dir
+    finally:
+        published = False
+        for name in os.listdir(output_dir):
+            if name.endswith('.png'):
+                path = os.path.join(output_dir, name)
+                run_path = os.path.join(OUTPUTS_DIR, f"{run_id}_{name}")
+                os.replace(path, run_path)
+                # Same file under the shared name, swapped in atomically
+                try:
+                    os.link(run_path, path)
+                except OSError:
+                    shutil.copyfile(run_path, path)
+                os.replace(path, os.path.join(OUTPUTS_DIR, name))
+                published = True
+        shutil.rmtree(output_dir, ignore_errors=True)
+        if published:
+            _prune_run_outputs()
+
+def _prune_run_outputs():
+    """Remove the per-request PNGs of all but the OUTPUT_RUNS_MAX most recent runs."""
+    runs = {}
+    with os.scandir(OUTPUTS_DIR) as entries:
+        for entry in entries:
+            match = _RUN_FILE_RE.match(entry.name)
+            if match:
+                try:
+                    mtime = entry.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                run = runs.setdefault(match.group(1), [0, []])
+                run[0] = max(run[0], mtime)
+                run[1].append(entry.path)
+    if len(runs) <= OUTPUT_RUNS_MAX:
+        return
+    for _, paths in heapq.nsmallest(len(runs) - OUTPUT_RUNS_MAX, runs.values(), key=lambda run: run[0]):
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
 def initialize_analyzer():
     """Initialize the analyzer with required files"""
-    global analyzer
+    global analyzer, _ANIMAL_TR, READY
     try:
-        print("Testing flatlib import...")
+        logger.info("Testing flatlib import...")
         import flatlib
-        print(f"SUCCESS: flatlib imported successfully (version: {getattr(flatlib, '__version__', 'unknown')})")
+        logger.info("flatlib imported successfully (version: %s)", getattr(flatlib, '__version__', 'unknown'))
         
-        print("Importing BirthChartAnalyzer...")
+        logger.info("Importing BirthChartAnalyzer...")
         from plumatotm_core import BirthChartAnalyzer
-        print("SUCCESS: BirthChartAnalyzer imported successfully")
+        logger.info("BirthChartAnalyzer imported successfully")
         
-        print("Initializing analyzer...")
+        logger.info("Initializing analyzer...")
         analyzer = BirthChartAnalyzer(
             scores_csv_path="plumatotm_raw_scores_trad.csv",
             weights_csv_path="plumatotm_planets_weights.csv", 
             multipliers_csv_path="plumatotm_planets_multiplier.csv",
             translations_csv_path="plumatotm_raw_scores_trad.csv"
         )
-        print("SUCCESS: PLUMATOTM Analyzer initialized successfully")
+        analyzer._ensure_animal_translations_loaded()
+        _ANIMAL_TR = dict(analyzer.animal_translations)
+        READY = True
+        logger.info("PLUMATOTM Analyzer initialized successfully")
         return True
     except ImportError as e:
-        print(f"ERROR: Import error: {e}")
-        print("INFO: This might be a flatlib installation issue on Render")
+        logger.error("Import error: %s", e)
+        logger.info("This might be a flatlib installation issue on Render")
         return False
     except Exception as e:
-        print(f"ERROR: Failed to initialize analyzer: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Failed to initialize analyzer: %s", e)
         return False
 
+def _one_analysis_at_a_time(view):
+    """Serialize a view on _analysis_lock."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with _analysis_lock:
+            return view(*args, **kwargs)
+    return wrapper
+
+def _ensure_ephemeris_path():
+    """Point swisseph at flatlib's bundled .se1 files in the calling thread.
+
+    swisseph keeps its ephemeris path per thread and flatlib sets it only in
+    the thread that imports it (the master's main thread with preload). Other
+    threads (gthread request threads, the background job thread) would
+    otherwise silently compute positions with the Moshier fallback.
+    """
+    if getattr(_thread_state, 'ephemeris_path_set', False):
+        return
+    import flatlib
+    import flatlib.ephem
+    flatlib.ephem.setPath(flatlib.PATH_RES + 'swefiles')
+    _thread_state.ephemeris_path_set = True
+
+def get_analyzer():
+    """Return the shared analyzer, initializing it on first use."""
+    if analyzer is None:
+        with _analyzer_lock:
+            # Another thread may have initialized it while we waited for the lock
+            if analyzer is None:
+                initialize_analyzer()
+    return analyzer
+
 def initialize_supabase():
     """Initialize the Supabase manager"""
     global supabase_manager
@@ -74,42 +452,49 @@ def initialize_supabase():
         try:
             supabase_manager = SupabaseManager()
             if supabase_manager.is_available():
-                print("SUCCESS: Supabase manager initialized successfully")
+                logger.info("Supabase manager initialized successfully")
                 return True
             else:
-                print("WARNING: Supabase manager not available (check configuration)")
+                logger.warning("Supabase manager not available (check configuration)")
                 return False
         except Exception as e:
-            print(f"ERROR: Failed to initialize Supabase manager: {e}")
+            logger.error("Failed to initialize Supabase manager: %s", e)
             return False
     else:
-        print("WARNING: Supabase not available")
+        logger.warning("Supabase not available")
         return False
 
+# Static payloads, serialized once at import instead of on every hit
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+_HOME_RESPONSE = (_json_dumps({
+    "service": "PLUMATOTM Astrological Animal Compatibility Engine",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "POST /analyze": "Run full astrological analysis (?include=top3 omits all_animals_percentages, ?async=1 runs it in the background)",
+        "GET /analyze/<job_id>": "Result of a background analysis",
+        "POST /order": "Process order with customAttributes and generate prompts",
+        "GET /health": "Health check",
+        "GET /": "This information"
+    }
+}), 200, _JSON_HEADERS)
+_NO_OUTPUTS_RESPONSE = (_json_dumps({
+    "files": [],
+    "count": 0,
+    "error": "Outputs directory not found",
+    "outputs_dir": OUTPUTS_DIR
+}), 200, _JSON_HEADERS)
+
 @app.route('/')
 def home():
     """API home endpoint"""
-    return jsonify({
-        "service": "PLUMATOTM Astrological Animal Compatibility Engine",
-        "version": "1.0.0",
-        "status": "running",
-        "endpoints": {
-            "POST /analyze": "Run full astrological analysis",
-            "POST /order": "Process order with customAttributes and generate prompts",
-            "GET /health": "Health check",
-            "GET /": "This information"
-        }
-    })
+    return _HOME_RESPONSE
 
 @app.route('/health')
 def health():
-    """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "analyzer_ready": analyzer is not None,
-        "supabase_ready": supabase_manager is not None and supabase_manager.is_available()
-    })
+    """Health check endpoint (pre-serialized body, only the timestamp is filled in)"""
+    body = _HEALTH_BODIES[READY] % datetime.now().isoformat().encode('ascii')
+    return body, 200, _JSON_HEADERS
 
 # Dictionnaires pour les descriptions des planètes et explications des maisons
 PLANET_DESCRIPTIONS = {
@@ -214,9 +599,7 @@ def generate_top_aspects(date, time, lat, lon, existing_chart=None):
         return top_aspects
         
     except Exception as e:
-        print(f"WARNING: Error generating top aspects: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Error generating top aspects: %s", e, exc_info=True)
         # Return empty aspects if error
         return {f"ASPECT{i}": "" for i in range(1, 11)}
 
@@ -256,7 +639,7 @@ def get_sun_ascendant_sign(birth_chart_data):
         
         return f"{sun_fr}-{ascendant_fr}"
     except Exception as e:
-        print(f"ERROR: Could not extract sun-ascendant signs: {e}")
+        logger.error("Could not extract sun-ascendant signs: %s", e)
         return "Unknown-Unknown"
 
 def get_animal_pose_from_csv(sun_ascendant_sign):
@@ -264,7 +647,7 @@ def get_animal_pose_from_csv(sun_ascendant_sign):
     try:
         csv_path = "plumatotm_animalpose.csv"
         if not os.path.exists(csv_path):
-            print(f"WARNING: {csv_path} not found")
+            logger.warning("%s not found", csv_path)
             return "Pose inconnue"
         
         # Search for the sign combination - handle BOM in CSV
@@ -275,16 +658,14 @@ def get_animal_pose_from_csv(sun_ascendant_sign):
                 sign_key = row.get('Signe Soleil-Ascendant', '') or row.get('\ufeffSigne Soleil-Ascendant', '')
                 if sign_key.strip() == sun_ascendant_sign.strip():
                     action = row.get('Action/Attitude illustrable', 'Pose inconnue')
-                    print(f"FOUND: {sun_ascendant_sign} -> {action}")
+                    logger.debug("FOUND: %s -> %s", sun_ascendant_sign, action)
                     return action
         
-        print(f"WARNING: No match found for '{sun_ascendant_sign}' in pose CSV")
+        logger.warning("No match found for '%s' in pose CSV", sun_ascendant_sign)
         return "Pose inconnue"
         
     except Exception as e:
-        print(f"ERROR: Could not read animal pose CSV: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Could not read animal pose CSV: %s", e)
         return "Pose inconnue"
 
 def get_triotone_colors(sun_sign, ascendant_sign, moon_sign):
@@ -292,7 +673,7 @@ def get_triotone_colors(sun_sign, ascendant_sign, moon_sign):
     try:
         csv_path = "plumatotm_animalcouleur.csv"
         if not os.path.exists(csv_path):
-            print(f"WARNING: {csv_path} not found")
+            logger.warning("%s not found", csv_path)
             return "rouge", "vert emeraude", "argent"
         
         # Load color mapping
@@ -310,14 +691,12 @@ def get_triotone_colors(sun_sign, ascendant_sign, moon_sign):
         ascendant_color = color_mapping.get(ascendant_sign, "vert emeraude") 
         moon_color = color_mapping.get(moon_sign, "argent")
         
-        print(f"TRIOTONE COLORS: Sun({sun_sign})={sun_color}, Asc({ascendant_sign})={ascendant_color}, Moon({moon_sign})={moon_color}")
+        logger.debug("TRIOTONE COLORS: Sun(%s)=%s, Asc(%s)=%s, Moon(%s)=%s", sun_sign, sun_color, ascendant_sign, ascendant_color, moon_sign, moon_color)
         
         return sun_color, ascendant_color, moon_color
         
     except Exception as e:
-        print(f"ERROR: Could not read animal color CSV: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Could not read animal color CSV: %s", e)
         return "rouge", "vert emeraude", "argent"
 
 def generate_animal_summary(order_name_nb, animal_totem, genre, sun_ascendant_sign):
@@ -333,20 +712,20 @@ def generate_animal_summary(order_name_nb, animal_totem, genre, sun_ascendant_si
         return f"{animal_capitalized} ({genre.capitalize()}) ///// {action}"
         
     except Exception as e:
-        print(f"ERROR: Could not generate animal summary: {e}")
+        logger.error("Could not generate animal summary: %s", e)
         return f"{animal_totem} ({genre}) ///// Pose inconnue"
 
-def generate_planetary_positions_summary():
-    """Generate the PLANETARY POSITIONS SUMMARY from birth chart data."""
+def generate_planetary_positions_summary(birth_chart_data=None):
+    """Generate the PLANETARY POSITIONS SUMMARY from birth chart data (read from outputs/ if not given)."""
     try:
-        # Load birth chart data
-        birth_chart_path = "outputs/birth_chart.json"
-        if not os.path.exists(birth_chart_path):
-            print("WARNING: Birth chart file not found")
-            return []
-        
-        with open(birth_chart_path, 'r', encoding='utf-8') as f:
-            birth_chart_data = json.load(f)
+        if birth_chart_data is None:
+            # Load birth chart data
+            birth_chart_path = "outputs/birth_chart.json"
+            if not os.path.exists(birth_chart_path):
+                logger.warning("Birth chart file not found")
+                return []
+            
+            birth_chart_data = _cached_json(birth_chart_path)
         
         planet_signs = birth_chart_data.get('planet_signs', {})
         planet_houses = birth_chart_data.get('planet_houses', {})
@@ -405,128 +784,150 @@ def generate_planetary_positions_summary():
         return planetary_summary
         
     except Exception as e:
-        print(f"WARNING: Error generating planetary positions summary: {e}")
+        logger.warning("Error generating planetary positions summary: %s", e)
         return []
 
-def load_analysis_results():
+def load_analysis_results(output_dir=OUTPUTS_DIR, all_percentages=True):
     """Load and format analysis results for API response."""
+    # Per-request directories are read once, only outputs/ is worth caching
+    load = _cached_json if output_dir == OUTPUTS_DIR else _read_json
+    sources = {}
+    try:
+        combined_path = os.path.join(output_dir, _RESULT_FILE)
+        if os.path.exists(combined_path):
+            sources = load(combined_path)
+        else:
+            for key, filename in _RESULT_FILES:
+                path = os.path.join(output_dir, filename)
+                if os.path.exists(path):
+                    sources[key] = load(path)
+    except Exception as e:
+        logger.warning("Could not load some analysis results: %s", e)
+    
+    return format_results(sources, all_percentages)
+
+def analysis_results_from(result, output_dir=OUTPUTS_DIR, all_percentages=True):
+    """Format the run_analysis return value, reading output_dir only when it lacks the needed data."""
+    if isinstance(result, dict) and all(key in result for key, _ in _RESULT_FILES[:3]):
+        return format_results(result, all_percentages)
+    return load_analysis_results(output_dir, all_percentages)
+
+def format_results(result, all_percentages=True):
+    """Format analysis results for API response, without touching the filesystem.
+    
+    result uses the keys of the run_analysis return value (birth_chart_data,
+    animal_proportion, top3_percentage_strength, chatgpt_interpretation).
+    With all_percentages=False the translated all_animals_percentages table
+    (every animal) is neither built nor returned.
+    """
     results = {}
+    get_translation = _ANIMAL_TR.get
     
     try:
-        # 1. Load French birth chart (preserve exact order from JSON file)
-        birth_chart_path = "outputs/birth_chart.json"
-        if os.path.exists(birth_chart_path):
-            with open(birth_chart_path, 'r', encoding='utf-8') as f:
-                birth_chart_data = json.load(f)
-                french_chart = birth_chart_data.get('french_birth_chart', {})
-                french_chart_nomin = birth_chart_data.get('french_birth_chart_nomin', {})
-                
-                # Define the exact order we want (matching the JSON file order)
-                planet_order = [
-                    "Soleil", "Ascendant", "Lune", "Mercure", "Vénus", "Mars", 
-                    "Jupiter", "Saturne", "Uranus", "Neptune", "Pluton", 
-                    "MC", "Nœud Nord"
-                ]
-                
-                # Order for french_birth_chart_nomin (MC stays as "MC")
-                planet_order_nomin = [
-                    "Soleil", "Ascendant", "Lune", "Mercure", "Vénus", "Mars", 
-                    "Jupiter", "Saturne", "Uranus", "Neptune", "Pluton", 
-                    "MC", "Nœud Nord"
-                ]
-                
-                # Create ordered dictionary with the exact order
-                # Use a regular dict with Python 3.7+ order preservation
-                ordered_french_chart = {}
-                ordered_french_chart_nomin = {}
-                
-                # Order french_birth_chart with "MC"
-                for planet in planet_order:
-                    if planet in french_chart:
-                        ordered_french_chart[planet] = french_chart[planet]
-                
-                # Order french_birth_chart_nomin with "Milieu Ciel"
-                for planet in planet_order_nomin:
-                    if planet in french_chart_nomin:
-                        ordered_french_chart_nomin[planet] = french_chart_nomin[planet]
-                
-                results['french_birth_chart'] = ordered_french_chart
-                results['french_birth_chart_nomin'] = ordered_french_chart_nomin
-        
-        # 2. Load animal proportion with French translations
-        animal_proportion_path = "outputs/animal_proportion.json"
-        if os.path.exists(animal_proportion_path):
-            with open(animal_proportion_path, 'r', encoding='utf-8') as f:
-                animal_proportion_data = json.load(f)
-                
-                # Translate animal names in all_animals_percentages
-                analyzer._ensure_animal_translations_loaded()
-                translated_percentages = {}
-                for animal_en, percentage in animal_proportion_data.get('all_animals_percentages', {}).items():
-                    animal_translation = analyzer.animal_translations.get(animal_en, {})
-                    animal_fr = animal_translation.get('AnimalFR', animal_en)
-                    translated_percentages[animal_fr] = percentage
-                
-                # Get user current animal translations
-                user_current_animal_en = animal_proportion_data.get('user_current_animal', '')
-                user_animal_translation = analyzer.animal_translations.get(user_current_animal_en, {})
-                
-                results['animal_proportion'] = {
-                    'user_plumid': animal_proportion_data.get('user_plumid', ''),
-                    'user_current_animal': user_animal_translation.get('AnimalFR', user_current_animal_en),
-                    'user_animal_percentage': animal_proportion_data.get('user_animal_percentage', 0),
-                    'all_animals_percentages': translated_percentages
+        # 1. French birth chart (preserve exact order from JSON file)
+        birth_chart_data = result.get('birth_chart_data')
+        if birth_chart_data is not None:
+            french_chart = birth_chart_data.get('french_birth_chart', {})
+            french_chart_nomin = birth_chart_data.get('french_birth_chart_nomin', {})
+            
+            # Define the exact order we want (matching the JSON file order)
+            planet_order = [
+                "Soleil", "Ascendant", "Lune", "Mercure", "Vénus", "Mars", 
+                "Jupiter", "Saturne", "Uranus", "Neptune", "Pluton", 
+                "MC", "Nœud Nord"
+            ]
+            
+            # Order for french_birth_chart_nomin (MC stays as "MC")
+            planet_order_nomin = [
+                "Soleil", "Ascendant", "Lune", "Mercure", "Vénus", "Mars", 
+                "Jupiter", "Saturne", "Uranus", "Neptune", "Pluton", 
+                "MC", "Nœud Nord"
+            ]
+            
+            # Create ordered dictionary with the exact order
+            # Use a regular dict with Python 3.7+ order preservation
+            ordered_french_chart = {}
+            ordered_french_chart_nomin = {}
+            
+            # Order french_birth_chart with "MC"
+            for planet in planet_order:
+                if planet in french_chart:
+                    ordered_french_chart[planet] = french_chart[planet]
+            
+            # Order french_birth_chart_nomin with "Milieu Ciel"
+            for planet in planet_order_nomin:
+                if planet in french_chart_nomin:
+                    ordered_french_chart_nomin[planet] = french_chart_nomin[planet]
+            
+            results['french_birth_chart'] = ordered_french_chart
+            results['french_birth_chart_nomin'] = ordered_french_chart_nomin
+        
+        # 2. Animal proportion with French translations
+        animal_proportion_data = result.get('animal_proportion')
+        if animal_proportion_data is not None:
+            
+            no_translation = {}
+            
+            # Get user current animal translations
+            user_current_animal_en = animal_proportion_data.get('user_current_animal', '')
+            user_animal_translation = get_translation(user_current_animal_en, no_translation)
+            
+            results['animal_proportion'] = {
+                'user_plumid': animal_proportion_data.get('user_plumid', ''),
+                'user_current_animal': user_animal_translation.get('AnimalFR', user_current_animal_en),
+                'user_animal_percentage': animal_proportion_data.get('user_animal_percentage', 0)
+            }
+            
+            # Translate animal names in all_animals_percentages (skipped with ?include=top3)
+            if all_percentages:
+                results['animal_proportion']['all_animals_percentages'] = {
+                    get_translation(animal_en, no_translation).get('AnimalFR', animal_en): percentage
+                    for animal_en, percentage in animal_proportion_data.get('all_animals_percentages', {}).items()
                 }
         
-        # 3. Load top 3 animals with French translations and strength
-        top3_strength_path = "outputs/top3_percentage_strength.json"
-        if os.path.exists(top3_strength_path):
-            with open(top3_strength_path, 'r', encoding='utf-8') as f:
-                top3_data = json.load(f)
-                
-                # Sort animals by OVERALL_STRENGTH_ADJUST to get top 3
-                animals_with_strength = []
-                for animal_en, data in top3_data.items():
-                    if 'OVERALL_STRENGTH_ADJUST' in data:
-                        animals_with_strength.append((animal_en, data['OVERALL_STRENGTH_ADJUST']))
-                
-                # Sort by strength (descending) and take top 3
-                animals_with_strength.sort(key=lambda x: x[1], reverse=True)
-                top3_animals = animals_with_strength[:3]
-                
-                # Create top3_summary
-                top3_summary = {}
-                analyzer._ensure_animal_translations_loaded()
-                for i, (animal_en, strength) in enumerate(top3_animals, 1):
-                    animal_translation = analyzer.animal_translations.get(animal_en, {})
-                    animal_fr = animal_translation.get('AnimalFR', animal_en)
-                    determinant_fr = animal_translation.get('DeterminantAnimalFR', animal_fr)
-                    article_fr = animal_translation.get('ArticleAnimalFR', animal_fr)
-                    
-                    top3_summary[f"Top{i}"] = {
-                        "animal": animal_fr,
-                        "animal_english": animal_en,
-                        "determinant_animal": determinant_fr,
-                        "article_animal": article_fr,
-                        "overall_strength_adjust": strength
-                    }
+        # 3. Top 3 animals with French translations and strength
+        top3_data = result.get('top3_percentage_strength')
+        if top3_data is not None:
+            
+            # Pick the 3 animals with the highest OVERALL_STRENGTH_ADJUST (no full sort)
+            animals_with_strength = [
+                (animal_en, data['OVERALL_STRENGTH_ADJUST'])
+                for animal_en, data in top3_data.items()
+                if 'OVERALL_STRENGTH_ADJUST' in data
+            ]
+            top3_animals = heapq.nlargest(3, animals_with_strength, key=lambda x: x[1])
+            
+            # Create top3_summary
+            top3_summary = {}
+            for i, (animal_en, strength) in enumerate(top3_animals, 1):
+                animal_translation = get_translation(animal_en, {})
+                animal_fr = animal_translation.get('AnimalFR', animal_en)
+                determinant_fr = animal_translation.get('DeterminantAnimalFR', animal_fr)
+                article_fr = animal_translation.get('ArticleAnimalFR', animal_fr)
                 
-                results['top3_summary'] = top3_summary
+                top3_summary[f"Top{i}"] = {
+                    "animal": animal_fr,
+                    "animal_english": animal_en,
+                    "determinant_animal": determinant_fr,
+                    "article_animal": article_fr,
+                    "overall_strength_adjust": strength
+                }
+            
+            results['top3_summary'] = top3_summary
         
-        # 4. Load ChatGPT interpretation
-        interpretation_path = "outputs/chatgpt_interpretation.json"
-        if os.path.exists(interpretation_path):
-            with open(interpretation_path, 'r', encoding='utf-8') as f:
-                interpretation_data = json.load(f)
-                results['interpretation'] = interpretation_data.get('interpretation', '')
+        # 4. ChatGPT interpretation
+        interpretation_data = result.get('chatgpt_interpretation')
+        if interpretation_data is not None:
+            results['interpretation'] = interpretation_data.get('interpretation', '')
         
         # 5. Generate PLANETARY POSITIONS SUMMARY
-        planetary_summary = generate_planetary_positions_summary()
-        if planetary_summary:
-            results['PLANETARY POSITIONS SUMMARY'] = planetary_summary
+        if birth_chart_data is not None:
+            planetary_summary = generate_planetary_positions_summary(birth_chart_data)
+            if planetary_summary:
+                results['PLANETARY POSITIONS SUMMARY'] = planetary_summary
         
     except Exception as e:
-        print(f"WARNING: Could not load some analysis results: {e}")
+        logger.warning("Could not load some analysis results: %s", e)
     
     return results
 
@@ -574,10 +975,10 @@ def cleanup_memory():
         # Force garbage collection
         gc.collect()
         
-        print("Memory cleanup completed")
+        logger.info("Memory cleanup completed")
         
     except Exception as e:
-        print(f"WARNING: Memory cleanup failed: {e}")
+        logger.warning("Memory cleanup failed: %s", e)
 
 def cleanup_output_files():
     """Remove output files after processing, but keep PNG files for display."""
@@ -598,10 +999,84 @@ def cleanup_output_files():
                 os.remove(file_path)
                 files_removed += 1
             except Exception as e:
-                print(f"WARNING: Could not remove {file_path}: {e}")
+                logger.warning("Could not remove %s: %s", file_path, e)
     
     if files_removed > 0:
-        print(f"Cleaned {files_removed} output files (PNG files kept for display)")
+        logger.info("Cleaned %s output files (PNG files kept for display)", files_removed)
+
+def _wants_async():
+    """True when the client asked for a background /analyze job."""
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+def _job_path(job_id):
+    """Path of the persisted result of a background job."""
+    return os.path.join(OUTPUTS_DIR, '.jobs', f"{job_id}.json")
+
+def _save_job_result(job_id, payload, status):
+    """Atomically write a finished job's response to outputs/.jobs/."""
+    jobs_dir = os.path.dirname(_job_path(job_id))
+    os.makedirs(jobs_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=jobs_dir, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            # payload is already JSON, so it is embedded as is
+            f.write(b'{"http_status":%d,"response":%s}' % (status, payload))
+        os.replace(tmp_path, _job_path(job_id))
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    _prune_job_results(jobs_dir)
+
+def _prune_job_results(jobs_dir):
+    """Remove all but the ANALYSIS_JOBS_MAX most recent persisted job results."""
+    results = []
+    with os.scandir(jobs_dir) as entries:
+        for entry in entries:
+            if _JOB_ID_RE(entry.name[:-5]) and entry.name.endswith('.json'):
+                try:
+                    results.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    continue
+    if len(results) <= ANALYSIS_JOBS_MAX:
+        return
+    for _, path in heapq.nsmallest(len(results) - ANALYSIS_JOBS_MAX, results):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+def _run_analysis_job(job_id, params, all_percentages):
+    """Background job body: run the analysis and persist its response."""
+    payload, status = _perform_analysis(params, all_percentages)
+    try:
+        _save_job_result(job_id, payload, status)
+    except OSError:
+        logger.exception("Could not persist result of job %s", job_id)
+    return payload, status
+
+def _submit_analysis_job(params, all_percentages=True):
+    """Queue an analysis on the background worker and return its job id.
+
+    Returns None when ANALYSIS_JOBS_QUEUE_MAX jobs are already pending or running.
+    """
+    global _analysis_executor
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        if sum(not future.done() for future in _analysis_jobs.values()) >= ANALYSIS_JOBS_QUEUE_MAX:
+            return None
+        if _analysis_executor is None:
+            # Created on first use so the thread lives in the serving process
+            _analysis_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='analysis',
+                                                    initializer=_ensure_ephemeris_path)
+        _analysis_jobs[job_id] = _analysis_executor.submit(_run_analysis_job, job_id, params, all_percentages)
+        # Drop the oldest finished jobs beyond the limit
+        for old_id in list(_analysis_jobs):
+            if len(_analysis_jobs) <= ANALYSIS_JOBS_MAX:
+                break
+            if _analysis_jobs[old_id].done():
+                del _analysis_jobs[old_id]
+    return job_id
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
@@ -619,77 +1094,125 @@ def analyze():
         "city": "Lyon",
         "openai_api_key": "sk-..." (optional)
     }
+    With ?async=1 (or "Prefer: respond-async") the analysis runs in the
+    background: the response is 202 with a job id to poll on GET /analyze/<job_id>,
+    or 503 with Retry-After when the job queue is full.
+    With ?include=top3 animal_proportion omits all_animals_percentages.
     """
+    # Validate request
+    if not request.is_json:
+        return _json({"error": "Request must be JSON"}, 400)
+    
     try:
-        # Validate request
-        if not request.is_json:
-            return jsonify({"error": "Request must be JSON"}), 400
-        
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['date', 'time', 'lat', 'lon']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        # Extract parameters
-        name = data.get('name', 'Anonymous')
-        date = data['date']
-        time = data['time']
-        lat = float(data['lat'])
-        lon = float(data['lon'])
-        country = data.get('country', 'Unknown')
-        state = data.get('state', 'Unknown')
-        city = data.get('city', 'Unknown')
-        openai_api_key = data.get('openai_api_key')
-        
-        # Validate date format
-        try:
-            datetime.strptime(date, '%Y-%m-%d')
-        except ValueError:
-            return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
-        
-        # Validate time format
+        params, error = _parse_analyze_request()
+    except Exception as e:
+        logger.exception("Analysis error: %s", e)
+        return _json({
+            "status": "error",
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
+        }, 500)
+    if error:
+        return _json({"error": error}, 400)
+    
+    all_percentages = request.args.get('include') != 'top3'
+    
+    if _wants_async():
+        job_id = _submit_analysis_job(params, all_percentages)
+        if job_id is None:
+            response = _json({
+                "status": "error",
+                "message": "Too many queued analyses, retry later",
+                "timestamp": datetime.now().isoformat()
+            }, 503)
+            response.headers['Retry-After'] = str(ANALYSIS_RETRY_AFTER)
+            return response
+        status_url = f"/analyze/{job_id}"
+        response = _json({
+            "status": "accepted",
+            "job_id": job_id,
+            "status_url": status_url,
+            "timestamp": datetime.now().isoformat()
+        }, 202)
+        response.headers['Location'] = status_url
+        return response
+    
+    payload, status = _perform_analysis(params, all_percentages)
+    return app.response_class(payload, status=status, mimetype='application/json')
+
+@app.route('/analyze/<job_id>')
+def analyze_job(job_id):
+    """Poll a background /analyze job"""
+    with _jobs_lock:
+        future = _analysis_jobs.get(job_id)
+    if future is None:
+        # Finished in an earlier worker process?
         try:
-            datetime.strptime(time, '%H:%M')
-        except ValueError:
-            return jsonify({"error": "Invalid time format. Use HH:MM (24h)"}), 400
-        
-        # Validate coordinates
-        if not (-90 <= lat <= 90):
-            return jsonify({"error": "Latitude must be between -90 and 90"}), 400
-        if not (-180 <= lon <= 180):
-            return jsonify({"error": "Longitude must be between -180 and 180"}), 400
-        
-        # Check if analyzer is ready
-        if analyzer is None:
-            return jsonify({"error": "Analyzer not initialized"}), 500
-        
-        print(f"🔮 Starting analysis for {name} ({date} {time} at {lat}°N, {lon}°W, {city}, {state}, {country})")
+            saved = _read_json(_job_path(job_id)) if _JOB_ID_RE(job_id) else None
+        except FileNotFoundError:
+            saved = None
+        if saved is None:
+            return _json({"error": "Unknown job id", "job_id": job_id}, 404)
+        return _json(saved['response'], saved['http_status'])
+    if not future.done():
+        return _json({
+            "status": "running" if future.running() else "pending",
+            "job_id": job_id
+        }, 202)
+    payload, status = future.result()
+    return app.response_class(payload, status=status, mimetype='application/json')
+
+@_one_analysis_at_a_time
+def _perform_analysis(params, all_percentages=True):
+    """Run the /analyze pipeline for validated params.
+
+    Returns a (JSON bytes, HTTP status) tuple so the result can be sent
+    directly or kept for a background job.
+    """
+    try:
+        # Extract parameters
+        name = params['name']
+        date = params['date']
+        time = params['time']
+        lat = params['lat']
+        lon = params['lon']
+        country = params['country']
+        state = params['state']
+        city = params['city']
+        openai_api_key = params['openai_api_key']
+        
+        # Check if analyzer is ready (initialized on first request)
+        if get_analyzer() is None:
+            return _json_dumps({"error": "Analyzer not initialized"}), 500
+        _ensure_ephemeris_path()
+        
+        logger.info("🔮 Starting analysis for %s (%s %s at %s°N, %s°W, %s, %s, %s)", name, date, time, lat, lon, city, state, country)
         
         try:
             # Run analysis using the analyzer's run_analysis method
             # For /analyze endpoint, we ENABLE ChatGPT interpretation
-            result = analyzer.run_analysis(
-                date=date,
-                time=time, 
-                lat=lat,
-                lon=lon,
-                openai_api_key=openai_api_key,
-                user_name=name,
-                skip_chatgpt=False  # Enable ChatGPT for /analyze endpoint
-            )
-            
-            # Load additional results for frontend
-            analysis_results = load_analysis_results()
+            run_id = uuid.uuid4().hex
+            with _analysis_output_dir(run_id) as output_dir:
+                result = analyzer.run_analysis(
+                    date=date,
+                    time=time, 
+                    lat=lat,
+                    lon=lon,
+                    openai_api_key=openai_api_key,
+                    user_name=name,
+                    skip_chatgpt=False,  # Enable ChatGPT for /analyze endpoint
+                    output_dir=output_dir
+                )
+                
+                # Format additional results for frontend (from memory, no re-read of outputs/)
+                analysis_results = analysis_results_from(result, output_dir, all_percentages)
             
             # Generate TOP 10 ASPECTS (reuse chart from analyzer)
-            print("🌟 Generating TOP 10 ASPECTS...")
+            logger.info("🌟 Generating TOP 10 ASPECTS...")
             existing_chart = analyzer.get_last_computed_chart()
             top_aspects = generate_top_aspects(date, time, lat, lon, existing_chart)
             analysis_results['TOP ASPECTS'] = top_aspects
-            print(f"✅ TOP 10 ASPECTS generated successfully")
+            logger.info("✅ TOP 10 ASPECTS generated successfully")
             
             # Update Supabase with user data
             supabase_updated = False
@@ -713,28 +1236,26 @@ def analyze():
                             supabase_success = supabase_manager.update_user_animal(plumid, top1_animal, name)
                             if supabase_success:
                                 supabase_updated = True
-                                print(f"SUCCESS: Supabase updated existing user: {name} -> {top1_animal} (PlumID: {plumid})")
+                                logger.info("Supabase updated existing user: %s -> %s (PlumID: %s)", name, top1_animal, plumid)
                             else:
-                                print(f"WARNING: Supabase update failed for existing user {name}")
+                                logger.warning("Supabase update failed for existing user %s", name)
                         else:
                             # User doesn't exist, add new record
                             supabase_success = supabase_manager.add_user(plumid, top1_animal, name)
                             if supabase_success:
                                 supabase_updated = True
-                                print(f"SUCCESS: Supabase added new user: {name} -> {top1_animal} (PlumID: {plumid})")
+                                logger.info("Supabase added new user: %s -> %s (PlumID: %s)", name, top1_animal, plumid)
                             else:
-                                print(f"WARNING: Supabase add failed for new user {name}")
+                                logger.warning("Supabase add failed for new user %s", name)
                     else:
-                        print("WARNING: No top1 animal found for Supabase update")
+                        logger.warning("No top1 animal found for Supabase update")
                         
                 except Exception as supabase_error:
-                    print(f"WARNING: Supabase error: {supabase_error}")
+                    logger.warning("Supabase error: %s", supabase_error)
             
         except Exception as e:
-            print(f"ERROR: Analysis failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({
+            logger.exception("Analysis failed: %s", e)
+            return _json_dumps({
                 "error": "Analysis failed",
                 "details": str(e),
                 "timestamp": datetime.now().isoformat()
@@ -763,42 +1284,30 @@ def analyze():
                 "lat": lat,
                 "lon": lon
             },
-            "output_files": [
-                "birth_chart.json",
-                "birth_chart.png",
-                "animal_totals.json", 
-                "top3_percentage_strength.json",
-                "animal_proportion.json",
-                "chatgpt_interpretation.json",
-                "top1_animal_radar.png",
-                "top2_animal_radar.png", 
-                "top3_animal_radar.png"
-            ],
+            "output_files": _run_output_files(run_id),
             "supabase_updated": supabase_updated
         }
         
         # Add the additional data requested by the user
         response_data.update(analysis_results)
         
-        # Use json.dumps to preserve order (especially for french_birth_chart)
-        from flask import Response
-        json_response = json.dumps(response_data, ensure_ascii=False, indent=None)
+        # Serialize without sorting keys to preserve order (especially for french_birth_chart)
+        json_response = _json_dumps(response_data)
         
         # Explicit memory cleanup after analysis
         cleanup_memory()
         cleanup_output_files()
         
-        return Response(json_response, mimetype='application/json')
+        return json_response, 200
         
     except Exception as e:
-        print(f"ERROR: Analysis error: {e}")
-        print(traceback.format_exc())
+        logger.exception("Analysis error: %s", e)
         
         # Cleanup even on error
         cleanup_memory()
         cleanup_output_files()
         
-        return jsonify({
+        return _json_dumps({
             "status": "error",
             "message": str(e),
             "timestamp": datetime.now().isoformat()
@@ -808,69 +1317,73 @@ def analyze():
 def get_file(filename):
     """Serve output files"""
     try:
-        # Get absolute path to outputs directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        outputs_dir = os.path.join(current_dir, "outputs")
-        file_path = os.path.join(outputs_dir, filename)
+        outputs_dir = OUTPUTS_DIR
+        # safe_join rejects names escaping outputs/ (e.g. "../main.py")
+        file_path = safe_join(outputs_dir, filename)
         
         # Debug logging
-        print(f"Looking for file: {file_path}")
-        print(f"Outputs directory exists: {os.path.exists(outputs_dir)}")
-        print(f"File exists: {os.path.exists(file_path)}")
-        
-        if os.path.exists(file_path):
-            return send_file(file_path)
+        logger.debug("Looking for file: %s", file_path)
+        
+        if file_path is not None and os.path.isfile(file_path):
+            # Weak validator from (mtime, size): repeat polls get a 304 without opening the file
+            st = os.stat(file_path)
+            etag = f"{st.st_mtime_ns}-{st.st_size}"
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+                response.cache_control.public = True
+                response.cache_control.max_age = FILES_CACHE_MAX_AGE
+            else:
+                # Range requests, If-Modified-Since, and zero-copy transfer: the server's
+                # wsgi.file_wrapper (sendfile) or X-Sendfile when USE_X_SENDFILE is set
+                response = send_from_directory(outputs_dir, filename, etag=False, conditional=True,
+                                               last_modified=st.st_mtime)
+            response.set_etag(etag, weak=True)
+            return response
         else:
             # List available files for debugging
             if os.path.exists(outputs_dir):
-                available_files = os.listdir(outputs_dir)
-                print(f"📋 Available files: {available_files}")
-                return jsonify({
+                available_files = _list_output_files(outputs_dir)
+                logger.debug("📋 Available files: %s", available_files)
+                return _json({
                     "error": "File not found", 
                     "requested_file": filename,
                     "available_files": available_files
-                }), 404
+                }, 404)
             else:
-                return jsonify({
+                return _json({
                     "error": "Outputs directory not found",
                     "outputs_dir": outputs_dir
-                }), 404
+                }, 404)
     except Exception as e:
-        print(f"ERROR: Error serving file {filename}: {e}")
-        return jsonify({"error": str(e)}), 500
+        logger.error("Error serving file %s: %s", filename, e)
+        return _json({"error": str(e)}, 500)
 
 @app.route('/files')
 def list_files():
     """List available output files"""
     try:
-        # Get absolute path to outputs directory
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        outputs_dir = os.path.join(current_dir, "outputs")
+        outputs_dir = OUTPUTS_DIR
         
-        print(f"Looking for outputs directory: {outputs_dir}")
-        print(f"Directory exists: {os.path.exists(outputs_dir)}")
+        logger.debug("Looking for outputs directory: %s", outputs_dir)
+        logger.debug("Directory exists: %s", os.path.exists(outputs_dir))
         
         if os.path.exists(outputs_dir):
-            files = os.listdir(outputs_dir)
-            print(f"Found {len(files)} files: {files}")
-            return jsonify({
+            files = _list_output_files(outputs_dir)
+            logger.debug("Found %s files: %s", len(files), files)
+            return _json({
                 "files": files,
                 "count": len(files),
                 "outputs_dir": outputs_dir
             })
         else:
-            print(f"ERROR: Outputs directory not found: {outputs_dir}")
-            return jsonify({
-                "files": [], 
-                "count": 0,
-                "error": "Outputs directory not found",
-                "outputs_dir": outputs_dir
-            })
+            logger.error("Outputs directory not found: %s", outputs_dir)
+            return _NO_OUTPUTS_RESPONSE
     except Exception as e:
-        print(f"ERROR: Error listing files: {e}")
-        return jsonify({"error": str(e)}), 500
+        logger.error("Error listing files: %s", e)
+        return _json({"error": str(e)}, 500)
 
 @app.route('/order', methods=['POST'])
+@_one_analysis_at_a_time
 def process_order():
     """
     Order processing endpoint
@@ -883,48 +1396,51 @@ def process_order():
     try:
         # Validate request
         if not request.is_json:
-            return jsonify({"error": "Request must be JSON"}), 400
+            return _json({"error": "Request must be JSON"}, 400)
         
-        data = request.get_json()
+        data = _request_json()
         
         # Validate required fields
         required_fields = ['order_name_nb', 'customAttributes_item_value']
         for field in required_fields:
             if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+                return _json({"error": f"Missing required field: {field}"}, 400)
         
         # Extract parameters
         order_name_nb = data['order_name_nb']
         custom_attributes_value = data['customAttributes_item_value']
         
-        print(f"📦 Processing order: {order_name_nb}")
+        logger.info("📦 Processing order: %s", order_name_nb)
         
         # Parse custom attributes
         try:
             parsed_data = parse_custom_attributes(custom_attributes_value)
-            print(f"✅ Parsed data for {parsed_data['prenom']} {parsed_data['nom']}")
+            logger.info("✅ Parsed data for %s %s", parsed_data['prenom'], parsed_data['nom'])
         except ValueError as e:
-            return jsonify({"error": f"Invalid customAttributes format: {e}"}), 400
+            return _json({"error": f"Invalid customAttributes format: {e}"}, 400)
         
-        # Check if analyzer is ready
-        if analyzer is None:
-            return jsonify({"error": "Analyzer not initialized"}), 500
+        # Check if analyzer is ready (initialized on first request)
+        if get_analyzer() is None:
+            return _json({"error": "Analyzer not initialized"}, 500)
+        _ensure_ephemeris_path()
         
         # Run astrological analysis (reuse existing logic)
         # For /order endpoint, we SKIP ChatGPT interpretation to save OpenAI credits
-        print("🔮 Running astrological analysis...")
+        logger.info("🔮 Running astrological analysis...")
         try:
-            result = analyzer.run_analysis(
-                date=parsed_data['date_naissance'],
-                time=parsed_data['heure_naissance'], 
-                lat=parsed_data['lat'],
-                lon=parsed_data['lon'],
-                user_name=parsed_data['prenom'],
-                skip_chatgpt=True  # Skip ChatGPT for /order endpoint to save credits
-            )
-            
-            # Load analysis results
-            analysis_results = load_analysis_results()
+            with _analysis_output_dir(uuid.uuid4().hex) as output_dir:
+                result = analyzer.run_analysis(
+                    date=parsed_data['date_naissance'],
+                    time=parsed_data['heure_naissance'], 
+                    lat=parsed_data['lat'],
+                    lon=parsed_data['lon'],
+                    user_name=parsed_data['prenom'],
+                    skip_chatgpt=True,  # Skip ChatGPT for /order endpoint to save credits
+                    output_dir=output_dir
+                )
+                
+                # Format analysis results (from memory, no re-read of outputs/)
+                analysis_results = analysis_results_from(result, output_dir)
             
             # Generate TOP 10 ASPECTS (reuse chart from analyzer)
             existing_chart = analyzer.get_last_computed_chart()
@@ -938,11 +1454,11 @@ def process_order():
             analysis_results['TOP ASPECTS'] = top_aspects
             
         except Exception as e:
-            print(f"ERROR: Analysis failed: {e}")
-            return jsonify({
+            logger.error("Analysis failed: %s", e)
+            return _json({
                 "error": "Astrological analysis failed",
                 "details": str(e)
-            }), 500
+            }, 500)
         
         # Extract data for animal summary
         birth_chart_data = analysis_results.get('birth_chart', {})
@@ -950,25 +1466,20 @@ def process_order():
         top1_data = top3_summary.get('Top1', {})
         animal_totem = top1_data.get('animal', 'Animal inconnu')
         
-        print(f"DEBUG: analysis_results keys: {list(analysis_results.keys())}")
-        print(f"DEBUG: birth_chart_data: {birth_chart_data}")
-        print(f"DEBUG: top3_summary keys: {list(top3_summary.keys()) if top3_summary else 'None'}")
-        print(f"DEBUG: animal_totem: {animal_totem}")
+        logger.debug("analysis_results keys: %s", list(analysis_results.keys()))
+        logger.debug("birth_chart_data: %s", birth_chart_data)
+        logger.debug("top3_summary keys: %s", list(top3_summary.keys()) if top3_summary else 'None')
+        logger.debug("animal_totem: %s", animal_totem)
         
-        # Try to load birth chart data directly from file if not in analysis_results
+        # Fall back to the birth chart data returned by run_analysis if not in analysis_results
         if not birth_chart_data:
-            try:
-                with open("outputs/birth_chart.json", 'r', encoding='utf-8') as f:
-                    birth_chart_data = json.load(f)
-                print(f"DEBUG: Loaded birth_chart directly from file: {list(birth_chart_data.keys())}")
-            except Exception as e:
-                print(f"WARNING: Could not load birth_chart.json: {e}")
-                birth_chart_data = {}
+            birth_chart_data = (result.get('birth_chart_data') or {}) if isinstance(result, dict) else {}
+            logger.debug("Loaded birth_chart from the analysis result: %s", list(birth_chart_data.keys()))
         
         # Get Sun-Ascendant sign for pose lookup
         sun_ascendant_sign = get_sun_ascendant_sign(birth_chart_data)
-        print(f"DEBUG: sun_ascendant_sign: {sun_ascendant_sign}")
-        print(f"DEBUG: birth_chart_data planet_signs: {birth_chart_data.get('planet_signs', {}) if birth_chart_data else 'None'}")
+        logger.debug("sun_ascendant_sign: %s", sun_ascendant_sign)
+        logger.debug("birth_chart_data planet_signs: %s", birth_chart_data.get('planet_signs', {}) if birth_chart_data else 'None')
         
         # Generate Animal Summary
         animal_summary = generate_animal_summary(
@@ -1003,9 +1514,9 @@ def process_order():
                 ascendant_sign = sign_translations.get(ascendant_sign_en, "Taureau")
                 moon_sign = sign_translations.get(moon_sign_en, "Cancer")
                 
-                print(f"DEBUG: Signs - Sun: {sun_sign}, Asc: {ascendant_sign}, Moon: {moon_sign}")
+                logger.debug("Signs - Sun: %s, Asc: %s, Moon: %s", sun_sign, ascendant_sign, moon_sign)
         except Exception as e:
-            print(f"WARNING: Could not extract signs from birth chart: {e}")
+            logger.warning("Could not extract signs from birth chart: %s", e)
         
         # Get triotone colors from new CSV system
         tone1, tone2, tone3 = get_triotone_colors(sun_sign, ascendant_sign, moon_sign)
@@ -1056,9 +1567,9 @@ shadows, smooth gradients, and rich textures. Add stars like little dots in the
                     french_chart_text += f'    "{planet}": "{position}",\n'
                 french_chart_text = french_chart_text.rstrip(",\n") + "\n}"
                 
-                print(f"DEBUG: Generated french_chart_text ({len(french_chart_text)} chars)")
+                logger.debug("Generated french_chart_text (%s chars)", len(french_chart_text))
         except Exception as e:
-            print(f"WARNING: Could not generate french_chart_text: {e}")
+            logger.warning("Could not generate french_chart_text: %s", e)
             french_chart_text = "French chart data not available"
         
         # Prompt4emeCouv
@@ -1086,7 +1597,7 @@ shadows, smooth gradients, and rich textures. Add stars like little dots in the
             }
             
             # Run generate_book.py
-            print("Running generate_book.py to create prompt_chatgpt.txt...")
+            logger.info("Running generate_book.py to create prompt_chatgpt.txt...")
             success = generate_book(input_data)
             
             if success:
@@ -1095,24 +1606,22 @@ shadows, smooth gradients, and rich textures. Add stars like little dots in the
                 if os.path.exists(prompt_file):
                     with open(prompt_file, 'r', encoding='utf-8') as f:
                         prompt_chatgpt = f.read()
-                    print(f"SUCCESS: Read prompt_chatgpt.txt ({len(prompt_chatgpt)} chars)")
+                    logger.info("Read prompt_chatgpt.txt (%s chars)", len(prompt_chatgpt))
                 else:
-                    print(f"WARNING: prompt_chatgpt.txt not found after generate_book.py")
+                    logger.warning("prompt_chatgpt.txt not found after generate_book.py")
                     prompt_chatgpt = "Prompt file not generated"
             else:
-                print("WARNING: generate_book.py failed")
+                logger.warning("generate_book.py failed")
                 prompt_chatgpt = "Generate book failed"
                 
         except Exception as e:
-            print(f"WARNING: Could not generate chatgpt prompt: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Could not generate chatgpt prompt: %s", e, exc_info=True)
             prompt_chatgpt = "ChatGPT prompt generation failed"
         
         # Upload files to Google Drive
         drive_upload_result = None
         try:
-            print("\n📤 Uploading files to Google Drive...")
+            logger.info("📤 Uploading files to Google Drive...")
             from google_drive_uploader import upload_order_to_drive
             
             # Define file paths (from livre/ folder after generate_book.py runs)
@@ -1133,15 +1642,13 @@ shadows, smooth gradients, and rich textures. Add stars like little dots in the
             )
             
             if drive_upload_result:
-                print(f"[OK] Google Drive upload successful!")
-                print(f"[FOLDER] URL: {drive_upload_result['folder_url']}")
+                logger.info("[OK] Google Drive upload successful!")
+                logger.info("[FOLDER] URL: %s", drive_upload_result['folder_url'])
             else:
-                print("[WARN] Google Drive upload failed (continuing anyway)")
+                logger.warning("[WARN] Google Drive upload failed (continuing anyway)")
                 
         except Exception as e:
-            print(f"[WARN] Google Drive upload error (non-critical): {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("[WARN] Google Drive upload error (non-critical): %s", e, exc_info=True)
         
         # Prepare response
         response_data = {
@@ -1173,45 +1680,54 @@ shadows, smooth gradients, and rich textures. Add stars like little dots in the
         cleanup_memory()
         cleanup_output_files()
         
-        from flask import Response
-        return Response(json.dumps(response_data, ensure_ascii=False, indent=2), mimetype='application/json')
+        return _json(response_data, indent=True)
         
     except Exception as e:
-        print(f"ERROR: Order processing error: {e}")
-        print(traceback.format_exc())
+        logger.exception("Order processing error: %s", e)
         
         # Cleanup even on error
         cleanup_memory()
         cleanup_output_files()
         
-        return jsonify({
+        return _json({
             "status": "error",
             "message": str(e),
             "timestamp": datetime.now().isoformat()
-        }), 500
+        }, 500)
 
-# Initialize analyzer and Supabase at module level (after function definition)
-print("Starting PLUMATOTM API...")
-if initialize_analyzer():
-    print("SUCCESS: Analyzer ready")
-else:
-    print("ERROR: Failed to start API - analyzer initialization failed")
-    exit(1)
+# The analyzer is initialized lazily by get_analyzer() on the first request,
+# so the server binds its port without waiting for flatlib and the CSV files
+logger.info("Starting PLUMATOTM API...")
 
 # Initialize Supabase (optional - API will work without it)
 initialize_supabase()
 
+# /health bodies for both analyzer states, serialized once (Supabase readiness
+# is settled above); "%s" is the timestamp placeholder
+_HEALTH_BODIES = {
+    ready: _json_dumps({
+        "status": "healthy",
+        "timestamp": "%s",
+        "analyzer_ready": ready,
+        "supabase_ready": supabase_manager is not None and supabase_manager.is_available()
+    })
+    for ready in (False, True)
+}
+
 if __name__ == '__main__':
-    # Analyzer is already initialized at module level
+    configure_logging()
+    # Analyzer is initialized lazily on the first request
     # Get port from environment (Render sets PORT)
     port = int(os.environ.get('PORT', 5000))
     
     # Check if running in production (Render sets RENDER=true)
     if os.environ.get('RENDER'):
-        print("🌐 Running in production mode - use Gunicorn via Procfile")
-        # In production, Gunicorn will handle the server
-        # This block is only for local development
-        app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
+        # In production, Gunicorn handles the server (see Procfile / gunicorn.conf.py)
+        if os.environ.get('USE_DEV_SERVER'):
+            print("⚠️  USE_DEV_SERVER set - running the Werkzeug development server in production mode")
+            app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
+        else:
+            print("🌐 Production mode - start with: gunicorn main:app -c gunicorn.conf.py")
     else:
         print("🔧 Running in development mode")
         app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
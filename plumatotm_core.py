@@ -15,6 +15,8 @@ from datetime import datetime, timezone
 from typing import Dict, List, Tuple, Any
 import sys
 import os
+import functools
+import numpy as np
 
 # Charger les variables d'environnement depuis .env
 try:
@@ -32,6 +34,13 @@ except ImportError:
     print("WARNING: Module de statistiques non disponible")
 from zoneinfo import ZoneInfo
 
+# orjson serializes the output files much faster than stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # OpenAI API for ChatGPT interpretation
 try:
     import openai
@@ -66,7 +75,15 @@ ZODIAC_SIGNS = [
     "LIBRA", "SCORPIO", "SAGITTARIUS", "CAPRICORN", "AQUARIUS", "PISCES"
 ]
 
+# Keys of the run_analysis results formatted by the API, also written together
+# to analysis_result.json so readers parse one file instead of one per key
+ANALYSIS_RESULT_FILE = "analysis_result.json"
+ANALYSIS_RESULT_KEYS = ("birth_chart_data", "animal_proportion", "top3_percentage_strength", "chatgpt_interpretation")
+
 # Utility functions to replace pandas functionality
+# Parsed scores payloads shared by every analyzer in the process, keyed on (path, mtime)
+_SCORES_CACHE: Dict[Tuple[str, float], Dict] = {}
+
 def read_csv_to_dict(csv_path: str, encoding: str = 'utf-8-sig') -> List[Dict[str, Any]]:
     """Read CSV file and return list of dictionaries."""
     data = []
@@ -89,6 +106,27 @@ def read_csv_to_dict(csv_path: str, encoding: str = 'utf-8-sig') -> List[Dict[st
                 data.append(dict(row))
     return data
 
+def write_json_file(path: str, data: Any, indent: bool = False) -> None:
+    """Write data as UTF-8 JSON (2-space indent or compact), using orjson when available."""
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        payload = orjson.dumps(data, option=option)
+    elif indent:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    else:
+        payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+@functools.lru_cache(maxsize=8)
+def get_openai_client(api_key: str):
+    """Return the OpenAI client for api_key, created once and reused.
+    
+    The client keeps its HTTP connection pool alive, so successive
+    interpretations skip the DNS lookup and TLS handshake.
+    """
+    return openai.OpenAI(api_key=api_key)
+
 def safe_float(value: Any) -> float:
     """Safely convert value to float, handling NaN and empty strings."""
     if value is None or value == '' or str(value).lower() in ['nan', 'none']:
@@ -278,6 +316,7 @@ class BirthChartAnalyzer:
         # Load only essential data at startup - scores will be loaded on demand
         self.scores_data = None  # Lazy loading
         self.animals = None  # Will be loaded when needed
+        self._score_matrix = None  # animals x ZODIAC_SIGNS NumPy array, built on demand for compute_top1
         
         # Load planet weights and multipliers (small files, keep at startup)
         self.planet_weights = self._load_planet_weights(weights_csv_path)
@@ -290,20 +329,42 @@ class BirthChartAnalyzer:
     def _ensure_scores_data_loaded(self):
         """Load scores data on demand if not already loaded."""
         if not self._scores_data_loaded:
-            self.scores_data = self._load_scores_from_csv(self.scores_csv_path)
+            self.scores_data = self._get_cached_scores(self.scores_csv_path)
             self.animals = [animal["ANIMAL"] for animal in self.scores_data["animals"]]
             self._scores_data_loaded = True
     
+    def _get_cached_scores(self, scores_csv_path: str) -> Dict:
+        """Return the parsed scores payload, parsing the CSV only once per process."""
+        if not os.path.exists(scores_csv_path):
+            return self._load_scores_from_csv(scores_csv_path)
+        key = (os.path.abspath(scores_csv_path), os.path.getmtime(scores_csv_path))
+        scores_data = _SCORES_CACHE.get(key)
+        if scores_data is None:
+            scores_data = self._load_scores_from_csv(scores_csv_path)
+            _SCORES_CACHE[key] = scores_data
+        return scores_data
+    
     def _ensure_animal_translations_loaded(self):
         """Load animal translations on demand if not already loaded."""
         if not self._animal_translations_loaded and self.translations_csv_path and os.path.exists(self.translations_csv_path):
             self.animal_translations = self._load_animal_translations(self.translations_csv_path)
             self._animal_translations_loaded = True
     
+    def _ensure_score_matrix(self):
+        """Build the animals x zodiac signs score matrix on demand."""
+        if self._score_matrix is None or not self._scores_data_loaded:
+            self._ensure_scores_data_loaded()
+            self._score_matrix = np.array(
+                [[animal[sign] for sign in ZODIAC_SIGNS] for animal in self.scores_data["animals"]],
+                dtype=float
+            )
+        return self._score_matrix
+    
     def clear_scores_cache(self):
         """Clear scores data from memory to free up space."""
         self.scores_data = None
         self.animals = None
+        self._score_matrix = None
         self._scores_data_loaded = False
     
     def clear_translations_cache(self):
@@ -958,8 +1019,8 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
                 print("WARNING: OpenAI API key not provided (use --openai_api_key, set OPENAI_API_KEY env var, or create api_key.txt), skipping ChatGPT interpretation")
                 return None
             
-            # Initialize OpenAI client
-            client = openai.OpenAI(api_key=api_key)
+            # Shared OpenAI client (pooled connections, one per API key)
+            client = get_openai_client(api_key)
             
             # Call ChatGPT
             response = client.chat.completions.create(
@@ -995,8 +1056,8 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
                         utc_time: str = None, timezone_method: str = None, openai_api_key: str = None, 
                         planet_positions: Dict[str, Dict[str, float]] = None,
                         birth_date: str = None, birth_time: str = None, lat: float = None, lon: float = None,
-                        user_name: str = None):
-        """Generate all output files in the outputs directory."""
+                        user_name: str = None, output_dir: str = "outputs"):
+        """Generate all output files in output_dir (the outputs directory by default)."""
         import time as time_module
         
         output_start = time_module.time()
@@ -1004,21 +1065,21 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         print(f"OUTPUT: Starting output generation...")
         
         # Ensure outputs directory exists
-        os.makedirs("outputs", exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
         
         # Define output file paths
         output_files = {
-            "birth_chart": "outputs/birth_chart.json",
-            "planet_weights": "outputs/planet_weights.json",
-            "raw_scores_csv": "outputs/raw_scores.csv",
-            "raw_scores_json": "outputs/raw_scores.json",
-            "weighted_scores_csv": "outputs/weighted_scores.csv",
-            "animal_totals_csv": "outputs/animal_totals.csv",
-            "animal_totals_json": "outputs/animal_totals.json",
-            "top3_percentage_strength_csv": "outputs/top3_percentage_strength.csv",
-            "top3_percentage_strength_json": "outputs/top3_percentage_strength.json",
-            "top3_true_false_csv": "outputs/top3_true_false.csv",
-            "top3_true_false_json": "outputs/top3_true_false.json"
+            "birth_chart": os.path.join(output_dir, "birth_chart.json"),
+            "planet_weights": os.path.join(output_dir, "planet_weights.json"),
+            "raw_scores_csv": os.path.join(output_dir, "raw_scores.csv"),
+            "raw_scores_json": os.path.join(output_dir, "raw_scores.json"),
+            "weighted_scores_csv": os.path.join(output_dir, "weighted_scores.csv"),
+            "animal_totals_csv": os.path.join(output_dir, "animal_totals.csv"),
+            "animal_totals_json": os.path.join(output_dir, "animal_totals.json"),
+            "top3_percentage_strength_csv": os.path.join(output_dir, "top3_percentage_strength.csv"),
+            "top3_percentage_strength_json": os.path.join(output_dir, "top3_percentage_strength.json"),
+            "top3_true_false_csv": os.path.join(output_dir, "top3_true_false.csv"),
+            "top3_true_false_json": os.path.join(output_dir, "top3_true_false.json")
         }
         
         # Remove existing output files if they exist
@@ -1028,13 +1089,13 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
                 print(f"Removed existing file: {file_path}")
         
         # Remove existing birth chart PNG file
-        birth_chart_path = "outputs/birth_chart.png"
+        birth_chart_path = os.path.join(output_dir, "birth_chart.png")
         if os.path.exists(birth_chart_path):
             os.remove(birth_chart_path)
             print(f"Removed existing birth chart: {birth_chart_path}")
         
         # Remove existing radar chart files (same pattern as birth chart)
-        radar_patterns = ["outputs/top1_animal_radar.png", "outputs/top2_animal_radar.png", "outputs/top3_animal_radar.png"]
+        radar_patterns = [os.path.join(output_dir, f"top{rank}_animal_radar.png") for rank in (1, 2, 3)]
         for radar_file in radar_patterns:
             if os.path.exists(radar_file):
                 os.remove(radar_file)
@@ -1056,21 +1117,18 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         # Add French formatted birth chart
         birth_chart_data["french_birth_chart"] = self._format_birth_chart_french(planet_signs, planet_houses, planet_positions)
         birth_chart_data["french_birth_chart_nomin"] = self._format_birth_chart_french_nomin(planet_signs, planet_houses, planet_positions)
-        with open(output_files["birth_chart"], 'w', encoding='utf-8') as f:
-            json.dump(birth_chart_data, f, indent=2, ensure_ascii=False)
+        write_json_file(output_files["birth_chart"], birth_chart_data, indent=True)
         print(f"Birth chart data saved to: {output_files['birth_chart']}")
         
         # 1.1. Generate Birth Chart PNG (will be done in parallel)
         # Birth chart generation moved to parallel execution
         
         # 2. Planet Weights (JSON)
-        with open(output_files["planet_weights"], 'w', encoding='utf-8') as f:
-            json.dump(dynamic_weights, f, indent=2)
+        write_json_file(output_files["planet_weights"], dynamic_weights, indent=True)
         print(f"Planet weights saved to: {output_files['planet_weights']}")
         
         # 3. Raw Scores Table (JSON only - CSV removed for memory optimization)
-        with open(output_files["raw_scores_json"], 'w', encoding='utf-8') as f:
-            json.dump(raw_scores, f, separators=(',', ':'))
+        write_json_file(output_files["raw_scores_json"], raw_scores)
         print(f"Raw scores saved to: {output_files['raw_scores_json']}")
         
         # OPTIMISATION: Skip weighted_scores.json - data is redundant with animal_totals.json
@@ -1078,18 +1136,15 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         
         # 5. Animal Totals Table (JSON only - CSV removed for memory optimization)
         animal_totals_dict = [{"ANIMAL": animal, "TOTAL_SCORE": score} for animal, score in animal_totals]
-        with open(output_files["animal_totals_json"], 'w', encoding='utf-8') as f:
-            json.dump(animal_totals_dict, f, separators=(',', ':'))
+        write_json_file(output_files["animal_totals_json"], animal_totals_dict)
         print(f"Animal totals saved to: {output_files['animal_totals_json']}")
         
         # 6. Top 3 % Strength Table (JSON only - CSV removed for memory optimization)
-        with open(output_files["top3_percentage_strength_json"], 'w', encoding='utf-8') as f:
-            json.dump(percentage_strength, f, separators=(',', ':'))
+        write_json_file(output_files["top3_percentage_strength_json"], percentage_strength)
         print(f"Top 3 percentage strength saved to: {output_files['top3_percentage_strength_json']}")
         
         # 7. Top 3 TRUE/FALSE Table (JSON only - CSV removed for memory optimization)
-        with open(output_files["top3_true_false_json"], 'w', encoding='utf-8') as f:
-            json.dump(true_false_table, f, separators=(',', ':'))
+        write_json_file(output_files["top3_true_false_json"], true_false_table)
         print(f"Top 3 TRUE/FALSE table saved to: {output_files['top3_true_false_json']}")
         
         # 8. Combined Results JSON
@@ -1103,7 +1158,9 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
             "weighted_scores": weighted_scores,
             "animal_totals": [{"ANIMAL": animal, "TOTAL_SCORE": score} for animal, score in animal_totals],
             "top3_percentage_strength": percentage_strength,
-            "top3_true_false": true_false_table
+            "top3_true_false": true_false_table,
+            # Same content as birth_chart.json, so callers need not re-read it
+            "birth_chart_data": birth_chart_data
         }
         
         # OPTIMISATION: Skip combined results file (result.json) - not used by API
@@ -1130,14 +1187,14 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
                     icons_dir="icons",
                     house_system="placidus",
                     zodiac="tropical",
-                    output_path="outputs/birth_chart.png"  # Nom simple
+                    output_path=birth_chart_path  # Nom simple
                 )
                 output_timers['birth_chart_png'] = time_module.time() - step_start
                 print(f"TIMER: Birth chart PNG: {output_timers['birth_chart_png']:.3f}s")
                 print(f"CHART: Birth chart PNG generated: {birth_chart_png_path}")
                 
                 # Verify the file was actually created
-                if not os.path.exists("outputs/birth_chart.png"):
+                if not os.path.exists(birth_chart_path):
                     print("ERROR: Birth chart PNG file was not created!")
                     raise FileNotFoundError("Birth chart PNG file was not created")
                 
@@ -1160,7 +1217,7 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
                 print("CHART: Using default planet symbols")
             
             # OPTIMISATION: Pass data directly instead of using result.json file
-            radar_result = generate_radar_charts_from_data(animal_totals, percentage_strength, icons_folder)
+            radar_result = generate_radar_charts_from_data(animal_totals, percentage_strength, icons_folder, output_dir)
             output_timers['radar_charts'] = time_module.time() - step_start
             print(f"TIMER: Radar charts: {output_timers['radar_charts']:.3f}s")
             if radar_result:
@@ -1193,12 +1250,15 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
                     lat=lat,
                     lon=lon,
                     top1_animal=top1_animal,
-                    user_name=user_name
+                    user_name=user_name,
+                    output_dir=output_dir
                 )
                 
+                combined_results["animal_proportion"] = statistics
+                
                 output_timers['animal_statistics'] = time_module.time() - step_start
                 print(f"TIMER: Animal statistics: {output_timers['animal_statistics']:.3f}s")
-                print(f"STATS: Animal statistics saved to: outputs/animal_proportion.json")
+                print(f"STATS: Animal statistics saved to: {os.path.join(output_dir, 'animal_proportion.json')}")
                 print(f"   User animal percentage: {statistics['user_animal_percentage']}%")
                 print(f"   Total animals tracked: {len(statistics['all_animals_percentages'])}")
                 
@@ -1231,12 +1291,63 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         # Explicit memory cleanup after analysis
         import gc
         gc.collect()
+        
+        return combined_results
+    
+    def compute_result(self, date: str, time: str, lat: float, lon: float) -> Dict[str, Any]:
+        """Compute the scoring results in memory, without writing any output file.
+        
+        Returns the same structure as the combined results of run_analysis, so
+        batch callers can read the top animals without touching outputs/.
+        """
+        planet_signs, planet_houses, planet_positions = self.compute_birth_chart(date, time, lat, lon)
+        dynamic_weights = self.compute_dynamic_planet_weights(planet_signs)
+        raw_scores = self.compute_raw_scores(planet_signs)
+        weighted_scores = self.compute_weighted_scores(raw_scores, dynamic_weights)
+        animal_totals = self.compute_animal_totals(weighted_scores)
+        percentage_strength = self.compute_top3_percentage_strength(weighted_scores, animal_totals, dynamic_weights)
+        true_false_table = self.compute_top3_true_false(weighted_scores, animal_totals)
+        
+        return {
+            "birth_chart": {
+                "planet_signs": planet_signs,
+                "planet_houses": planet_houses
+            },
+            "planet_weights": dynamic_weights,
+            "raw_scores": raw_scores,
+            "weighted_scores": weighted_scores,
+            "animal_totals": [{"ANIMAL": animal, "TOTAL_SCORE": score} for animal, score in animal_totals],
+            "top3_percentage_strength": percentage_strength,
+            "top3_true_false": true_false_table
+        }
+    
+    def compute_top1(self, date: str, time: str, lat: float, lon: float) -> Tuple[str, float]:
+        """Return only the top 1 animal and its total score.
+        
+        Uses the NumPy score matrix (argmax over weighted totals) instead of building
+        the raw/weighted score dicts and sorting every animal.
+        """
+        planet_signs, _, _ = self.compute_birth_chart(date, time, lat, lon)
+        dynamic_weights = self.compute_dynamic_planet_weights(planet_signs)
+        score_matrix = self._ensure_score_matrix()
+        
+        totals = np.zeros(len(self.animals))
+        for planet, sign in planet_signs.items():
+            totals += score_matrix[:, ZODIAC_SIGNS.index(sign)] * dynamic_weights[planet]
+        
+        best = int(totals.argmax())
+        return self.animals[best], float(totals[best])
     
-    def run_analysis(self, date: str, time: str, lat: float, lon: float, timezone_method: str = None, openai_api_key: str = None, translations_csv_path: str = None, user_name: str = None, skip_chatgpt: bool = False):
+    def run_analysis(self, date: str, time: str, lat: float, lon: float, timezone_method: str = None, openai_api_key: str = None, translations_csv_path: str = None, user_name: str = None, skip_chatgpt: bool = False, output_dir: str = "outputs"):
         """Run the complete analysis pipeline.
         
         Args:
             skip_chatgpt: If True, skip ChatGPT interpretation to save API credits (default: False)
+            output_dir: Directory receiving the output files (default: outputs); callers
+                running concurrent analyses pass a directory of their own
+        
+        Returns:
+            The combined results dict built by generate_outputs (animal_totals, top3 tables, ...)
         """
         import time as time_module
         
@@ -1320,10 +1431,10 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         
         # 8. Generate outputs
         step_start = time_module.time()
-        self.generate_outputs(planet_signs, planet_houses, dynamic_weights, raw_scores, 
+        combined_results = self.generate_outputs(planet_signs, planet_houses, dynamic_weights, raw_scores, 
                             weighted_scores, animal_totals, percentage_strength, true_false_table, 
                             utc_time, timezone_method, openai_api_key, planet_positions,
-                            date, time, lat, lon, user_name)
+                            date, time, lat, lon, user_name, output_dir)
         step_timers['output_generation'] = time_module.time() - step_start
         print(f"TIMER:  Output generation: {step_timers['output_generation']:.3f}s")
         
@@ -1341,16 +1452,16 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         
             # 10. Process ChatGPT interpretation result
             if interpretation:
-                interpretation_file = "outputs/chatgpt_interpretation.json"
-                interpretation_txt_file = "outputs/chatgpt_interpretation.txt"
+                interpretation_file = os.path.join(output_dir, "chatgpt_interpretation.json")
+                interpretation_txt_file = os.path.join(output_dir, "chatgpt_interpretation.txt")
                 
                 # Create a copy with properly formatted interpretation
                 formatted_interpretation = interpretation.copy()
                 formatted_interpretation["interpretation"] = formatted_interpretation["interpretation"].replace("\\n", "\n")
                 
                 # Save JSON file
-                with open(interpretation_file, 'w', encoding='utf-8') as f:
-                    json.dump(formatted_interpretation, f, indent=2, ensure_ascii=False)
+                write_json_file(interpretation_file, formatted_interpretation, indent=True)
+                combined_results["chatgpt_interpretation"] = formatted_interpretation
                 
                 # Save text file with proper line breaks
                 with open(interpretation_txt_file, 'w', encoding='utf-8') as f:
@@ -1364,6 +1475,12 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
             else:
                 print("WARNING: ChatGPT interpretation generation failed")
         
+        # 11. Combined file with the data formatted by the API (one read instead of four)
+        write_json_file(
+            os.path.join(output_dir, ANALYSIS_RESULT_FILE),
+            {key: combined_results[key] for key in ANALYSIS_RESULT_KEYS if key in combined_results}
+        )
+        
         # Memory cleanup after all computations
         del raw_scores  # Free memory after all uses
         
@@ -1396,6 +1513,8 @@ Voici les planetes pour lesquelles tu dois concentrer ton analyse:
         for i, (step, duration) in enumerate(sorted_steps[:3], 1):
             percentage = (duration / total_time) * 100
             print(f"{i}. {step}: {duration:.3f}s ({percentage:.1f}%)")
+        
+        return combined_results
 
     def _get_chart_object(self, date, time, lat, lon):
         """Get the flatlib Chart object for reuse in aspects calculation"""
@@ -489,7 +489,8 @@ class RadarChartGenerator:
                 ax.text(np.degrees(angle), icon_radius, planet_symbol, 
                        ha='center', va='center', fontsize=font_size, fontweight='bold')
 
-def generate_radar_charts_from_data(animal_totals, percentage_strength, icons_folder: Optional[str] = None):
+def generate_radar_charts_from_data(animal_totals, percentage_strength, icons_folder: Optional[str] = None,
+                                    output_dir: str = "outputs"):
     """
     Generate radar chart from the analysis data directly.
     
@@ -497,6 +498,7 @@ def generate_radar_charts_from_data(animal_totals, percentage_strength, icons_fo
         animal_totals: List of tuples (animal, score) for top animals
         percentage_strength: Dictionary with percentage strength data
         icons_folder: Optional path to folder containing custom PNG icons
+        output_dir: Directory receiving the topN_animal_radar.png files
     """
     
     try:
@@ -515,19 +517,22 @@ def generate_radar_charts_from_data(animal_totals, percentage_strength, icons_fo
         result = {}
         
         # Generate top 1 animal radar
-        top1_path = generator.generate_top_animal_radar(radar_data)
+        top1_path = generator.generate_top_animal_radar(
+            radar_data, os.path.join(output_dir, "top1_animal_radar.png"))
         if top1_path:
             result['top1_animal_chart'] = top1_path
             print(f"SUCCESS: Radar chart saved to: {top1_path}")
         
         # Generate top 2 animal radar
-        top2_path = generator.generate_top2_animal_radar(radar_data)
+        top2_path = generator.generate_top2_animal_radar(
+            radar_data, os.path.join(output_dir, "top2_animal_radar.png"))
         if top2_path:
             result['top2_animal_chart'] = top2_path
             print(f"SUCCESS: Radar chart saved to: {top2_path}")
         
         # Generate top 3 animal radar
-        top3_path = generator.generate_top3_animal_radar(radar_data)
+        top3_path = generator.generate_top3_animal_radar(
+            radar_data, os.path.join(output_dir, "top3_animal_radar.png"))
         if top3_path:
             result['top3_animal_chart'] = top3_path
             print(f"SUCCESS: Radar chart saved to: {top3_path}")
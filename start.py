@@ -66,7 +66,8 @@ print("\n🎉 All imports successful! Starting Flask app...")
 
 # Start the Flask app
 if __name__ == "__main__":
-    from main import app, initialize_analyzer
+    from main import app, initialize_analyzer, configure_logging
+    configure_logging()
     
     # Initialize analyzer
     if initialize_analyzer():
@@ -25,6 +25,8 @@ class SupabaseConfig:
         # Try service role key first, fallback to anon key
         self.key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_ANON_KEY')
         self.table_name = 'plumastat_usage'
+        # Fonction RPC register_user (voir supabase_process_user_rpc.sql)
+        self.use_rpc = os.getenv('SUPABASE_USE_RPC', '').lower() in ('1', 'true', 'yes')
         
     def is_configured(self) -> bool:
         """Vérifie si Supabase est configuré."""
@@ -22,6 +22,7 @@ class SupabaseManager:
     def __init__(self):
         self.client: Optional[Client] = None
         self.table_name = 'plumastat_usage'
+        self.use_rpc = supabase_config.use_rpc
         self._initialize_client()
     
     def _initialize_client(self):
@@ -247,6 +248,40 @@ class SupabaseManager:
             print(f"ERROR: Erreur calcul pourcentage utilisateur: {e}")
             return 0.0
 
+    def register_user(self, plumid: str, top1_animal: str, user_name: str = None) -> Optional[Dict]:
+        """
+        Lit l'animal précédent et enregistre l'utilisateur en un seul appel RPC.
+        
+        Args:
+            plumid: ID unique de l'utilisateur
+            top1_animal: Animal top1 de l'utilisateur
+            user_name: Nom de l'utilisateur (optionnel)
+            
+        Returns:
+            Dictionnaire {previous_animal} (None si nouvel utilisateur) ou None en cas d'échec
+        """
+        if not self.is_available():
+            return None
+        
+        try:
+            response = self.client.rpc('register_user', {
+                'p_plumid': plumid,
+                'p_animal': top1_animal,
+                'p_name': user_name
+            }).execute()
+            
+            data = response.data
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if not isinstance(data, dict):
+                return None
+            
+            return {'previous_animal': data.get('previous_animal')}
+            
+        except Exception as e:
+            print(f"ERROR: Erreur RPC register_user: {e}")
+            return None
+
 # Instance globale
 supabase_manager = SupabaseManager()
 
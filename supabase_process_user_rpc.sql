@@ -0,0 +1,37 @@
+-- Fonction RPC regroupant la lecture et l'enregistrement d'un utilisateur
+-- À exécuter dans l'éditeur SQL de Supabase, puis activer avec SUPABASE_USE_RPC=true
+-- Remplace la lecture puis l'insertion/mise à jour (2 allers-retours) par un seul appel
+
+-- Versions précédentes (avec calcul des statistiques, inutilisé)
+DROP FUNCTION IF EXISTS process_user_and_stats(TEXT, TEXT, TEXT);
+DROP FUNCTION IF EXISTS process_user_and_stats(TEXT, TEXT, TEXT, BOOLEAN);
+
+CREATE OR REPLACE FUNCTION register_user(
+    p_plumid TEXT,
+    p_animal TEXT,
+    p_name TEXT DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    prev_animal TEXT;
+BEGIN
+    -- 1. Animal précédent (NULL si nouvel utilisateur)
+    SELECT top1_animal INTO prev_animal
+    FROM plumastat_usage
+    WHERE plumid = p_plumid;
+
+    -- 2. Insertion ou mise à jour (uniquement si l'animal ou le nom change)
+    INSERT INTO plumastat_usage AS u (plumid, top1_animal, user_name)
+    VALUES (p_plumid, p_animal, p_name)
+    ON CONFLICT (plumid) DO UPDATE
+    SET top1_animal = EXCLUDED.top1_animal,
+        user_name = COALESCE(EXCLUDED.user_name, u.user_name),
+        updated_at = NOW()
+    WHERE u.top1_animal IS DISTINCT FROM EXCLUDED.top1_animal
+       OR EXCLUDED.user_name IS NOT NULL;
+
+    RETURN jsonb_build_object('previous_animal', prev_animal);
+END;
+$$;
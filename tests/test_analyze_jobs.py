@@ -0,0 +1,106 @@
+"""
+Tests for the /analyze endpoint
+
+A background job (?async=1) must return the same analysis as a synchronous
+request: it runs on another thread, where swisseph needs its ephemeris path.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("timezonefinder")
+
+import main
+
+ANALYZE_BODY = {
+    "name": "Test",
+    "date": "1990-05-17",
+    "time": "14:30",
+    "lat": 48.85,
+    "lon": 2.35,
+    "country": "France",
+    "state": "Île-de-France",
+    "city": "Paris"
+}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """Flask test client with Supabase and ChatGPT disabled, writing outside outputs/."""
+    monkeypatch.setattr(main, "supabase_manager", None)
+    monkeypatch.setattr(main, "OUTPUTS_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "cleanup_output_files", lambda: None)
+    analyzer = main.get_analyzer()
+    run_analysis = analyzer.run_analysis
+    monkeypatch.setattr(analyzer, "run_analysis",
+                        lambda **kwargs: run_analysis(**{**kwargs, "skip_chatgpt": True}))
+    return main.app.test_client()
+
+
+def _without_timestamp(response):
+    """Response data without timestamp, with the per-request PNG prefixes stripped."""
+    data = json.loads(response.data)
+    data.pop("timestamp", None)
+    data["output_files"] = [name.split("_", 1)[1] if name.endswith(".png") else name
+                            for name in data["output_files"]]
+    return data
+
+
+def test_async_analysis_matches_sync(client):
+    """Sync and async responses for the same input differ only by timestamp."""
+    sync_response = client.post("/analyze", json=ANALYZE_BODY)
+    assert sync_response.status_code == 200
+    
+    accepted = client.post("/analyze?async=1", json=ANALYZE_BODY)
+    assert accepted.status_code == 202
+    job_id = accepted.get_json()["job_id"]
+    main._analysis_jobs[job_id].result(timeout=300)
+    
+    async_response = client.get(f"/analyze/{job_id}")
+    assert async_response.status_code == 200
+    
+    sync_data = _without_timestamp(sync_response)
+    async_data = _without_timestamp(async_response)
+    assert async_data["french_birth_chart"] == sync_data["french_birth_chart"]
+    assert async_data == sync_data
+
+
+def test_pngs_published_per_request(client):
+    """Each analysis publishes its PNGs under its own names, plus the shared names."""
+    first = json.loads(client.post("/analyze", json=ANALYZE_BODY).data)
+    second = json.loads(client.post("/analyze", json=ANALYZE_BODY).data)
+    
+    first_pngs = [name for name in first["output_files"] if name.endswith(".png")]
+    second_pngs = [name for name in second["output_files"] if name.endswith(".png")]
+    assert first_pngs and not set(first_pngs) & set(second_pngs)
+    for name in first_pngs + second_pngs:
+        assert client.get(f"/files/{name}").status_code == 200
+    for name in main._OUTPUT_FILES:
+        if name.endswith(".png"):
+            assert client.get(f"/files/{name}").status_code == 200
+
+
+def test_job_result_survives_worker_restart(client):
+    """A finished job is still served once the in-memory job table is gone."""
+    accepted = client.post("/analyze?async=1", json=ANALYZE_BODY)
+    job_id = accepted.get_json()["job_id"]
+    expected = main._analysis_jobs[job_id].result(timeout=300)
+    
+    main._analysis_jobs.clear()
+    response = client.get(f"/analyze/{job_id}")
+    assert response.status_code == expected[1]
+    assert json.loads(response.data) == json.loads(expected[0])
+    assert client.get(f"/analyze/{'0' * 32}").status_code == 404
+
+
+def test_full_job_queue_answers_503(client, monkeypatch):
+    """Submissions beyond ANALYSIS_JOBS_QUEUE_MAX are refused with Retry-After."""
+    monkeypatch.setattr(main, "ANALYSIS_JOBS_QUEUE_MAX", 1)
+    with main._analysis_lock:
+        accepted = client.post("/analyze?async=1", json=ANALYZE_BODY)
+        assert accepted.status_code == 202
+        refused = client.post("/analyze?async=1", json=ANALYZE_BODY)
+        assert refused.status_code == 503
+        assert refused.headers["Retry-After"] == str(main.ANALYSIS_RETRY_AFTER)
+    main._analysis_jobs[accepted.get_json()["job_id"]].result(timeout=300)
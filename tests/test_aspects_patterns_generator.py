@@ -0,0 +1,159 @@
+"""
+Tests for the Aspects and Patterns Generator
+
+The per-chart orb matrices re-implement flatlib's getAspect rules in NumPy
+and feed every pattern detector: they are checked cell by cell against
+flatlib on fixed charts, and detect_patterns output is pinned for one chart.
+"""
+
+import itertools
+import math
+
+import pytest
+from flatlib import const
+from flatlib.aspects import getAspect
+from flatlib.chart import Chart
+from flatlib.datetime import Datetime
+from flatlib.geopos import GeoPos
+
+from aspects_patterns_generator import AspectsPatternsGenerator, _ASPECT_ANGLES
+
+# Same objects as generate_chart_from_plumatotm_data (ASC and MC come with the chart)
+CHART_OBJECTS = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Uranus',
+                 'Neptune', 'Pluto', 'North Node']
+
+# UTC date, UTC time, latitude, longitude
+FIXED_CHARTS = [
+    ("1990/05/17", "12:30", 48.85, 2.35),
+    ("1986/11/09", "15:28", 46.2044, 6.1432),
+    ("2000/01/01", "00:00", -33.87, 151.21),
+    ("1975/07/04", "06:45", 40.71, -74.0),
+    ("1962/02/04", "05:00", 28.61, 77.21),
+]
+
+
+# detect_patterns(FIXED_CHARTS[0], max_orb=8), identical to the output before the NumPy matrices
+EXPECTED_PATTERNS = [
+    {'type': 'T-Square',
+     'planets': [{'name': 'Jupiter', 'position': '9.9° Cancer'},
+                 {'name': 'Uranus', 'position': '9.1° Capricorn'},
+                 {'name': 'Venus', 'position': '15.1° Aries'}],
+     'aspects': ['Jupiter Opposition Uranus (orb: 0.8°)',
+                 'Jupiter Square Venus (orb: 5.2°)',
+                 'Uranus Square Venus (orb: 6.0°)']},
+    {'type': 'T-Square',
+     'planets': [{'name': 'Jupiter', 'position': '9.9° Cancer'},
+                 {'name': 'Neptune', 'position': '14.3° Capricorn'},
+                 {'name': 'Venus', 'position': '15.1° Aries'}],
+     'aspects': ['Jupiter Opposition Neptune (orb: 4.4°)',
+                 'Jupiter Square Venus (orb: 5.2°)',
+                 'Neptune Square Venus (orb: 0.8°)']},
+    {'type': 'Berceau',
+     'planets': [{'name': 'Jupiter', 'position': '9.9° Cancer'},
+                 {'name': 'Neptune', 'position': '14.3° Capricorn'},
+                 {'name': 'Pluto', 'position': '16.1° Scorpio'},
+                 {'name': 'Ascendant', 'position': '11.7° Virgo'}],
+     'aspects': ['Opposition: Jupiter - Neptune (orb: 4.4°)',
+                 'Trine: Pluto - Jupiter (orb: 6.2°)',
+                 'Sextile: Pluto - Neptune (orb: 1.8°)',
+                 'Sextile: Ascendant - Jupiter (orb: 1.7°)',
+                 'Trine: Ascendant - Neptune (orb: 2.7°)'],
+     'avg_orb': 3.3600000000000003,
+     'importance': 4.325,
+     'composite_score': 3.821},
+    {'type': 'Grand Trine',
+     'planets': [{'name': 'Mercury', 'position': '7.9° Taurus'},
+                 {'name': 'Uranus', 'position': '9.1° Capricorn'},
+                 {'name': 'Ascendant', 'position': '11.7° Virgo'}],
+     'aspects': ['Mercury Trine Uranus (orb: 1.2°)',
+                 'Mercury Trine Ascendant (orb: 3.7°)',
+                 'Uranus Trine Ascendant (orb: 2.5°)']},
+    {'type': 'Grand Trine',
+     'planets': [{'name': 'Mercury', 'position': '7.9° Taurus'},
+                 {'name': 'Neptune', 'position': '14.3° Capricorn'},
+                 {'name': 'Ascendant', 'position': '11.7° Virgo'}],
+     'aspects': ['Mercury Trine Neptune (orb: 6.4°)',
+                 'Mercury Trine Ascendant (orb: 3.7°)',
+                 'Neptune Trine Ascendant (orb: 2.7°)']},
+    {'type': 'Cerf-volant',
+     'planets': [{'name': 'Mercury', 'position': '7.9° Taurus'},
+                 {'name': 'Uranus', 'position': '9.1° Capricorn'},
+                 {'name': 'Ascendant', 'position': '11.7° Virgo'},
+                 {'name': 'Jupiter', 'position': '9.9° Cancer'}],
+     'aspects': ['Grand Trigone: Mercury, Uranus, Ascendant',
+                 'Opposition: Jupiter Opposition Uranus',
+                 'Sextiles: Jupiter Sextile Mercury, Ascendant']},
+    {'type': 'Cerf-volant',
+     'planets': [{'name': 'Mercury', 'position': '7.9° Taurus'},
+                 {'name': 'Neptune', 'position': '14.3° Capricorn'},
+                 {'name': 'Ascendant', 'position': '11.7° Virgo'},
+                 {'name': 'Jupiter', 'position': '9.9° Cancer'}],
+     'aspects': ['Grand Trigone: Mercury, Neptune, Ascendant',
+                 'Opposition: Jupiter Opposition Neptune',
+                 'Sextiles: Jupiter Sextile Mercury, Ascendant']},
+]
+
+
+def _chart(date, time, lat, lon):
+    """Build a flatlib chart the way the generator does, from a UTC date and time."""
+    return Chart(Datetime(date, time, 0), GeoPos(lat, lon), hsys=const.HOUSES_PLACIDUS,
+                 IDs=CHART_OBJECTS)
+
+
+def _expected_orb(aspect):
+    """Orb of a flatlib (or FakeAspect) result, inf when there is no aspect."""
+    return math.inf if aspect.type == const.NO_ASPECT else aspect.orb
+
+
+class TestAspectMatrices:
+    """Check the NumPy orb matrices against flatlib, for every pair and aspect type."""
+    
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.generator = AspectsPatternsGenerator()
+    
+    @pytest.mark.parametrize("chart_data", FIXED_CHARTS)
+    def test_matrices_match_flatlib(self, chart_data):
+        """flatlib_orb_matrix matches getAspect, orb_matrix matches the node override."""
+        positions = self.generator._build_position_arrays(_chart(*chart_data))
+        objects = positions["objects"]
+        names = positions["names"]
+        
+        compared = 0
+        for i, j in itertools.permutations(positions["indices"], 2):
+            for k, aspect_type in enumerate(_ASPECT_ANGLES):
+                try:
+                    flatlib_aspect = getAspect(objects[i], objects[j], [aspect_type])
+                    override_aspect = self.generator._get_aspect_with_node_override(
+                        objects[i], objects[j], [aspect_type])
+                except AttributeError:
+                    # flatlib cannot report an aspect between the two angles (ASC/MC have
+                    # no isRetrograde); the matrices still record it
+                    assert {names[i], names[j]} == {"Ascendant", "MC"}
+                    continue
+                
+                cell = f"{names[i]}-{names[j]} {aspect_type}°"
+                assert positions["flatlib_orb_matrix"][i, j, k] == pytest.approx(
+                    _expected_orb(flatlib_aspect), abs=1e-9), cell
+                assert positions["orb_matrix"][i, j, k] == pytest.approx(
+                    _expected_orb(override_aspect), abs=1e-9), cell
+                compared += 1
+        
+        assert compared > 0
+    
+    def test_no_aspect_with_itself(self):
+        """Diagonal cells never hold an aspect."""
+        positions = self.generator._build_position_arrays(_chart(*FIXED_CHARTS[0]))
+        for i in positions["indices"]:
+            assert math.isinf(positions["orb_matrix"][i, i].min())
+            assert math.isinf(positions["flatlib_orb_matrix"][i, i].min())
+
+
+class TestDetectPatterns:
+    """Pin detect_patterns output for one chart."""
+    
+    def test_detect_patterns_pinned(self):
+        """Patterns, aspects and scores for a fixed chart are unchanged."""
+        generator = AspectsPatternsGenerator()
+        patterns = generator.detect_patterns(_chart(*FIXED_CHARTS[0]), max_orb=8)
+        assert patterns == EXPECTED_PATTERNS